@@ -3,12 +3,21 @@
 This module defines the API routes and application setup.
 """
 
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from fastapi.responses import FileResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
 
 from src.api.dependencies import setup_error_handlers
 from src.config import (
@@ -18,13 +27,16 @@ from src.config import (
     DEBUG,
     ENABLE_TEMPLATE_DEBUG,
     LABEL_TEMPLATES,
+    PDF_WORKER_PROCESSES,
+    SETS_CACHE_CONTROL,
     TEMPLATE_PDF_FILES,
     VERCEL_FRONTEND_URL,
     logger,
 )
 from src.models.set_data import MTGSet
 from src.mtg_label_generator import __version__
-from src.services.pdf_generator import PDFGenerator
+from src.services.helpers import prefetch_symbol_files
+from src.services.pdf_generator import PLACEHOLDER_LABEL, PDFGenerator
 from src.services.scryfall_client import ScryfallClient
 
 # Determine project root (backend/src/api/ -> backend/ -> project root)
@@ -35,6 +47,64 @@ _PROJECT_ROOT = _BACKEND_ROOT.parent.resolve()
 scryfall_client = ScryfallClient()
 
 
+def _render_pdf(
+    selected_items_data: list[dict],
+    template_name: str,
+    template_path: str | None,
+    view_mode: str,
+) -> str:
+    """Render the label PDF (module-level so it can run in a worker process).
+
+    The PDF is written straight to a temporary file so neither the worker nor
+    the API process has to hold the whole document in memory.
+
+    Args:
+        selected_items_data: Label entries (sets, card types or placeholders)
+        template_name: Label template name
+        template_path: Optional template PDF path for the debug overlay
+        view_mode: View mode - "sets" or "types"
+
+    Returns:
+        Path of the rendered PDF; the caller is responsible for deleting it
+    """
+    fd, pdf_path = tempfile.mkstemp(prefix="mtg_labels_", suffix=".pdf")
+    os.close(fd)
+    try:
+        pdf_generator = PDFGenerator(
+            selected_items_data,
+            template_name=template_name,
+            template_path=template_path,
+            view_mode=view_mode,
+        )
+        pdf_generator.generate(output_path=pdf_path)
+    except BaseException:
+        os.unlink(pdf_path)
+        raise
+    return pdf_path
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the PDF rendering process pool for the lifetime of the app.
+
+    Args:
+        app: FastAPI application instance
+    """
+    if PDF_WORKER_PROCESSES > 0:
+        # Spawn (not fork) workers: the server process already runs threads
+        app.state.pdf_pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    try:
+        yield
+    finally:
+        pdf_pool = getattr(app.state, "pdf_pool", None)
+        if pdf_pool is not None:
+            pdf_pool.shutdown(wait=False, cancel_futures=True)
+            app.state.pdf_pool = None
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application.
 
@@ -45,6 +115,7 @@ def create_app() -> FastAPI:
         title=APP_NAME,
         debug=DEBUG,
         version=__version__,
+        lifespan=lifespan,
     )
 
     # Setup error handlers
@@ -114,28 +185,36 @@ def create_app() -> FastAPI:
         # Redirect browser requests to Vercel frontend
         return RedirectResponse(url=VERCEL_FRONTEND_URL, status_code=301)
 
-    @app.get("/api/sets")
-    async def api_sets() -> list[dict]:
+    @app.get("/api/sets", response_model=list[dict])
+    async def api_sets(request: Request, response: Response) -> list[dict] | Response:
         """
         API endpoint to get filtered sets.
 
+        Responses carry an ETag and Cache-Control header; a matching
+        If-None-Match request is answered with 304 Not Modified.
+
         Returns:
             List of filtered set dictionaries
         """
-        all_sets = scryfall_client.fetch_sets()
-        filtered = scryfall_client.filter_sets(all_sets)
+        # Scryfall calls block (network, rate-limit sleep), so keep them off the event loop
+        filtered, etag = await asyncio.to_thread(scryfall_client.get_filtered_sets)
+        cache_headers = {"ETag": etag, "Cache-Control": SETS_CACHE_CONTROL}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+
+        response.headers.update(cache_headers)
         # Convert MTGSet objects to dictionaries if needed
         return [s.to_dict() if isinstance(s, MTGSet) else s for s in filtered]
 
     @app.get("/api/card-types")
-    async def api_card_types() -> dict[str, list[str]]:
+    async def api_card_types() -> dict[str, tuple[str, ...]]:
         """
         API endpoint to get card types organized by color.
 
         Returns:
             Dictionary mapping color names to lists of card types
         """
-        return scryfall_client.get_card_types_by_color()
+        return await asyncio.to_thread(scryfall_client.get_card_types_by_color)
 
     @app.post("/generate-pdf")
     async def generate_pdf(
@@ -145,7 +224,7 @@ def create_app() -> FastAPI:
         template: str | None = Form(None),
         placeholders: int = Form(0),
         view_mode: str = Form("sets"),
-    ) -> StreamingResponse:
+    ) -> FileResponse:
         """
         Generate PDF with labels for selected sets or card types.
 
@@ -160,7 +239,7 @@ def create_app() -> FastAPI:
             view_mode: View mode - "sets" or "types" (default: "sets")
 
         Returns:
-            StreamingResponse with PDF file
+            FileResponse with PDF file
 
         Raises:
             HTTPException: If no valid sets/card types are selected or invalid template
@@ -185,7 +264,7 @@ def create_app() -> FastAPI:
         label_template = template or CURRENT_LABEL_TEMPLATE
         if label_template not in LABEL_TEMPLATES:
             logger.warning(
-                f"Invalid template '{label_template}', using default '{CURRENT_LABEL_TEMPLATE}'"
+                "Invalid template '%s', using default '%s'", label_template, CURRENT_LABEL_TEMPLATE
             )
             label_template = CURRENT_LABEL_TEMPLATE
 
@@ -196,12 +275,17 @@ def create_app() -> FastAPI:
             logger.warning("Template debug feature is disabled. Ignoring use_template request.")
             use_template_bool = False
 
-        logger.info(
-            f"Generating PDF for view_mode: {view_mode}, "
-            f"set_ids: {set_ids}, card_type_ids: {card_type_ids}, "
-            f"template: {label_template}, use_template: {use_template_bool}, "
-            f"placeholders: {placeholders}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Generating PDF for view_mode: %s, set_ids: %s, card_type_ids: %s, "
+                "template: %s, use_template: %s, placeholders: %s",
+                view_mode,
+                set_ids,
+                card_type_ids,
+                label_template,
+                use_template_bool,
+                placeholders,
+            )
 
         # Calculate how many placeholders (empty labels) to insert at the start.
         # We clamp this to at most labels_per_page - 1 so the user can shift
@@ -211,12 +295,9 @@ def create_app() -> FastAPI:
         raw_placeholders = placeholders or 0
         placeholder_count = max(0, min(raw_placeholders, max(labels_per_page - 1, 0)))
 
-        # Build the list of labels to render
-        selected_items_data: list[dict] = []
-
-        # Add placeholders as special entries understood by PDFGenerator
-        for _ in range(placeholder_count):
-            selected_items_data.append({"__placeholder__": True})
+        # Build the list of labels to render, starting with the shared placeholder
+        # entry (understood by PDFGenerator) repeated by reference
+        selected_items_data: list[dict] = [PLACEHOLDER_LABEL] * placeholder_count
 
         if view_mode == "types":
             # Handle card types (color + type combinations)
@@ -235,8 +316,7 @@ def create_app() -> FastAPI:
                     )
         else:
             # Handle sets (default)
-            all_sets = scryfall_client.fetch_sets()
-            filtered = scryfall_client.filter_sets(all_sets)
+            filtered, _ = await asyncio.to_thread(scryfall_client.get_filtered_sets)
 
             # Create a mapping of set_id to set_dict for quick lookup
             sets_by_id: dict[str, dict] = {}
@@ -253,7 +333,7 @@ def create_app() -> FastAPI:
 
         if not selected_items_data:
             item_type = "card types" if view_mode == "types" else "sets"
-            logger.error(f"No valid {item_type} selected")
+            logger.error("No valid %s selected", item_type)
             raise HTTPException(status_code=400, detail=f"No valid {item_type} selected.")
 
         # Set template path if debug mode is enabled
@@ -266,33 +346,44 @@ def create_app() -> FastAPI:
                 if template_file.exists():
                     template_path = str(template_file)
                     logger.info(
-                        f"Using template PDF '{template_pdf_filename}' "
-                        f"for template '{label_template}'"
+                        "Using template PDF '%s' for template '%s'",
+                        template_pdf_filename,
+                        label_template,
                     )
                 else:
                     logger.warning(
-                        f"Template PDF not found: {template_file} "
-                        f"for template '{label_template}', generating without template"
+                        "Template PDF not found: %s for template '%s', generating without template",
+                        template_file,
+                        label_template,
                     )
             else:
                 logger.warning(
-                    f"No template PDF mapping found for template '{label_template}', "
-                    "generating without template overlay"
+                    "No template PDF mapping found for template '%s', "
+                    "generating without template overlay",
+                    label_template,
                 )
 
-        pdf_generator = PDFGenerator(
+        # Download any uncached set symbols concurrently before the (sequential) render
+        if view_mode != "types":
+            await prefetch_symbol_files(selected_items_data)
+
+        # Render off the event loop; without a pool (e.g. lifespan not started)
+        # the default thread executor is used
+        pdf_path = await asyncio.get_running_loop().run_in_executor(
+            getattr(app.state, "pdf_pool", None),
+            _render_pdf,
             selected_items_data,
-            template_name=label_template,
-            template_path=template_path,
-            view_mode=view_mode,
+            label_template,
+            template_path,
+            view_mode,
         )
-        pdf_buffer = pdf_generator.generate()
         filename = "mtg_labels.pdf" if not use_template_bool else "mtg_labels_with_template.pdf"
 
-        return StreamingResponse(
-            pdf_buffer,
+        return FileResponse(
+            pdf_path,
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment;filename={filename}"},
+            background=BackgroundTask(os.unlink, pdf_path),
         )
 
     return app
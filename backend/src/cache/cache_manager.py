@@ -6,41 +6,52 @@ Provides multi-layer caching:
 - Cache hit rate monitoring
 """
 
-from collections.abc import Callable
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-from cachetools import TTLCache
-
 from src.config import CACHE_MAX_SIZE, CACHE_TTL_SECONDS, SYMBOL_CACHE_DIR, logger
 
+# Sentinel (expires_at, value) pair returned for keys that are not in the memory cache
+_MISSING_ENTRY: tuple[float, Any] = (0.0, None)
+
+
+def _is_svg_header(header: bytes) -> bool:
+    """Check whether the leading bytes of a file look like SVG content."""
+    return header.startswith(b"<svg") or header.startswith(b"<?xml")
+
 
 @dataclass
 class CachedSetData:
-    """Represents cached set list data with metadata for cache management."""
+    """Represents cached set list data with metadata for cache management.
+
+    Timestamps are ``time.monotonic()`` values rather than wall-clock datetimes:
+    they are cheaper to read and immune to system clock adjustments.
+    """
 
     sets: list[dict]
-    cached_at: datetime = field(default_factory=datetime.now)
-    expires_at: datetime | None = field(default=None)
+    cached_at: float = field(default_factory=time.monotonic)
+    expires_at: float | None = field(default=None)
     source: str = "scryfall_api"
 
     def __post_init__(self) -> None:
         """Set expires_at if not provided."""
         if self.expires_at is None:
-            self.expires_at = self.cached_at + timedelta(seconds=CACHE_TTL_SECONDS)
+            self.expires_at = self.cached_at + CACHE_TTL_SECONDS
 
     def is_expired(self) -> bool:
         """Check if cache entry is expired."""
         if self.expires_at is None:
             return True
-        return datetime.now() > self.expires_at
+        return time.monotonic() > self.expires_at
 
     def is_stale(self, max_age_seconds: int = CACHE_TTL_SECONDS) -> bool:
         """Check if cache entry is stale (older than max_age)."""
-        age = (datetime.now() - self.cached_at).total_seconds()
-        return age > max_age_seconds
+        return time.monotonic() - self.cached_at > max_age_seconds
 
 
 class CacheManager:
@@ -72,8 +83,9 @@ class CacheManager:
         self.max_size = max_size
         self.symbol_cache_dir = Path(symbol_cache_dir) if symbol_cache_dir else SYMBOL_CACHE_DIR
 
-        # In-memory cache using TTLCache
-        self._memory_cache: TTLCache[str, Any] = TTLCache(maxsize=max_size, ttl=ttl)
+        # In-memory cache: key -> (monotonic expiry time, value), kept in LRU order
+        # (plain dict preserves insertion order; re-inserting marks an entry as recent)
+        self._memory_cache: dict[str, tuple[float, Any]] = {}
 
         # Cache statistics
         self._hits = 0
@@ -96,12 +108,19 @@ class CacheManager:
             Cached value or None if not found/expired
         """
         try:
-            value = self._memory_cache.get(key)
-            if value is not None:
+            entry = self._memory_cache.get(key, _MISSING_ENTRY)
+            expires_at, value = entry
+            if value is not None and expires_at > time.monotonic():
+                # Move to the end (most recently used)
+                del self._memory_cache[key]
+                self._memory_cache[key] = entry
                 self._hits += 1
                 logger.debug(f"Cache hit for key: {key}")
                 return value
             else:
+                if value is not None:
+                    # Expired entry, drop it lazily
+                    del self._memory_cache[key]
                 self._misses += 1
                 logger.debug(f"Cache miss for key: {key}")
                 return None
@@ -119,7 +138,11 @@ class CacheManager:
             value: Value to cache
         """
         try:
-            self._memory_cache[key] = value
+            self._memory_cache.pop(key, None)
+            self._memory_cache[key] = (time.monotonic() + self.ttl, value)
+            if len(self._memory_cache) > self.max_size:
+                # Evict least recently used entry (first in insertion order)
+                del self._memory_cache[next(iter(self._memory_cache))]
             logger.debug(f"Cached value for key: {key}")
         except Exception as e:
             self._errors += 1
@@ -168,7 +191,8 @@ class CacheManager:
         Returns:
             True if valid, False otherwise
         """
-        return key in self._memory_cache
+        expires_at, _ = self._memory_cache.get(key, _MISSING_ENTRY)
+        return expires_at > time.monotonic()
 
     def refresh(self, key: str, value: Any) -> None:
         """
@@ -233,7 +257,7 @@ class CacheManager:
             # Read only first 100 bytes to avoid loading entire file into memory
             with symbol_file.open("rb") as f:
                 header = f.read(100)
-            if not header.startswith(b"<svg") and not header.startswith(b"<?xml"):
+            if not _is_svg_header(header):
                 logger.warning(f"Symbol file {symbol_file} appears invalid, invalidating")
                 symbol_file.unlink()
                 return None
@@ -243,25 +267,43 @@ class CacheManager:
             logger.error(f"Error validating symbol file {symbol_file}: {e}")
             return None
 
-    def save_symbol(self, set_id: str, content: bytes) -> str | None:
+    def save_symbol(self, set_id: str, content: bytes | Iterable[bytes]) -> str | None:
         """
         Save symbol to file cache.
 
+        Content may be passed as a single bytes object or as an iterable of chunks
+        (e.g. ``response.iter_content()``) so downloads can be streamed straight to disk.
+        Chunks are written to a temporary file private to this process and thread,
+        which replaces the cached file only once the whole symbol has been received,
+        so concurrent downloads of the same set never share a partial file.
+
         Args:
             set_id: Set ID
-            content: SVG file content
+            content: SVG file content, or an iterable of content chunks
 
         Returns:
             Path to saved file or None on error
         """
         symbol_file = self.symbol_cache_dir / f"{set_id}.svg"
+        partial_file = symbol_file.with_name(
+            f"{symbol_file.name}.{os.getpid()}-{threading.get_ident()}.part"
+        )
+        chunks = (content,) if isinstance(content, bytes) else content
 
         try:
-            symbol_file.write_bytes(content)
+            with partial_file.open("wb") as f:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if f.tell() == 0 and not _is_svg_header(chunk):
+                        raise ValueError("content does not look like an SVG file")
+                    f.write(chunk)
+            partial_file.replace(symbol_file)
             logger.debug(f"Saved symbol to cache: {symbol_file}")
             return str(symbol_file)
         except Exception as e:
             logger.error(f"Error saving symbol to cache {symbol_file}: {e}")
+            partial_file.unlink(missing_ok=True)
             return None
 
     def invalidate_symbol(self, set_id: str) -> None:
@@ -300,6 +342,7 @@ class CacheManager:
         Returns:
             Dictionary with cache statistics
         """
+        self._purge_expired()
         total = self._hits + self._misses
         return {
             "hits": self._hits,
@@ -311,6 +354,13 @@ class CacheManager:
             "max_size": self.max_size,
         }
 
+    def _purge_expired(self) -> None:
+        """Remove expired entries from the in-memory cache."""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._memory_cache.items() if expires_at <= now]
+        for key in expired:
+            del self._memory_cache[key]
+
     def reset_stats(self) -> None:
         """Reset cache statistics."""
         self._hits = 0
@@ -35,48 +35,52 @@ CORS_ORIGINS = [origin.strip() for origin in CORS_ORIGINS_STR.split(",") if orig
 VERCEL_FRONTEND_URL = os.getenv("VERCEL_FRONTEND_URL", "https://mtg-labels.vercel.app")
 
 # --- Set Filtering Configuration ---
-SET_TYPES = (
-    "core",  # A yearly Magic core set (Tenth Edition, etc)
-    "expansion",  # A rotational expansion set in a block (Zendikar, etc)
-    "masters",  # A reprint set that contains no new cards (Modern Masters, etc)
-    "eternal",  # A set of new cards that only get added to high-power formats
-    "alchemy",  # An Arena set designed for Alchemy
-    "masterpiece",  # Masterpiece Series premium foil cards
-    # "arsenal",  # A Commander-oriented gift set
-    "from_the_vault",  # From the Vault gift sets
-    # "spellbook",  # Spellbook series gift sets
-    "premium_deck",  # Premium Deck Series decks
-    "duel_deck",  # Duel Decks
-    "draft_innovation",  # Special draft sets, like Conspiracy and Battlebond
-    # "treasure_chest",  # Magic Online treasure chest prize sets
-    "commander",  # Commander preconstructed decks
-    "planechase",  # Planechase sets
-    # "archenemy",  # Archenemy sets
-    # "vanguard",  # Vanguard card sets
-    "funny",  # A funny un-set or set with funny promos (Unglued, Happy Holidays, etc)
-    "starter",  # A starter/introductory set (Portal, etc)
-    "box",  # A gift box set
-    # "promo",  # A set that contains purely promotional cards
-    # "token",  # A set made up of tokens and emblems
-    # "memorabilia",  # A set made up of gold-bordered, oversize, or trophy cards that are not legal
-    "minigame",  # A set that contains minigame card inserts from booster packs
+SET_TYPES = frozenset(
+    {
+        "core",  # A yearly Magic core set (Tenth Edition, etc)
+        "expansion",  # A rotational expansion set in a block (Zendikar, etc)
+        "masters",  # A reprint set that contains no new cards (Modern Masters, etc)
+        "eternal",  # A set of new cards that only get added to high-power formats
+        "alchemy",  # An Arena set designed for Alchemy
+        "masterpiece",  # Masterpiece Series premium foil cards
+        # "arsenal",  # A Commander-oriented gift set
+        "from_the_vault",  # From the Vault gift sets
+        # "spellbook",  # Spellbook series gift sets
+        "premium_deck",  # Premium Deck Series decks
+        "duel_deck",  # Duel Decks
+        "draft_innovation",  # Special draft sets, like Conspiracy and Battlebond
+        # "treasure_chest",  # Magic Online treasure chest prize sets
+        "commander",  # Commander preconstructed decks
+        "planechase",  # Planechase sets
+        # "archenemy",  # Archenemy sets
+        # "vanguard",  # Vanguard card sets
+        "funny",  # A funny un-set or set with funny promos (Unglued, Happy Holidays, etc)
+        "starter",  # A starter/introductory set (Portal, etc)
+        "box",  # A gift box set
+        # "promo",  # A set that contains purely promotional cards
+        # "token",  # A set made up of tokens and emblems
+        # "memorabilia",  # A set made up of gold-bordered, oversize, or trophy cards, not legal
+        "minigame",  # A set that contains minigame card inserts from booster packs
+    }
 )
 MINIMUM_SET_SIZE = int(os.getenv("MINIMUM_SET_SIZE", "10"))
-IGNORED_SETS = (
-    "cmb1",  # Mystery Booster Playtest Cards
-    "amh1",  # Modern Horizon Art Series
-    "cmb2",  # Mystery Booster Playtest Cards Part Deux
-    "fbb",  # Foreign Black Border
-    "sum",  # Summer Magic / Edgar
-    "4bb",  # Fourth Edition Foreign Black Border
-    "bchr",  # Chronicles Foreign Black Border
-    "rin",  # Rinascimento
-    "ren",  # Renaissance
-    "rqs",  # Rivals Quick Start Set
-    "itp",  # Introductory Two-Player Set
-    "sir",  # Shadows over Innistrad Remastered
-    "sis",  # Shadows of the Past
-    "cst",  # Coldsnap Theme Decks
+IGNORED_SETS = frozenset(
+    {
+        "cmb1",  # Mystery Booster Playtest Cards
+        "amh1",  # Modern Horizon Art Series
+        "cmb2",  # Mystery Booster Playtest Cards Part Deux
+        "fbb",  # Foreign Black Border
+        "sum",  # Summer Magic / Edgar
+        "4bb",  # Fourth Edition Foreign Black Border
+        "bchr",  # Chronicles Foreign Black Border
+        "rin",  # Rinascimento
+        "ren",  # Renaissance
+        "rqs",  # Rivals Quick Start Set
+        "itp",  # Introductory Two-Player Set
+        "sir",  # Shadows over Innistrad Remastered
+        "sis",  # Shadows of the Past
+        "cst",  # Coldsnap Theme Decks
+    }
 )
 
 # --- Abbreviation Mapping ---
@@ -294,6 +298,7 @@ ENABLE_TEMPLATE_DEBUG = os.getenv("ENABLE_TEMPLATE_DEBUG", "false").lower() == "
 
 # --- Scryfall API Settings ---
 SCRYFALL_API_BASE_URL = os.getenv("SCRYFALL_API_BASE_URL", "https://api.scryfall.com/sets")
+SCRYFALL_CARD_TYPES_URL = "https://api.scryfall.com/catalog/card-types"
 SCRYFALL_API_TIMEOUT = int(os.getenv("SCRYFALL_API_TIMEOUT", "30"))  # seconds
 SCRYFALL_API_RETRY_ATTEMPTS = int(os.getenv("SCRYFALL_API_RETRY_ATTEMPTS", "3"))
 # Rate limiting: Scryfall recommends 50-100ms delay between requests (10 req/sec average)
@@ -308,8 +313,72 @@ CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "100"))
 # Symbol cache is in backend/static/images/
 _DEFAULT_SYMBOL_CACHE_DIR = _BACKEND_ROOT / "static" / "images"
 SYMBOL_CACHE_DIR = Path(os.getenv("SYMBOL_CACHE_DIR", str(_DEFAULT_SYMBOL_CACHE_DIR)))
+# Cache-Control header for /api/sets responses (browsers/CDNs revalidate via ETag)
+SETS_CACHE_CONTROL = os.getenv("SETS_CACHE_CONTROL", "public, max-age=600")
 # SVG drawing cache size (in-memory cache for parsed SVG drawings)
 SVG_DRAWING_CACHE_MAX_SIZE = int(os.getenv("SVG_DRAWING_CACHE_MAX_SIZE", "50"))  # Reduced from 100
+# App-owned cache for data reused across processes (kept out of the public static dir).
+# Cached drawings are unpickled, so this must not be a shared location such as /tmp:
+# it is created with mode 0700 and only used while owned by the current user and not
+# writable by group or others.
+_DEFAULT_APP_CACHE_DIR = _BACKEND_ROOT / ".cache"
+APP_CACHE_DIR = Path(os.getenv("APP_CACHE_DIR", str(_DEFAULT_APP_CACHE_DIR)))
+# Parsed SVG drawings persisted across processes
+SVG_DRAWING_CACHE_DIR = Path(
+    os.getenv("SVG_DRAWING_CACHE_DIR", str(APP_CACHE_DIR / "svg_drawings"))
+)
+# Scryfall symbology (mana symbol URIs) persisted across processes; it rarely changes
+SYMBOLOGY_CACHE_FILE = Path(
+    os.getenv("SYMBOLOGY_CACHE_FILE", str(APP_CACHE_DIR / "scryfall_symbology_v1.json"))
+)
+# Only symbol SVGs served from this prefix are trusted from the persisted symbology
+SYMBOLOGY_SVG_URI_PREFIX = "https://svgs.scryfall.io/"
+SYMBOLOGY_CACHE_TTL_SECONDS = int(
+    os.getenv("SYMBOLOGY_CACHE_TTL_SECONDS", "604800")
+)  # 7 days default
+
+# --- PDF Rendering Settings ---
+# Threads used to download symbols and pre-parse SVGs before drawing labels
+PDF_PREFETCH_WORKERS = int(os.getenv("PDF_PREFETCH_WORKERS", "8"))
+# Worker processes used to render PDFs off the event loop (0 renders in a thread instead).
+# Each worker re-imports ReportLab, svglib and pypdf, so the default stays at one to fit
+# small VMs; raise it on hosts with spare memory and CPUs.
+PDF_WORKER_PROCESSES = int(os.getenv("PDF_WORKER_PROCESSES", "1"))
+
+PDF_GC_MODES = ("off", "auto", "manual")
+
+
+def _parse_pdf_gc_mode(value: str | None, worker_processes: int) -> str:
+    """Validate the PDF garbage collection mode.
+
+    Args:
+        value: Raw MTG_PDF_GC_MODE value, or None when unset.
+        worker_processes: Number of dedicated PDF worker processes.
+
+    Returns:
+        The normalized mode. When unset, "off" if renders run in dedicated worker
+        processes, otherwise "auto" so the API server process keeps automatic GC.
+
+    Raises:
+        ValueError: If the value is not one of PDF_GC_MODES.
+    """
+    if value is None:
+        return "off" if worker_processes > 0 else "auto"
+    mode = value.strip().lower()
+    if mode not in PDF_GC_MODES:
+        raise ValueError(
+            f"Invalid MTG_PDF_GC_MODE {value!r}, expected one of: {', '.join(PDF_GC_MODES)}"
+        )
+    return mode
+
+
+# Garbage collection during PDF generation:
+#   off    - automatic GC paused while rendering, one young-generation collection afterwards
+#            (default when renders run in worker processes)
+#   auto   - leave automatic GC running, one young-generation collection afterwards
+#            (default when PDF_WORKER_PROCESSES=0 and renders share the API server process)
+#   manual - automatic GC paused, young-generation collection every 8 pages
+PDF_GC_MODE = _parse_pdf_gc_mode(os.getenv("MTG_PDF_GC_MODE"), PDF_WORKER_PROCESSES)
 
 
 # --- Logging Configuration ---
@@ -3,8 +3,11 @@
 from .helpers import (
     abbreviate_set_name,
     fit_text_to_width,
+    format_release_date,
+    get_download_session,
     get_svg_intrinsic_dimensions,
     get_symbol_file,
+    prefetch_symbol_files,
 )
 from .pdf_generator import PDFGenerator
 from .scryfall_client import ScryfallClient
@@ -14,6 +17,9 @@ __all__ = [
     "PDFGenerator",
     "abbreviate_set_name",
     "fit_text_to_width",
+    "format_release_date",
+    "get_download_session",
     "get_symbol_file",
     "get_svg_intrinsic_dimensions",
+    "prefetch_symbol_files",
 ]
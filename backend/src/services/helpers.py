@@ -1,24 +1,49 @@
 """Helper functions for MTG Label Generator."""
 
+import asyncio
+import datetime
+import functools
+import re
+import threading
 import time
-import xml.etree.ElementTree as ET
 
 import requests
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
+from requests.adapters import HTTPAdapter
 
 from src.cache.cache_manager import get_cache_manager
 from src.config import (
     ABBREVIATION_MAP,
     MAX_SET_NAME_LENGTH,
+    PDF_PREFETCH_WORKERS,
     SCRYFALL_API_RATE_LIMIT_DELAY,
     logger,
 )
 
+# Chunk size used when streaming symbol downloads to the file cache
+SYMBOL_DOWNLOAD_CHUNK_SIZE = 8192
 
+# Start tag of the root <svg> element, skipping the XML declaration, comments and
+# DOCTYPE before it (scanned on raw bytes, no XML parse). Group 1 holds its attributes.
+_SVG_ROOT_TAG_RE = re.compile(
+    rb"""\A(?:\xef\xbb\xbf)?(?:\s|<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^\[>]*(?:\[.*?\])?\s*>)*"""
+    rb"""<svg\b((?:[^>"']|"[^"]*"|'[^']*')*)>""",
+    re.DOTALL,
+)
+_SVG_VIEWBOX_RE = re.compile(rb"""\sviewBox\s*=\s*["']([^"']*)["']""")
+
+_download_session: requests.Session | None = None
+_download_session_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1024)
 def abbreviate_set_name(set_name: str) -> str:
     """
     Abbreviate set name if it's in the abbreviation map or too long.
 
+    Results are memoized since the same sets recur across labels and requests.
+
     Args:
         set_name: Full set name to abbreviate
 
@@ -27,9 +52,10 @@ def abbreviate_set_name(set_name: str) -> str:
     """
     logger.debug(f"Abbreviating set name: {set_name}")
 
-    if set_name in ABBREVIATION_MAP:
+    abbreviation = ABBREVIATION_MAP.get(set_name)
+    if abbreviation is not None:
         logger.debug("Found in ABBREVIATION_MAP")
-        return ABBREVIATION_MAP[set_name]
+        return abbreviation
 
     if len(set_name) > MAX_SET_NAME_LENGTH:
         logger.debug("Name too long, truncating")
@@ -54,12 +80,19 @@ def fit_text_to_width(
     Returns:
         Text truncated to fit width, with "..." appended if truncated
     """
+    # Font metrics are global, so the result does not depend on the canvas
+    return _fit_text_to_width(text, font_name, font_size, max_width)
+
+
+@functools.lru_cache(maxsize=4096)
+def _fit_text_to_width(text: str, font_name: str, font_size: float, max_width: float) -> str:
+    """Memoized implementation of fit_text_to_width (labels repeat the same text)."""
     current_text = text
-    text_width = c.stringWidth(current_text, font_name, font_size)
+    text_width = pdfmetrics.stringWidth(current_text, font_name, font_size)
 
     while text_width > max_width and len(current_text) > 0:
         current_text = current_text[:-1]
-        text_width = c.stringWidth(current_text + "...", font_name, font_size)
+        text_width = pdfmetrics.stringWidth(current_text + "...", font_name, font_size)
 
     if current_text != text:
         current_text = current_text + "..."
@@ -67,6 +100,78 @@ def fit_text_to_width(
     return current_text
 
 
+_MONTH_NAMES = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def format_release_date(released_at: str) -> str:
+    """
+    Format a Scryfall release date (YYYY-MM-DD) as "Month YYYY".
+
+    Parses the fixed-width date by slicing and looks up the month name instead of
+    going through strptime/strftime; results are memoized since many sets share
+    release dates.
+
+    Args:
+        released_at: Release date string from Scryfall
+
+    Returns:
+        Formatted release date, or the original string if it can't be parsed
+    """
+    year, month, day = released_at[:4], released_at[5:7], released_at[8:]
+    if (
+        len(released_at) != 10
+        or released_at[4] != "-"
+        or released_at[7] != "-"
+        or not (year + month + day).isdigit()
+    ):
+        return released_at
+    try:
+        # Rejects impossible dates (e.g. month 13 or February 30)
+        datetime.date(int(year), int(month), int(day))
+    except ValueError:
+        return released_at
+    return f"{_MONTH_NAMES[int(month) - 1]} {year}"
+
+
+def get_download_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session used for symbol downloads.
+
+    Keep-alive connections are reused across symbols and requests, so only the
+    first download from a host pays for the TCP/TLS handshake.
+
+    Returns:
+        Shared requests session (created on first use)
+    """
+    global _download_session
+    if _download_session is None:
+        with _download_session_lock:
+            if _download_session is None:
+                session = requests.Session()
+                # Enough pooled connections for every prefetch thread
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=PDF_PREFETCH_WORKERS)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                # User-Agent header is required by Scryfall API
+                session.headers.update({"User-Agent": "MTG-Label-Generator/1.0"})
+                _download_session = session
+    return _download_session
+
+
 def get_symbol_file(set_data: dict) -> str | None:
     """
     Get local file path for set symbol, downloading if necessary.
@@ -81,7 +186,7 @@ def get_symbol_file(set_data: dict) -> str | None:
     """
     symbol_url = set_data.get("icon_svg_uri")
     if not symbol_url:
-        logger.debug(f"No symbol URL for set '{set_data.get('name')}'")
+        logger.debug("No symbol URL for set '%s'", set_data.get("name"))
         return None
 
     set_id = set_data.get("id")
@@ -94,57 +199,105 @@ def get_symbol_file(set_data: dict) -> str | None:
     # Try to get from cache
     cached_path = cache_manager.get_symbol(set_id)
     if cached_path:
-        logger.debug(f"Symbol file found in cache: {cached_path}")
+        logger.debug("Symbol file found in cache: %s", cached_path)
         return cached_path
 
     # Download symbol
-    logger.info(f"Downloading symbol from {symbol_url} for set '{set_data.get('name')}'")
+    logger.info("Downloading symbol from %s for set '%s'", symbol_url, set_data.get("name"))
 
     try:
         # Apply rate limiting for symbol downloads
         # Note: *.scryfall.io domains don't have rate limits, but we apply it for consistency
         time.sleep(SCRYFALL_API_RATE_LIMIT_DELAY)
 
-        response = requests.get(symbol_url, timeout=30)
+        response = get_download_session().get(symbol_url, timeout=30, stream=True)
     except requests.RequestException as e:
-        logger.error(f"Error downloading symbol image: {e}")
+        logger.error("Error downloading symbol image: %s", e)
         return None
 
-    if response.status_code != 200:
-        logger.error(f"Failed to download symbol, status: {response.status_code}")
-        return None
+    try:
+        if response.status_code != 200:
+            logger.error("Failed to download symbol, status: %s", response.status_code)
+            return None
+
+        # Stream to cache without holding the whole body in memory
+        cached_path = cache_manager.save_symbol(
+            set_id, response.iter_content(chunk_size=SYMBOL_DOWNLOAD_CHUNK_SIZE)
+        )
+    finally:
+        response.close()
 
-    # Save to cache
-    cached_path = cache_manager.save_symbol(set_id, response.content)
     if cached_path:
-        logger.info(f"Saved symbol to cache: {cached_path}")
+        logger.info("Saved symbol to cache: %s", cached_path)
         return cached_path
     else:
         logger.error("Failed to save symbol to cache")
         return None
 
 
-def get_svg_intrinsic_dimensions(file_path: str) -> tuple[float, float] | None:
+async def prefetch_symbol_files(sets_data: list[dict]) -> int:
     """
-    Extract intrinsic dimensions from SVG file's viewBox attribute.
+    Download missing set symbols concurrently ahead of PDF generation.
+
+    PDFGenerator fetches symbols lazily, one label at a time, so uncached symbols
+    cost one round trip each. Prefetching them in parallel up front reduces the
+    wall-clock cost from the sum of the round trips to roughly the slowest one.
 
     Args:
-        file_path: Path to SVG file
+        sets_data: Set dictionaries about to be rendered (placeholders are ignored)
 
     Returns:
-        Tuple of (width, height) if viewBox found, None otherwise
+        Number of symbols downloaded into the cache
     """
-    try:
-        tree = ET.parse(file_path)
-    except (ET.ParseError, FileNotFoundError, OSError) as e:
-        logger.error(f"Error parsing SVG file {file_path}: {e}")
-        return None
+    cache_manager = get_cache_manager()
 
-    root = tree.getroot()
-    view_box = root.attrib.get("viewBox")
+    missing: dict[str, dict] = {}
+    for set_data in sets_data:
+        set_id = set_data.get("id")
+        if not set_id or not set_data.get("icon_svg_uri") or set_id in missing:
+            continue
+        if cache_manager.get_symbol(set_id) is None:
+            missing[set_id] = set_data
 
-    if view_box:
-        parts = view_box.strip().split()
+    if not missing:
+        return 0
+
+    logger.info("Prefetching %d missing set symbols", len(missing))
+    results = await asyncio.gather(
+        *(asyncio.to_thread(get_symbol_file, set_data) for set_data in missing.values()),
+        return_exceptions=True,
+    )
+    return sum(1 for result in results if isinstance(result, str))
+
+
+def get_svg_intrinsic_dimensions(source: str | bytes) -> tuple[float, float] | None:
+    """
+    Extract intrinsic dimensions from SVG file's viewBox attribute.
+
+    Args:
+        source: Path to SVG file, or the SVG document itself as bytes
+
+    Returns:
+        Tuple of (width, height) if viewBox found, None otherwise
+    """
+    if isinstance(source, bytes | bytearray):
+        data = source
+        file_path = "<in-memory SVG>"
+    else:
+        file_path = source
+        try:
+            with open(file_path, "rb") as svg_file:
+                data = svg_file.read()
+        except OSError as e:
+            logger.error(f"Error reading SVG file {file_path}: {e}")
+            return None
+
+    # Only the root element's viewBox counts; nested <svg> elements have their own
+    root_tag = _SVG_ROOT_TAG_RE.match(data)
+    match = _SVG_VIEWBOX_RE.search(root_tag.group(1)) if root_tag else None
+
+    if match:
+        parts = match.group(1).split()
         if len(parts) == 4:
             try:
                 width = float(parts[2])
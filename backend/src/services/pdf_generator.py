@@ -1,14 +1,33 @@
 """PDF generation service for MTG Label Generator."""
 
-import datetime
+import functools
 import gc
+import hashlib
 import io
+import json
+import os
+import pickle
+import stat
+import threading
 import time
-from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
-
-from pypdf import PdfReader, PdfWriter
+from typing import Any, NamedTuple, overload
+
+import reportlab
+import requests
+import svglib
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    FloatObject,
+    IndirectObject,
+    NameObject,
+)
+from reportlab import rl_config
 from reportlab.graphics import renderPDF
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
@@ -23,22 +42,256 @@ from src.config import (
     FONT_SIZE_ROW2,
     FONT_SOURCE_SANS_PRO_REGULAR,
     LABEL_TEMPLATES,
+    PDF_GC_MODE,
+    PDF_PREFETCH_WORKERS,
+    SCRYFALL_API_RATE_LIMIT_DELAY,
+    SCRYFALL_API_TIMEOUT,
     SET_SYMBOL_MAX_WIDTH,
+    SVG_DRAWING_CACHE_DIR,
     SVG_DRAWING_CACHE_MAX_SIZE,
+    SYMBOLOGY_CACHE_FILE,
+    SYMBOLOGY_CACHE_TTL_SECONDS,
+    SYMBOLOGY_SVG_URI_PREFIX,
     logger,
 )
 from src.services.helpers import (
+    SYMBOL_DOWNLOAD_CHUNK_SIZE,
     abbreviate_set_name,
     fit_text_to_width,
+    format_release_date,
+    get_download_session,
     get_svg_intrinsic_dimensions,
     get_symbol_file,
 )
 
-# LRU cache for SVG drawings to avoid re-parsing (memory-efficient)
-# Uses OrderedDict for O(1) access and LRU eviction
-_svg_drawing_cache: OrderedDict[str, Any] = OrderedDict()
+# Shared read-only entry for empty label slots (placeholders); callers add it by
+# reference so a placeholder costs no allocation and is recognised by identity
+PLACEHOLDER_LABEL: dict = {"__placeholder__": True}
+
 _cache_max_size = SVG_DRAWING_CACHE_MAX_SIZE  # Configurable cache size
 
+# Write compressed streams as binary instead of ASCII85-encoding them, which
+# costs an extra encoding pass and inflates every page stream by a quarter
+rl_config.useA85 = 0
+
+
+# Pickled drawings are only valid for the svglib/ReportLab versions that produced them
+_SVG_DRAWING_CACHE_TAG = (
+    f"svglib-{getattr(svglib, '__version__', '')}-reportlab-{reportlab.Version}".encode()
+)
+
+
+def _is_private_dir(directory: Path) -> bool:
+    """Create a cache directory if needed and check that only this user can write to it.
+
+    Persisted caches are trusted when loaded (drawings are unpickled), so a directory
+    owned by another user, or writable by group or others, is never used.
+
+    Args:
+        directory: Cache directory
+
+    Returns:
+        True if the directory can be used for persisted caches
+    """
+    if not hasattr(os, "getuid"):
+        return False
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        dir_stat = directory.lstat()
+    except OSError as e:
+        logger.warning(f"Cache directory {directory} unavailable: {e}")
+        return False
+
+    if (
+        not stat.S_ISDIR(dir_stat.st_mode)
+        or dir_stat.st_uid != os.getuid()
+        or dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    ):
+        logger.warning(
+            f"Ignoring cache directory {directory}: not a private directory owned by this user"
+        )
+        return False
+    return True
+
+
+def _parse_svg_drawing(file_path: str, content: bytes) -> Any:
+    """Load a parsed SVG drawing from the disk cache, parsing it on a miss.
+
+    Drawings are pickled under SVG_DRAWING_CACHE_DIR keyed by a hash of the
+    SVG content and library versions, so svglib parsing is skipped across
+    processes and restarts. The disk cache is skipped unless the directory is
+    private to this user.
+
+    Args:
+        file_path: Path to SVG file
+        content: Contents of the SVG file, used for the cache key
+
+    Returns:
+        Drawing object, or None if the SVG could not be parsed
+    """
+    if not _is_private_dir(SVG_DRAWING_CACHE_DIR):
+        return svg2rlg(file_path)
+
+    hasher = hashlib.blake2b(_SVG_DRAWING_CACHE_TAG, digest_size=16)
+    hasher.update(content)
+    pickle_file = SVG_DRAWING_CACHE_DIR / f"{hasher.hexdigest()}.pkl"
+
+    try:
+        with pickle_file.open("rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Discarding unreadable SVG drawing cache {pickle_file}: {e}")
+
+    drawing = svg2rlg(file_path)
+    if drawing is None:
+        return None
+
+    # Unique partial name so concurrent renders never interleave writes
+    partial_file = pickle_file.with_name(
+        f"{pickle_file.name}.{os.getpid()}-{threading.get_ident()}.part"
+    )
+    try:
+        with partial_file.open("wb") as f:
+            pickle.dump(drawing, f, protocol=5)
+        partial_file.replace(pickle_file)
+    except Exception as e:
+        logger.warning(f"Could not persist SVG drawing for {file_path}: {e}")
+        partial_file.unlink(missing_ok=True)
+    return drawing
+
+
+def _load_symbology_cache() -> dict[str, str] | None:
+    """Load the persisted Scryfall symbology (symbol -> SVG URI) if still fresh.
+
+    The file is only trusted from a private cache directory, and only when every
+    URI points at Scryfall's symbol SVG host.
+
+    Returns:
+        Symbol to SVG URI mapping, or None if missing, expired, unreadable or untrusted
+    """
+    if not _is_private_dir(SYMBOLOGY_CACHE_FILE.parent):
+        return None
+
+    try:
+        age = time.time() - SYMBOLOGY_CACHE_FILE.stat().st_mtime
+        if age > SYMBOLOGY_CACHE_TTL_SECONDS:
+            logger.debug(f"Symbology cache {SYMBOLOGY_CACHE_FILE} expired ({age:.0f}s old)")
+            return None
+        symbology = json.loads(SYMBOLOGY_CACHE_FILE.read_bytes())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable symbology cache {SYMBOLOGY_CACHE_FILE}: {e}")
+        return None
+
+    if not isinstance(symbology, dict) or not all(
+        isinstance(symbol, str)
+        and isinstance(uri, str)
+        and uri.startswith(SYMBOLOGY_SVG_URI_PREFIX)
+        for symbol, uri in symbology.items()
+    ):
+        logger.warning(f"Discarding malformed symbology cache {SYMBOLOGY_CACHE_FILE}")
+        return None
+    return symbology
+
+
+def _save_symbology_cache(symbology: dict[str, str]) -> None:
+    """Persist the Scryfall symbology so later processes skip the API call.
+
+    Args:
+        symbology: Symbol to SVG URI mapping
+    """
+    # Unique partial name so concurrent renders never interleave writes
+    partial_file = SYMBOLOGY_CACHE_FILE.with_name(
+        f"{SYMBOLOGY_CACHE_FILE.name}.{os.getpid()}-{threading.get_ident()}.part"
+    )
+    if not _is_private_dir(SYMBOLOGY_CACHE_FILE.parent):
+        return
+    try:
+        partial_file.write_text(json.dumps(symbology), encoding="utf-8")
+        partial_file.replace(SYMBOLOGY_CACHE_FILE)
+    except Exception as e:
+        logger.warning(f"Could not persist symbology cache: {e}")
+        partial_file.unlink(missing_ok=True)
+
+
+class _SvgSymbol(NamedTuple):
+    """Parsed SVG drawing with the geometry needed to place it on a label."""
+
+    drawing: Any
+    # Drawing bounds (x1, y1, x2, y2), or None if they could not be computed
+    bounds: tuple[float, float, float, float] | None
+    # Intrinsic size: viewBox dimensions, falling back to bounds or drawing size
+    width: float
+    height: float
+
+
+class _LabelPlan(NamedTuple):
+    """Text, position and symbol of a label, resolved before drawing."""
+
+    label_x: float
+    label_y: float
+    text_x: float
+    text_y: float
+    line1: str
+    line2: str
+    symbol_file: str | None
+    # Set or card type name used when logging symbol errors
+    symbol_name: str
+
+
+class _SymbolTransform(NamedTuple):
+    """Scale and bounds offset that place a symbol at its target size."""
+
+    scale: float
+    bounds_x: float
+    bounds_y: float
+    scaled_width: float
+    scaled_height: float
+
+
+@functools.lru_cache(maxsize=_cache_max_size)
+def _load_svg_drawing(file_path: str) -> _SvgSymbol | None:
+    """Load an SVG drawing and its geometry, memoized per file path.
+
+    Args:
+        file_path: Path to SVG file
+
+    Returns:
+        Parsed symbol, or None if the SVG could not be parsed
+    """
+    # Read once: the bytes key the disk cache and supply the viewBox
+    try:
+        content = Path(file_path).read_bytes()
+    except OSError as e:
+        logger.error(f"Error reading SVG file {file_path}: {e}")
+        return None
+
+    drawing = _parse_svg_drawing(file_path, content)
+    if drawing is None:
+        return None
+
+    try:
+        bounds = tuple(drawing.getBounds())
+    except Exception as e:
+        logger.error(f"Error getting bounds from drawing {file_path}: {e}")
+        bounds = None
+
+    dimensions = get_svg_intrinsic_dimensions(content)
+    if dimensions:
+        width, height = dimensions
+        logger.debug(f"Extracted viewBox dimensions: {width}x{height}")
+    elif bounds is not None:
+        width, height = bounds[2] - bounds[0], bounds[3] - bounds[1]
+        logger.debug(f"Extracted bounds dimensions: {width}x{height}")
+    else:
+        width, height = drawing.width, drawing.height
+        logger.debug(f"Fallback dimensions: {width}x{height}")
+
+    return _SvgSymbol(drawing, bounds, width, height if height > 0 else 1)
+
 
 def clear_svg_drawing_cache() -> int:
     """Clear the SVG drawing cache to free memory.
@@ -46,9 +299,8 @@ def clear_svg_drawing_cache() -> int:
     Returns:
         Number of entries cleared
     """
-    global _svg_drawing_cache
-    count = len(_svg_drawing_cache)
-    _svg_drawing_cache.clear()
+    count = _load_svg_drawing.cache_info().currsize
+    _load_svg_drawing.cache_clear()
     logger.info(f"Cleared SVG drawing cache ({count} entries)")
     return count
 
@@ -59,8 +311,155 @@ def get_svg_drawing_cache_size() -> int:
     Returns:
         Number of cached entries
     """
-    return len(_svg_drawing_cache)
+    return _load_svg_drawing.cache_info().currsize
+
+
+# Pages between young-generation collections in "manual" GC mode
+_MANUAL_GC_PAGE_INTERVAL = 8
+
+# Automatic GC is process-wide, so overlapping generations share one pause
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = False
+
+
+def _pause_gc() -> None:
+    """Disable automatic garbage collection until the matching _resume_gc()."""
+    global _gc_pause_depth, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+
+
+def _resume_gc() -> None:
+    """Re-enable automatic garbage collection once the last pause ends."""
+    global _gc_pause_depth
+    with _gc_pause_lock:
+        _gc_pause_depth -= 1
+        if _gc_pause_depth == 0 and _gc_was_enabled:
+            gc.enable()
+
+
+# ReportLab's shared TTF faces are not thread-safe while subsetting fonts into a
+# document (done in Canvas.save()), so concurrent renders serialize that step
+_font_embed_lock = threading.Lock()
+
+# Name of the reused template page form XObject in merged debug PDFs
+_TEMPLATE_FORM_NAME = "/TemplatePage"
+
+
+def _add_template_form(writer: PdfWriter, template_page: PageObject) -> IndirectObject:
+    """Add a template page to a writer as a form XObject.
+
+    Merged pages draw the form underneath their labels, so each template page
+    is embedded once and no content stream has to be parsed and merged.
+
+    Args:
+        writer: PDF writer the form is added to
+        template_page: Template page to wrap
+
+    Returns:
+        Indirect reference to the form XObject
+    """
+    contents = template_page.get_contents()
+    form = DecodedStreamObject()
+    form.set_data(contents.get_data() if contents is not None else b"")
+    form.update(
+        {
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject(
+                [FloatObject(value) for value in template_page.mediabox]
+            ),
+            NameObject("/Resources"): (
+                template_page["/Resources"].get_object().clone(writer)
+                if "/Resources" in template_page
+                else DictionaryObject()
+            ),
+        }
+    )
+    return writer._add_object(form.flate_encode())
+
+
+def _underlay_template(
+    page: PageObject,
+    template_page: PageObject,
+    template_form: IndirectObject,
+    template_draw: IndirectObject,
+) -> None:
+    """Draw a template form underneath a page's existing content.
+
+    The page's content stream is left as is (no parse and re-serialize as with
+    merge_page()); a shared stream drawing the form is prepended to it instead.
+
+    Args:
+        page: Writer-owned page to draw the template on
+        template_page: Template page the form was built from (gives the page size)
+        template_form: Form XObject of the template page
+        template_draw: Content stream that draws the form, shared by all pages
+    """
+    resources = page.get("/Resources")
+    resources = DictionaryObject(resources.get_object() if resources is not None else {})
+    xobjects = resources.get("/XObject")
+    xobjects = DictionaryObject(xobjects.get_object() if xobjects is not None else {})
+    xobjects[NameObject(_TEMPLATE_FORM_NAME)] = template_form
+    resources[NameObject("/XObject")] = xobjects
+    page[NameObject("/Resources")] = resources
+
+    contents = page.raw_get("/Contents") if "/Contents" in page else None
+    if contents is None:
+        page[NameObject("/Contents")] = template_draw
+    else:
+        existing = contents.get_object()
+        parts = list(existing) if isinstance(existing, ArrayObject) else [contents]
+        page[NameObject("/Contents")] = ArrayObject([template_draw, *parts])
+    page.mediabox = template_page.mediabox
+
+
+# Label slot geometry per template: template key -> (label_x, label_y, text_x, text_y,
+# max_text_width) for every slot on a page
+_label_slots_cache: dict[str, tuple[tuple[float, float, float, float, float], ...]] = {}
+
+# Distinct template PDFs kept in memory (templates are a small fixed set of backgrounds)
+_TEMPLATE_PDF_CACHE_MAX_SIZE = 8
+
 
+@functools.lru_cache(maxsize=_TEMPLATE_PDF_CACHE_MAX_SIZE)
+def _load_template_pdf(template_path: str, mtime: float) -> bytes:
+    """Read a template PDF, memoized per path and modification time.
+
+    Keying on mtime means an edited template is read again, and the stale
+    entry ages out of the bounded cache.
+
+    Args:
+        template_path: Path to the template PDF file
+        mtime: Modification time of the file, used only as part of the cache key
+
+    Returns:
+        Template PDF contents
+    """
+    return Path(template_path).read_bytes()
+
+
+def _read_template_pdf(template_path: str) -> bytes | None:
+    """Read a template PDF, serving repeat merges from memory.
+
+    Args:
+        template_path: Path to the template PDF file
+
+    Returns:
+        Template PDF contents, or None if the file does not exist
+    """
+    try:
+        return _load_template_pdf(template_path, os.stat(template_path).st_mtime)
+    except OSError:
+        return None
+
+
+# Font every page starts with (the canvas preamble selects it), i.e. the first label line
+_PAGE_INITIAL_FONT = ("EBGaramondBold", FONT_SIZE_ROW1)
 
 # Register fonts (should be done once at module import)
 try:
@@ -113,62 +512,102 @@ class PDFGenerator:
             template_key = CURRENT_LABEL_TEMPLATE
         self.template = LABEL_TEMPLATES[template_key]
         self.template_path = template_path
-        self.buffer = io.BytesIO()
-        self.canvas = canvas.Canvas(
-            self.buffer, pagesize=(self.template["page_width"], self.template["page_height"])
+        # View mode is fixed for a run, so pick the label planner once
+        self._plan_label: Callable[[dict], _LabelPlan | None] = (
+            self._plan_type_label if view_mode == "types" else self._plan_set_label
         )
+        self.buffer = io.BytesIO()
+        self.canvas = self._create_canvas(self.buffer)
         self.current_label = 0
         self.text_block_height = FONT_SIZE_ROW1 + FONT_SIZE_ROW2 + 4
         self.SYMBOL_AREA_WIDTH = self.text_block_height + 10
-        # Initialize effective symbol width (will be recalculated in _draw_label for narrow labels)
-        self.effective_symbol_width = SET_SYMBOL_MAX_WIDTH
+        # Narrow labels (< 60pt) use a smaller symbol (40% of width) to leave room for text
+        if self.template["label_width"] >= 60:
+            self.effective_symbol_width = SET_SYMBOL_MAX_WIDTH
+        else:
+            self.effective_symbol_width = min(
+                SET_SYMBOL_MAX_WIDTH, self.template["label_width"] * 0.4
+            )
+        # Geometry of every label slot on a page, indexed by current_label.
+        # It only depends on the template, so generators in a process share it
+        label_slots = _label_slots_cache.get(template_key)
+        if label_slots is None:
+            label_slots = _label_slots_cache[template_key] = self._compute_label_slots()
+        self._label_slots = label_slots
 
         # Performance metrics
         self.start_time: float | None = None
         self.end_time: float | None = None
         self.labels_processed = 0
 
-    def generate(self) -> io.BytesIO:
+        # Symbol form XObjects defined in this document: local_file -> form name
+        self._xobject_cache: dict[str, str] = {}
+        # Symbol placement per (local_file, target_height, symbol width), in 1/100 pt
+        self._svg_transform_cache: dict[tuple[str, int, int], _SymbolTransform] = {}
+
+        # Symbol files resolved before drawing: set id -> path, color -> path (types view)
+        self._symbol_files: dict[str, str | None] = {}
+        self._mana_symbol_files: dict[str, str | None] = {}
+
+    @overload
+    def generate(self) -> io.BytesIO: ...
+
+    @overload
+    def generate(self, output_path: str | os.PathLike[str]) -> Path: ...
+
+    def generate(self, output_path: str | os.PathLike[str] | None = None) -> io.BytesIO | Path:
         """
         Generate PDF with labels for all selected sets.
 
+        Args:
+            output_path: Optional file to write the PDF to. ReportLab then writes
+                straight to disk instead of accumulating the document in memory.
+
         Returns:
-            BytesIO buffer containing PDF data
+            Path of the written file if output_path is given, otherwise a BytesIO
+            buffer containing PDF data
         """
         self.start_time = time.time()
+        output_file = Path(output_path) if output_path is not None else None
+        if output_file is not None:
+            self.canvas = self._create_canvas(str(output_file))
+
+        # Full collections walk every live object; pause automatic GC while rendering
+        # and collect once in _cleanup() instead of after every page
+        gc_paused = PDF_GC_MODE != "auto"
+        if gc_paused:
+            _pause_gc()
 
         try:
+            self._prefetch_assets()
+
             labels_per_page = self.template["labels_per_row"] * self.template["label_rows"]
+            manual_gc_interval = labels_per_page * _MANUAL_GC_PAGE_INTERVAL
 
+            page_plans: list[_LabelPlan] = []
             for set_data in self.selected_sets:
-                # Check if we need a new page BEFORE drawing the label
-                # After drawing labels_per_page labels (0 to labels_per_page-1),
-                # we need a new page for the next label
+                # Check if we need a new page BEFORE planning the label
+                # After planning labels_per_page labels (0 to labels_per_page-1),
+                # the page is drawn and the next label starts a new one
                 if self.current_label == labels_per_page:
+                    self._draw_page(page_plans)
+                    page_plans = []
                     logger.debug(f"Starting new page after {self.current_label} labels")
                     self.canvas.showPage()
+                    self._current_font = _PAGE_INITIAL_FONT
                     self.current_label = 0
-                    # Force garbage collection after each page to free memory
-                    # Use more aggressive collection for memory-constrained environments
-                    collected = gc.collect()
-                    if collected > 0:
-                        logger.debug(f"Garbage collected {collected} objects after page")
+                    if PDF_GC_MODE == "manual" and self.labels_processed % manual_gc_interval == 0:
+                        gc.collect(0)
 
-                self._draw_label(set_data)
+                plan = self._plan_label(set_data)
+                if plan is not None:
+                    page_plans.append(plan)
                 self.current_label += 1
                 self.labels_processed += 1
+            self._draw_page(page_plans)
 
-                # Periodically clear SVG cache if it's getting large (memory optimization)
-                if get_svg_drawing_cache_size() > _cache_max_size * 0.8:
-                    logger.debug("SVG cache approaching limit, clearing oldest entries")
-                    # Clear half of the cache (keep most recent)
-                    items_to_remove = _cache_max_size // 2
-                    for _ in range(items_to_remove):
-                        if _svg_drawing_cache:
-                            _svg_drawing_cache.popitem(last=False)
-
-            self.canvas.save()
-            self.buffer.seek(0)
+            with _font_embed_lock:
+                self.canvas.save()
 
             self.end_time = time.time()
             duration = self.end_time - self.start_time
@@ -177,175 +616,332 @@ class PDFGenerator:
                 f"({self.labels_processed / duration:.1f} labels/sec)"
             )
 
-            # If template PDF is provided, merge labels on top of template
+            if output_file is not None:
+                # If template PDF is provided, merge labels on top of template
+                if self.template_path:
+                    merged_file = output_file.with_name(f"{output_file.name}.merged")
+                    if self._merge_with_template(output_file, merged_file):
+                        merged_file.replace(output_file)
+                    else:
+                        merged_file.unlink(missing_ok=True)
+                return output_file
+
+            self.buffer.seek(0)
             if self.template_path:
-                return self._merge_with_template()
+                merged_buffer = io.BytesIO()
+                if self._merge_with_template(self.buffer, merged_buffer):
+                    # Release the labels-only PDF right away rather than holding both
+                    # documents until the generator is garbage collected
+                    self.buffer.close()
+                    merged_buffer.seek(0)
+                    return merged_buffer
+                self.buffer.seek(0)
 
             return self.buffer
         finally:
             # Cleanup resources
             self._cleanup()
+            if gc_paused:
+                _resume_gc()
 
-    def _draw_label(self, set_data: dict) -> None:
+    def _create_canvas(self, target: io.BytesIO | str) -> canvas.Canvas:
         """
-        Draw a single label for a set or card type.
+        Create the canvas the labels are drawn on.
+
+        Output is compressed and invariant (no creation timestamp or random
+        document ID), so identical selections render byte-identical PDFs.
+
+        Args:
+            target: Buffer or file path to write the PDF to
+
+        Returns:
+            Canvas sized to the label template's page
+        """
+        pdf_canvas = canvas.Canvas(
+            target,
+            pagesize=(self.template["page_width"], self.template["page_height"]),
+            pageCompression=1,
+            invariant=1,
+            initialFontName=_PAGE_INITIAL_FONT[0],
+            initialFontSize=_PAGE_INITIAL_FONT[1],
+        )
+        pdf_canvas.setTitle("MTG Labels")
+        pdf_canvas.setAuthor("MTG Label Generator")
+        self._current_font = _PAGE_INITIAL_FONT
+        return pdf_canvas
+
+    def _set_font(self, font_name: str, font_size: float) -> None:
+        """
+        Select a font, skipping the PDF operator if it is already current.
+
+        Args:
+            font_name: Registered font name
+            font_size: Font size in points
+        """
+        if self._current_font != (font_name, font_size):
+            self.canvas.setFont(font_name, font_size)
+            self._current_font = (font_name, font_size)
+
+    def _is_placeholder(self, set_data: dict) -> bool:
+        """
+        Check whether an entry is a placeholder (empty slot to shift the start position).
 
         Args:
             set_data: Dictionary containing set or card type data
+
+        Returns:
+            True if the label slot should be left blank
         """
-        # Handle placeholder labels (empty slots to shift starting position)
-        if set_data.get("__placeholder__"):
+        # Identity check first; copies (e.g. unpickled in a worker) fall back to the flag
+        if set_data is PLACEHOLDER_LABEL or set_data.get("__placeholder__"):
             logger.debug(f"Placeholder label at index {self.current_label}, leaving blank")
-            return
+            return True
+        return False
 
-        label_index = self.current_label
-        row = label_index // self.template["labels_per_row"]
-        col = label_index % self.template["labels_per_row"]
+    def _plan_set_label(self, set_data: dict) -> _LabelPlan | None:
+        """
+        Resolve the text, position and symbol of a set label without drawing it.
 
-        # Calculate label position using template margins and gaps
-        label_x = self.template["left_margin"] + col * (
-            self.template["label_width"] + self.template["horizontal_gap"]
-        )
-        # Position from top: top of label = page_height - top_margin - row * (label_height + gap)
-        # Then label_y (bottom) = top - label_height
-        label_top = (
-            self.template["page_height"]
-            - self.template["top_margin"]
-            - row * (self.template["label_height"] + self.template["vertical_gap"])
-        )
-        label_y = label_top - self.template["label_height"]
+        Args:
+            set_data: Dictionary containing set data
 
-        # Debug logging for first row to diagnose positioning issues
-        if row == 0:
-            logger.debug(
-                f"Row 0 positioning: label_index={label_index}, "
-                f"label_top={label_top:.2f}, label_y={label_y:.2f}, "
-                f"top_margin={self.template['top_margin']:.2f}, "
-                f"page_height={self.template['page_height']:.2f}, "
-                f"distance_from_top={self.template['page_height'] - label_top:.2f}"
-            )
+        Returns:
+            Label plan for the current slot, or None for placeholder labels
+        """
+        if self._is_placeholder(set_data):
+            return None
 
-        # Align text to the very top of the label
-        # Use label_top directly to ensure text is inside the label, not on the border
-        text_x = label_x + self.template["label_margin_x"]
-        text_y = label_top - self.template["label_margin_y"]
+        # Set name with set code and release date on the second line
+        full_set_name = set_data.get("name", "")
+        set_code = set_data.get("code", "").upper()
+        released_at = set_data.get("released_at")
+        release_date_str = format_release_date(released_at) if released_at else ""
 
-        # Calculate available width for text (label width minus margins and symbol space)
-        # Symbol is positioned at top-right, so reserve space for max symbol width plus padding
-        # For narrow labels (< 60pt), use a smaller symbol to fit text
-        if self.template["label_width"] >= 60:
-            self.effective_symbol_width = SET_SYMBOL_MAX_WIDTH
-            padding = 5
+        # Set symbol (resolved by _prefetch_assets)
+        set_id = set_data.get("id")
+        if set_id in self._symbol_files:
+            symbol_file = self._symbol_files[set_id]
         else:
-            # Narrow labels - use smaller symbol (40% of width)
-            self.effective_symbol_width = min(
-                SET_SYMBOL_MAX_WIDTH, self.template["label_width"] * 0.4
-            )
-            padding = 3
+            symbol_file = get_symbol_file(set_data)
 
-        symbol_area_start = (
-            label_x
-            + self.template["label_width"]
-            - self.template["label_margin_x"]
-            - self.effective_symbol_width
-            - padding
+        return self._make_plan(
+            abbreviate_set_name(full_set_name),
+            f"{set_code} - {release_date_str}",
+            symbol_file,
+            full_set_name,
         )
-        max_text_width = symbol_area_start - text_x
 
-        # Ensure max_text_width is positive
-        if max_text_width <= 0:
-            logger.warning(
-                f"Label too narrow for text: max_width={max_text_width}, "
-                f"label_width={self.template['label_width']}, "
-                f"symbol_area={self.SYMBOL_AREA_WIDTH}"
-            )
-            max_text_width = max(10, self.template["label_width"] - self.SYMBOL_AREA_WIDTH - 20)
+    def _plan_type_label(self, set_data: dict) -> _LabelPlan | None:
+        """
+        Resolve the text, position and symbol of a card type label without drawing it.
 
-        if self.view_mode == "types":
-            # Draw card type name (e.g., "Creature", "Instant")
-            card_type = set_data.get("type", set_data.get("name", ""))
-            color = set_data.get("color", "")
-
-            fitted_name = fit_text_to_width(
-                card_type,
-                "EBGaramondBold",
-                FONT_SIZE_ROW1,
-                max_text_width,
-                self.canvas,
+        Args:
+            set_data: Dictionary containing card type data
+
+        Returns:
+            Label plan for the current slot, or None for placeholder labels
+        """
+        if self._is_placeholder(set_data):
+            return None
+
+        # Card type name (e.g., "Creature", "Instant") with the color on the second line
+        card_type = set_data.get("type", set_data.get("name", ""))
+        color = set_data.get("color", "")
+
+        # Mana symbol for the color (resolved by _prefetch_assets)
+        return self._make_plan(
+            card_type,
+            color if color else "",
+            self._mana_symbol_files.get(color),
+            f"{color} {card_type}",
+        )
+
+    def _make_plan(
+        self, line1: str, line2: str, symbol_file: str | None, symbol_name: str
+    ) -> _LabelPlan:
+        """
+        Fit a label's text into the current slot.
+
+        Args:
+            line1: First text line (set name or card type)
+            line2: Second text line (set code and date, or color)
+            symbol_file: Path to the symbol file, if any
+            symbol_name: Set or card type name used when logging symbol errors
+
+        Returns:
+            Label plan for the current slot
+        """
+        label_x, label_y, text_x, text_y, max_text_width = self._label_slots[self.current_label]
+        logger.debug(
+            f"Planning text for '{symbol_name}' at ({text_x}, {text_y}), max_width={max_text_width}"
+        )
+        return _LabelPlan(
+            label_x=label_x,
+            label_y=label_y,
+            text_x=text_x,
+            text_y=text_y,
+            line1=fit_text_to_width(
+                line1, "EBGaramondBold", FONT_SIZE_ROW1, max_text_width, self.canvas
+            ),
+            line2=fit_text_to_width(
+                line2, "SourceSansProRegular", FONT_SIZE_ROW2, max_text_width, self.canvas
+            ),
+            symbol_file=symbol_file,
+            symbol_name=symbol_name,
+        )
+
+    def _draw_page(self, plans: list[_LabelPlan]) -> None:
+        """
+        Draw the planned labels of one page.
+
+        Labels are emitted grouped by text line so each font is selected at most
+        once per page rather than twice per label; symbols are drawn last since
+        their saveState/restoreState would otherwise reset the current font.
+
+        Args:
+            plans: Labels on the page, in slot order
+        """
+        if not plans:
+            return
+
+        # Text is drawn in the default fill color (black)
+        self._set_font("EBGaramondBold", FONT_SIZE_ROW1)
+        for plan in plans:
+            self.canvas.drawString(plan.text_x, plan.text_y, plan.line1)
+
+        # Second text line sits below the first
+        self._set_font("SourceSansProRegular", FONT_SIZE_ROW2)
+        for plan in plans:
+            if plan.line2:
+                self.canvas.drawString(plan.text_x, plan.text_y - FONT_SIZE_ROW1 - 4, plan.line2)
+
+        for plan in plans:
+            if plan.symbol_file:
+                self._draw_symbol(plan.symbol_file, plan.label_x, plan.label_y, plan.symbol_name)
+
+    def _compute_label_slots(self) -> tuple[tuple[float, float, float, float, float], ...]:
+        """Precompute the position of every label slot on a page.
+
+        The layout only depends on the template, so it is calculated once per
+        template and process instead of on every label.
+
+        Returns:
+            Tuple of (label_x, label_y, text_x, text_y, max_text_width) per slot
+        """
+        template = self.template
+        labels_per_row = int(template["labels_per_row"])
+        labels_per_page = labels_per_row * int(template["label_rows"])
+        label_width = template["label_width"]
+        label_height = template["label_height"]
+        padding = 5 if label_width >= 60 else 3
+
+        slots: list[tuple[float, float, float, float, float]] = []
+        for label_index in range(labels_per_page):
+            row, col = divmod(label_index, labels_per_row)
+
+            # Calculate label position using template margins and gaps
+            label_x = template["left_margin"] + col * (label_width + template["horizontal_gap"])
+            # Position from top: top of label = page_height - top_margin - row * (height + gap)
+            # Then label_y (bottom) = top - label_height
+            label_top = (
+                template["page_height"]
+                - template["top_margin"]
+                - row * (label_height + template["vertical_gap"])
             )
+            label_y = label_top - label_height
+
+            # Debug logging for first row to diagnose positioning issues
+            if row == 0:
+                logger.debug(
+                    f"Row 0 positioning: label_index={label_index}, "
+                    f"label_top={label_top:.2f}, label_y={label_y:.2f}, "
+                    f"top_margin={template['top_margin']:.2f}, "
+                    f"page_height={template['page_height']:.2f}, "
+                    f"distance_from_top={template['page_height'] - label_top:.2f}"
+                )
 
-            # Draw color name on second line (optional, or leave empty)
-            text_line2 = color if color else ""
+            # Align text to the very top of the label
+            # Use label_top directly to ensure text is inside the label, not on the border
+            text_x = label_x + template["label_margin_x"]
+            text_y = label_top - template["label_margin_y"]
 
-            # Fit second line to width as well
-            fitted_line2 = fit_text_to_width(
-                text_line2, "SourceSansProRegular", FONT_SIZE_ROW2, max_text_width, self.canvas
+            # Available width for text: label width minus margins and the symbol area
+            # (symbol is positioned at top-right, reserve its max width plus padding)
+            symbol_area_start = (
+                label_x
+                + label_width
+                - template["label_margin_x"]
+                - self.effective_symbol_width
+                - padding
             )
+            max_text_width = symbol_area_start - text_x
 
-            logger.debug(
-                f"Drawing text for type '{card_type}' (color: {color}) at ({text_x}, {text_y}), "
-                f"max_width={max_text_width}"
+            # Ensure max_text_width is positive
+            if max_text_width <= 0:
+                logger.warning(
+                    f"Label too narrow for text: max_width={max_text_width}, "
+                    f"label_width={label_width}, "
+                    f"symbol_area={self.SYMBOL_AREA_WIDTH}"
+                )
+                max_text_width = max(10, label_width - self.SYMBOL_AREA_WIDTH - 20)
+
+            # Coordinates rounded to 1/100 pt keep the page content streams short
+            slots.append(
+                (
+                    round(label_x, 2),
+                    round(label_y, 2),
+                    round(text_x, 2),
+                    round(text_y, 2),
+                    max_text_width,
+                )
             )
-            self.canvas.setFont("EBGaramondBold", FONT_SIZE_ROW1)
-            self.canvas.setFillColorRGB(0, 0, 0)
-            self.canvas.drawString(text_x, text_y, fitted_name)
-
-            # Position second text line below the first (if color is shown)
-            if fitted_line2:
-                second_text_y = text_y - FONT_SIZE_ROW1 - 4
-                self.canvas.setFont("SourceSansProRegular", FONT_SIZE_ROW2)
-                self.canvas.drawString(text_x, second_text_y, fitted_line2)
-
-            # Draw mana symbol for the color
-            mana_symbol_file = self._get_mana_symbol_file(color)
-            if mana_symbol_file:
-                self._draw_symbol(mana_symbol_file, label_x, label_y, f"{color} {card_type}")
+        return tuple(slots)
+
+    def _prefetch_assets(self) -> None:
+        """Resolve symbol files and pre-parse SVG drawings before the label loop.
+
+        Downloads and parsing are independent per symbol, so they run on a thread
+        pool; the draw loop is then left with cache lookups and PDF emission.
+        """
+        if self.view_mode == "types":
+            # Few colors and a lazily shared symbology table: resolve sequentially
+            self._prefetch_mana_symbols()
+            symbol_files = list(self._mana_symbol_files.values())
         else:
-            # Draw set name
-            full_set_name = set_data.get("name", "")
-            fitted_name = fit_text_to_width(
-                abbreviate_set_name(full_set_name),
-                "EBGaramondBold",
-                FONT_SIZE_ROW1,
-                max_text_width,
-                self.canvas,
-            )
+            unique_sets: dict[str, dict] = {}
+            for set_data in self.selected_sets:
+                set_id = set_data.get("id")
+                if set_id and set_id not in unique_sets:
+                    unique_sets[set_id] = set_data
+            with ThreadPoolExecutor(max_workers=PDF_PREFETCH_WORKERS) as executor:
+                resolved = executor.map(get_symbol_file, unique_sets.values())
+                self._symbol_files = dict(zip(unique_sets, resolved, strict=True))
+            symbol_files = list(self._symbol_files.values())
+
+        # Pre-parse SVGs into the drawing cache (no more than it can hold)
+        svg_files = [f for f in dict.fromkeys(symbol_files) if f and f.lower().endswith(".svg")]
+        svg_files = svg_files[:_cache_max_size]
+        if not svg_files:
+            return
 
-            # Draw set code and release date
-            set_code = set_data.get("code", "").upper()
-            release_date_str = ""
-            released_at = set_data.get("released_at")
-            if released_at:
-                try:
-                    date_obj = datetime.datetime.strptime(released_at, "%Y-%m-%d")
-                    release_date_str = date_obj.strftime("%B %Y")
-                except ValueError:
-                    release_date_str = released_at
-
-            text_line2 = f"{set_code} - {release_date_str}"
-
-            # Fit second line to width as well
-            fitted_line2 = fit_text_to_width(
-                text_line2, "SourceSansProRegular", FONT_SIZE_ROW2, max_text_width, self.canvas
-            )
+        def parse(file_path: str) -> None:
+            try:
+                _load_svg_drawing(file_path)
+            except Exception as e:
+                logger.error(f"Error pre-parsing SVG {file_path}: {e}")
 
-            logger.debug(
-                f"Drawing text for set '{full_set_name}' at ({text_x}, {text_y}), "
-                f"max_width={max_text_width}"
-            )
-            self.canvas.setFont("EBGaramondBold", FONT_SIZE_ROW1)
-            self.canvas.setFillColorRGB(0, 0, 0)
-            self.canvas.drawString(text_x, text_y, fitted_name)
+        with ThreadPoolExecutor(max_workers=PDF_PREFETCH_WORKERS) as executor:
+            list(executor.map(parse, svg_files))
 
-            # Position second text line below the first
-            second_text_y = text_y - FONT_SIZE_ROW1 - 4
-            self.canvas.setFont("SourceSansProRegular", FONT_SIZE_ROW2)
-            self.canvas.drawString(text_x, second_text_y, fitted_line2)
+    def _prefetch_mana_symbols(self) -> None:
+        """Resolve the mana symbol file for every color on the sheet before drawing.
 
-            # Draw the set symbol (lazy loading - only load if needed)
-            local_file = get_symbol_file(set_data)
-            if local_file:
-                self._draw_symbol(local_file, label_x, label_y, full_set_name)
+        Keeps network I/O out of the label loop, which then only does dict lookups.
+        """
+        for set_data in self.selected_sets:
+            color = set_data.get("color")
+            if color and color not in self._mana_symbol_files:
+                self._mana_symbol_files[color] = self._get_mana_symbol_file(color)
 
     def _get_mana_symbol_file(self, color: str) -> str | None:
         """
@@ -359,12 +955,7 @@ class PDFGenerator:
         Returns:
             Path to mana symbol SVG file, or None if unavailable
         """
-        import time
-
-        import requests
-
         from src.cache.cache_manager import get_cache_manager
-        from src.config import SCRYFALL_API_RATE_LIMIT_DELAY, logger
 
         # Map color names to Scryfall mana symbol codes
         # These are the symbol codes used in mana costs
@@ -403,17 +994,23 @@ class PDFGenerator:
 
         try:
             time.sleep(SCRYFALL_API_RATE_LIMIT_DELAY)
-            response = requests.get(symbol_url, timeout=30)
+            response = get_download_session().get(symbol_url, timeout=30, stream=True)
         except requests.RequestException as e:
             logger.error(f"Error downloading mana symbol: {e}")
             return None
 
-        if response.status_code != 200:
-            logger.error(f"Failed to download mana symbol, status: {response.status_code}")
-            return None
+        try:
+            if response.status_code != 200:
+                logger.error(f"Failed to download mana symbol, status: {response.status_code}")
+                return None
+
+            # Stream to cache without holding the whole body in memory
+            cached_path = cache_manager.save_symbol(
+                symbol_id, response.iter_content(chunk_size=SYMBOL_DOWNLOAD_CHUNK_SIZE)
+            )
+        finally:
+            response.close()
 
-        # Save to cache
-        cached_path = cache_manager.save_symbol(symbol_id, response.content)
         if cached_path:
             logger.info(f"Saved mana symbol to cache: {cached_path}")
             return cached_path
@@ -435,21 +1032,19 @@ class PDFGenerator:
         Returns:
             SVG URI string or None if not found
         """
-        import time
-
-        import requests
-
-        from src.config import SCRYFALL_API_RATE_LIMIT_DELAY, SCRYFALL_API_TIMEOUT, logger
-
         # Cache the symbology data to avoid repeated API calls
         if not hasattr(self, "_symbology_cache"):
             self._symbology_cache: dict[str, str] | None = None
 
+        # Fall back to the persisted symbology before calling the API
+        if self._symbology_cache is None:
+            self._symbology_cache = _load_symbology_cache()
+
         # Fetch symbology data if not cached
         if self._symbology_cache is None:
             try:
                 time.sleep(SCRYFALL_API_RATE_LIMIT_DELAY)
-                response = requests.get(
+                response = get_download_session().get(
                     "https://api.scryfall.com/symbology", timeout=SCRYFALL_API_TIMEOUT
                 )
                 if response.status_code == 200:
@@ -470,6 +1065,7 @@ class PDFGenerator:
                         if symbol_text and svg_uri:
                             self._symbology_cache[symbol_text] = svg_uri
                     logger.debug(f"Cached {len(self._symbology_cache)} symbols from symbology API")
+                    _save_symbology_cache(self._symbology_cache)
                 else:
                     logger.warning(f"Failed to fetch symbology API, status: {response.status_code}")
                     return None
@@ -523,80 +1119,120 @@ class PDFGenerator:
             target_height: Target height for symbol
             set_name: Name of set for logging
         """
-        # Use cached drawing if available (lazy loading optimization)
-        drawing = self._get_cached_svg_drawing(local_file)
-        if drawing is None:
-            try:
-                drawing = svg2rlg(local_file)
-                if drawing is not None:
-                    self._cache_svg_drawing(local_file, drawing)
-            except Exception as e:
-                logger.error(f"Error converting SVG to drawing for set '{set_name}': {e}")
-                return
+        # Parsed drawings and their dimensions/bounds are cached together
+        try:
+            symbol = _load_svg_drawing(local_file)
+        except Exception as e:
+            logger.error(f"Error converting SVG to drawing for set '{set_name}': {e}")
+            return
 
-        if drawing is None:
+        if symbol is None:
             return
 
-        # Get dimensions
-        dimensions = get_svg_intrinsic_dimensions(local_file)
-        if dimensions:
-            intrinsic_width, intrinsic_height = dimensions
-            logger.debug(f"Extracted viewBox dimensions: {intrinsic_width}x{intrinsic_height}")
-        else:
-            try:
-                bounds = drawing.getBounds()
-                intrinsic_width = bounds[2] - bounds[0]
-                intrinsic_height = bounds[3] - bounds[1]
-                logger.debug(f"Extracted bounds dimensions: {intrinsic_width}x{intrinsic_height}")
-            except Exception as e:
-                logger.error(f"Error getting bounds from drawing for set '{set_name}': {e}")
-                intrinsic_height = drawing.height
-                intrinsic_width = drawing.width
-                logger.debug(f"Fallback dimensions: {intrinsic_width}x{intrinsic_height}")
+        transform = self._get_symbol_transform(local_file, symbol, target_height)
 
-        if intrinsic_height <= 0:
-            intrinsic_height = 1
+        # Position symbol in top-right corner
+        # Y: align top of symbol with top of first text line
+        # Calculate label_top from label_y, then text_y same way as in _compute_label_slots
+        # label_top = label_y + label_height (since label_y is bottom of label)
+        label_top = label_y + self.template["label_height"]
+        text_y_pos = label_top - self.template["label_margin_y"]
+        text_top_y = text_y_pos + FONT_SIZE_ROW1
+        symbol_y = text_top_y - transform.scaled_height
+        # X: right edge of label minus margin minus symbol width
+        symbol_x = (
+            label_x
+            + self.template["label_width"]
+            - self.template["label_margin_x"]
+            - transform.scaled_width
+        )
 
-        # Calculate scale
+        logger.debug(f"Drawing SVG symbol at ({symbol_x}, {symbol_y})")
+        scale = transform.scale
+        self.canvas.saveState()
+        # translate(symbol_x, symbol_y), scale and translate(-bounds) as a single matrix
+        self.canvas.transform(
+            scale,
+            0,
+            0,
+            scale,
+            symbol_x - scale * transform.bounds_x,
+            symbol_y - scale * transform.bounds_y,
+        )
+
+        # Stamp the symbol's form XObject; it is rendered once per document
+        self.canvas.doForm(self._get_symbol_form(local_file, symbol))
+        self.canvas.restoreState()
+
+    def _get_symbol_transform(
+        self, local_file: str, symbol: _SvgSymbol, target_height: float
+    ) -> _SymbolTransform:
+        """Get the scale and bounds offset for a symbol, computing it once per size.
+
+        Args:
+            local_file: Path to SVG file (transform cache key)
+            symbol: Parsed symbol with intrinsic dimensions and bounds
+            target_height: Target height for symbol
+
+        Returns:
+            Cached transform for the symbol at this size
+        """
         # Use effective symbol width for narrow labels
         effective_symbol_width = getattr(self, "effective_symbol_width", SET_SYMBOL_MAX_WIDTH)
+        key = (local_file, int(target_height * 100), int(effective_symbol_width * 100))
+        transform = self._svg_transform_cache.get(key)
+        if transform is not None:
+            return transform
+
+        intrinsic_width, intrinsic_height = symbol.width, symbol.height
         scale_from_height = target_height / intrinsic_height
         scale_from_width = effective_symbol_width / intrinsic_width
         scale_factor = min(scale_from_height, scale_from_width)
-        scaled_symbol_height = intrinsic_height * scale_factor
-        scaled_width = intrinsic_width * scale_factor
 
         logger.debug(
             f"Scale factors: height {scale_from_height}, width {scale_from_width}; "
-            f"chosen scale: {scale_factor}, scaled width: {scaled_width}"
+            f"chosen scale: {scale_factor}"
         )
 
-        # Position symbol in top-right corner
-        # Y: align top of symbol with top of first text line
-        # Calculate label_top from label_y, then text_y same way as in _draw_label
-        # label_top = label_y + label_height (since label_y is bottom of label)
-        label_top = label_y + self.template["label_height"]
-        text_y_pos = label_top - self.template["label_margin_y"]
-        text_top_y = text_y_pos + FONT_SIZE_ROW1
-        symbol_y = text_top_y - scaled_symbol_height
-        # X: right edge of label minus margin minus symbol width
-        symbol_x = (
-            label_x + self.template["label_width"] - self.template["label_margin_x"] - scaled_width
+        bounds_x, bounds_y = symbol.bounds[:2] if symbol.bounds is not None else (0, 0)
+        transform = _SymbolTransform(
+            scale=scale_factor,
+            bounds_x=bounds_x,
+            bounds_y=bounds_y,
+            scaled_width=intrinsic_width * scale_factor,
+            scaled_height=intrinsic_height * scale_factor,
         )
+        self._svg_transform_cache[key] = transform
+        return transform
 
-        logger.debug(f"Drawing SVG symbol at ({symbol_x}, {symbol_y})")
-        self.canvas.saveState()
-        self.canvas.translate(symbol_x, symbol_y)
-        self.canvas.scale(scale_factor, scale_factor)
+    def _get_symbol_form(self, local_file: str, symbol: _SvgSymbol) -> str:
+        """Get the form XObject name for a symbol, rendering it on first use.
 
-        try:
-            bounds = drawing.getBounds()
-            self.canvas.translate(-bounds[0], -bounds[1])
-        except Exception as e:
-            logger.error(f"Error translating drawing for set '{set_name}': {e}")
+        Repeated sets reference the same form instead of re-emitting the
+        vector content for every label.
 
+        Args:
+            local_file: Path to SVG file (form cache key)
+            symbol: Parsed symbol to render into the form
+
+        Returns:
+            Name of the form XObject in this document
+        """
+        form_name = self._xobject_cache.get(local_file)
+        if form_name is not None:
+            return form_name
+
+        form_name = f"SetSymbol{len(self._xobject_cache)}"
+        drawing = symbol.drawing
+        x1, y1, x2, y2 = symbol.bounds or (0, 0, drawing.width, drawing.height)
+        # Pad the bounding box so strokes outside the geometric bounds aren't clipped
+        pad = max(x2 - x1, y2 - y1, 1)
+        self.canvas.beginForm(form_name, x1 - pad, y1 - pad, x2 + pad, y2 + pad)
         renderPDF.draw(drawing, self.canvas, 0, 0)
-        self.canvas.restoreState()
+        self.canvas.endForm()
+
+        self._xobject_cache[local_file] = form_name
+        return form_name
 
     def _draw_raster_symbol(
         self, local_file: str, label_x: float, label_y: float, target_height: float
@@ -619,7 +1255,7 @@ class PDFGenerator:
 
             # Position symbol in top-right corner
             # Y: align top of symbol with top of first text line
-            # Calculate label_top from label_y, then text_y same way as in _draw_label
+            # Calculate label_top from label_y, then text_y same way as in _compute_label_slots
             label_top = label_y + self.template["label_height"]
             text_y_pos = label_top - self.template["label_margin_y"]
             text_top_y = text_y_pos + FONT_SIZE_ROW1
@@ -650,66 +1286,38 @@ class PDFGenerator:
         except Exception as e:
             logger.error(f"Error drawing raster symbol: {e}")
 
-    def _get_cached_svg_drawing(self, file_path: str):
-        """Get cached SVG drawing or None if not cached.
-
-        Uses LRU cache: moves accessed item to end (most recently used).
-
-        Args:
-            file_path: Path to SVG file
-
-        Returns:
-            Cached drawing object or None
-        """
-        if file_path in _svg_drawing_cache:
-            # Move to end (most recently used) for LRU behavior
-            _svg_drawing_cache.move_to_end(file_path)
-            return _svg_drawing_cache[file_path]
-        return None
-
-    def _cache_svg_drawing(self, file_path: str, drawing: Any) -> None:
-        """Cache SVG drawing for reuse with LRU eviction.
-
-        Args:
-            file_path: Path to SVG file
-            drawing: Drawing object to cache
-        """
-        # Limit cache size to prevent memory issues
-        if len(_svg_drawing_cache) >= _cache_max_size:
-            # Remove oldest entry (LRU eviction - removes least recently used)
-            _svg_drawing_cache.popitem(last=False)
-
-        # Add new entry at end (most recently used)
-        _svg_drawing_cache[file_path] = drawing
-
-    def _merge_with_template(self) -> io.BytesIO:
+    def _merge_with_template(
+        self, labels: io.BytesIO | Path, destination: io.BytesIO | Path
+    ) -> bool:
         """
         Merge generated labels PDF with template PDF for debugging.
 
         The template PDF is used as the background, and labels are overlaid on top.
 
+        Args:
+            labels: Rendered labels PDF (buffer or file)
+            destination: Buffer or file to write the merged PDF to
+
         Returns:
-            BytesIO buffer containing merged PDF data
+            True if the merged PDF was written, False if labels should be used as-is
         """
         if self.template_path is None:
-            self.buffer.seek(0)
-            return self.buffer
+            return False
 
         try:
-            template_file = Path(self.template_path)
-            if not template_file.exists():
+            template_data = _read_template_pdf(self.template_path)
+            if template_data is None:
                 logger.warning(
                     f"Template PDF not found: {self.template_path}, "
                     "returning labels without template"
                 )
-                self.buffer.seek(0)
-                return self.buffer
+                return False
 
             logger.info(f"Merging labels with template PDF: {self.template_path}")
 
             # Read the template PDF
-            template_reader = PdfReader(str(template_file))
-            labels_reader = PdfReader(self.buffer)
+            template_reader = PdfReader(io.BytesIO(template_data))
+            labels_reader = PdfReader(labels)
 
             # Verify page dimensions match
             if len(template_reader.pages) > 0 and len(labels_reader.pages) > 0:
@@ -738,79 +1346,55 @@ class PDFGenerator:
                         "Labels may not align correctly."
                     )
 
-            # Create output PDF writer
-            output_writer = PdfWriter()
+            template_pages = template_reader.pages
+            labels_pages = labels_reader.pages
+            if len(template_pages) == 0:
+                logger.warning("Template PDF has no pages, skipping merge")
+                return False
 
             # Get number of pages needed
             labels_per_page = self.template["labels_per_row"] * self.template["label_rows"]
             total_pages_needed = (len(self.selected_sets) + labels_per_page - 1) // labels_per_page
 
-            # Merge each page
+            # Each template page is embedded once as a form XObject; every page draws its
+            # template form underneath the labels page's own, untouched content stream.
+            # If template has fewer pages, the last template page is reused.
+            output_writer = PdfWriter()
+            draw = DecodedStreamObject()
+            draw.set_data(f"q {_TEMPLATE_FORM_NAME} Do Q\n".encode())
+            template_draw = output_writer._add_object(draw)
+            template_forms: dict[int, IndirectObject] = {}
             for page_num in range(int(total_pages_needed)):
-                # Get corresponding labels page first
-                if page_num >= len(labels_reader.pages):
-                    # No more label pages, just use template
-                    if page_num < len(template_reader.pages):
-                        template_page = template_reader.pages[page_num]
-                    elif len(template_reader.pages) > 0:
-                        # Clone the last template page for reuse
-                        temp_writer = PdfWriter()
-                        temp_writer.add_page(template_reader.pages[-1])
-                        temp_buffer = io.BytesIO()
-                        temp_writer.write(temp_buffer)
-                        temp_buffer.seek(0)
-                        temp_reader = PdfReader(temp_buffer)
-                        template_page = temp_reader.pages[0]
-                    else:
-                        logger.warning("Template PDF has no pages, skipping merge")
-                        self.buffer.seek(0)
-                        return self.buffer
-                    output_writer.add_page(template_page)
-                    continue
-
-                labels_page = labels_reader.pages[page_num]
-
-                # Use template page if available, otherwise create blank page
-                if page_num < len(template_reader.pages):
-                    source_template_page = template_reader.pages[page_num]
+                template_index = min(page_num, len(template_pages) - 1)
+                template_page = template_pages[template_index]
+                template_form = template_forms.get(template_index)
+                if template_form is None:
+                    template_form = _add_template_form(output_writer, template_page)
+                    template_forms[template_index] = template_form
+
+                if page_num < len(labels_pages):
+                    page = output_writer.add_page(labels_pages[page_num])
                 else:
-                    # If template has fewer pages, use the last template page
-                    if len(template_reader.pages) > 0:
-                        source_template_page = template_reader.pages[-1]
-                    else:
-                        logger.warning("Template PDF has no pages, skipping merge")
-                        self.buffer.seek(0)
-                        return self.buffer
-
-                # Create a copy of the template page to avoid modifying the original
-                # This is critical when reusing the same template page for multiple pages
-                # We clone by writing to a temp buffer and reading back
-                temp_writer = PdfWriter()
-                temp_writer.add_page(source_template_page)
-                temp_buffer = io.BytesIO()
-                temp_writer.write(temp_buffer)
-                temp_buffer.seek(0)
-                temp_reader = PdfReader(temp_buffer)
-                template_page = temp_reader.pages[0]
-
-                # Merge: template as background, labels on top
-                # Use expand=False to prevent scaling issues
-                template_page.merge_page(labels_page, expand=False)
-                output_writer.add_page(template_page)
-
-            # Write merged PDF to buffer
-            merged_buffer = io.BytesIO()
-            output_writer.write(merged_buffer)
-            merged_buffer.seek(0)
+                    page = output_writer.add_blank_page(
+                        float(template_page.mediabox.width), float(template_page.mediabox.height)
+                    )
+                _underlay_template(page, template_page, template_form, template_draw)
+
+            # Write merged PDF to the destination. pypdf opens paths unbuffered and
+            # emits many tiny writes, so files go through a buffered handle instead
+            if isinstance(destination, Path):
+                with destination.open("wb") as merged_file:
+                    output_writer.write(merged_file)
+            else:
+                output_writer.write(destination)
 
             logger.info(f"Successfully merged {total_pages_needed} pages with template")
-            return merged_buffer
+            return True
 
         except Exception as e:
             logger.error(f"Error merging with template: {e}", exc_info=True)
             # Return labels without template on error
-            self.buffer.seek(0)
-            return self.buffer
+            return False
 
     def _cleanup(self) -> None:
         """Clean up resources after PDF generation.
@@ -836,11 +1420,10 @@ class PDFGenerator:
             except Exception:
                 pass
 
-        # Force garbage collection with multiple generations for better cleanup
-        collected = gc.collect()
+        # With automatic GC paused nothing rendering allocated was promoted, so a
+        # young-generation collection reclaims it without walking every live object
+        collected = gc.collect(0)
         if collected > 0:
             logger.debug(f"Garbage collected {collected} objects during cleanup")
-        # Run collection again to catch objects with finalizers
-        gc.collect()
 
         logger.debug("PDFGenerator resources cleaned up")
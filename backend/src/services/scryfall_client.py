@@ -1,5 +1,9 @@
 """Scryfall API client for fetching and processing MTG set data."""
 
+import hashlib
+import json
+import logging
+import threading
 import time
 
 import requests
@@ -15,10 +19,25 @@ from src.config import (
     SCRYFALL_API_RATE_LIMIT_DELAY,
     SCRYFALL_API_RETRY_ATTEMPTS,
     SCRYFALL_API_TIMEOUT,
+    SCRYFALL_CARD_TYPES_URL,
     SET_TYPES,
     logger,
 )
 
+# Fields of a Scryfall set object the app reads (MTGSet fields plus "digital" for
+# filtering); the ~15 other fields per set are dropped right after parsing
+_SET_FIELDS = (
+    "id",
+    "name",
+    "code",
+    "set_type",
+    "card_count",
+    "released_at",
+    "icon_svg_uri",
+    "scryfall_uri",
+    "digital",
+)
+
 
 class ScryfallClient:
     """
@@ -34,7 +53,8 @@ class ScryfallClient:
         """Initialize ScryfallClient with optimized session and cache."""
         self.session = requests.Session()
 
-        # Configure connection pooling for better performance
+        # Configure connection pooling for better performance. Timeouts, connection
+        # errors and 429/5xx responses are retried here, at the urllib3 level
         retry_strategy = Retry(
             total=SCRYFALL_API_RETRY_ATTEMPTS,
             backoff_factor=0.3,
@@ -61,13 +81,33 @@ class ScryfallClient:
             }
         )
 
-        # Track last request time for rate limiting
-        self._last_request_time: float | None = None
+        # Earliest monotonic time the next request may start (rate limiting); requests
+        # run on worker threads, so the window is serialized with a lock
+        self._next_request_deadline = 0.0
+        self._rate_limit_lock = threading.Lock()
 
-        self.cache: dict[str, list[dict]] = {}  # Legacy cache, kept for backward compatibility
         self.cache_manager = get_cache_manager()
         self.logger = logger
         self._card_types_cache: list[str] | None = None
+        # Filtered sets memoized per fetch: (source sets, filtered sets, ETag)
+        self._filtered_sets_cache: tuple[list[dict], list[dict], str] | None = None
+        # Card types by color memoized per catalog: (catalog, types by color)
+        self._types_by_color_cache: tuple[list[str], dict[str, tuple[str, ...]]] | None = None
+
+    @property
+    def cache(self) -> dict[str, list[dict]]:
+        """
+        Legacy view of the cached sets, backed by the cache manager.
+
+        Returns:
+            {"sets": [...]} if sets are cached, otherwise an empty dictionary
+        """
+        cached_data = self.cache_manager.get("sets")
+        if isinstance(cached_data, CachedSetData):
+            return {"sets": cached_data.sets}
+        if isinstance(cached_data, list):
+            return {"sets": cached_data}
+        return {}
 
     def fetch_sets(self) -> list[dict]:
         """
@@ -87,8 +127,6 @@ class ScryfallClient:
             if isinstance(cached_data, CachedSetData):
                 if not cached_data.is_expired():
                     self.logger.debug("Using cached sets from CacheManager")
-                    # Update legacy cache for backward compatibility
-                    self.cache["sets"] = cached_data.sets
                     return cached_data.sets
                 else:
                     self.logger.debug("Cached sets expired, fetching fresh data")
@@ -99,88 +137,29 @@ class ScryfallClient:
 
         self.logger.info("Fetching sets from Scryfall API")
 
-        # Fetch function for cache
-        def fetch_from_api() -> list[dict]:
-            # Retry logic for improved reliability
-            for attempt in range(SCRYFALL_API_RETRY_ATTEMPTS):
-                try:
-                    # Rate limiting: Scryfall recommends 50-100ms delay between requests
-                    self._apply_rate_limit()
-
-                    response = self.session.get(self.BASE_URL, timeout=SCRYFALL_API_TIMEOUT)
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        sets = data.get("data", [])
-                        self.logger.info(f"Fetched {len(sets)} sets")
-                        return sets
-                    else:
-                        self.logger.error(
-                            f"Failed to fetch sets, status code: "
-                            f"{response.status_code} "
-                            f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS})"
-                        )
-                        if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                            continue
-                        raise HTTPException(
-                            status_code=500,
-                            detail=(
-                                f"Error fetching sets from Scryfall. Status: {response.status_code}"
-                            ),
-                        )
-
-                except requests.Timeout as e:
-                    self.logger.warning(
-                        f"Timeout while fetching sets "
-                        f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS}): {e}"
-                    )
-                    if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                        continue
-                    raise
-
-                except requests.RequestException as e:
-                    self.logger.error(
-                        f"Network error while fetching sets "
-                        f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS}): {e}"
-                    )
-                    if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                        continue
-                    raise
-
-            # All retries failed
-            self.logger.error("All retry attempts failed for fetching sets")
-            raise HTTPException(
-                status_code=500, detail="Network error fetching sets from Scryfall."
-            )
-
         try:
             # Use cache manager's get_or_fetch pattern
-            cached_value = self.cache_manager.get_or_fetch(cache_key, fetch_from_api)
+            cached_value = self.cache_manager.get_or_fetch(cache_key, self._fetch_sets_from_api)
 
             # Handle case where cache returns CachedSetData object
             if isinstance(cached_value, CachedSetData):
                 # TTLCache handles expiration, so if we got here, it's valid
                 self.logger.debug("Using cached sets from get_or_fetch")
-                # Update legacy cache for backward compatibility
-                self.cache["sets"] = cached_value.sets
                 return cached_value.sets
             elif isinstance(cached_value, list):
                 # Fresh fetch or legacy cache format - wrap in CachedSetData for future use
                 sets = cached_value
                 cached_set_data = CachedSetData(sets=sets)
                 self.cache_manager.set(cache_key, cached_set_data)
-                # Update legacy cache for backward compatibility
-                self.cache["sets"] = sets
                 return sets
             else:
                 # Unexpected type, fetch fresh
                 self.logger.warning(
                     f"Unexpected cache value type: {type(cached_value)}, fetching fresh"
                 )
-                sets = fetch_from_api()
+                sets = self._fetch_sets_from_api()
                 cached_set_data = CachedSetData(sets=sets)
                 self.cache_manager.set(cache_key, cached_set_data)
-                self.cache["sets"] = sets
                 return sets
         except HTTPException:
             # Invalidate cache on error
@@ -192,6 +171,31 @@ class ScryfallClient:
             self.logger.error(f"Unexpected error fetching sets: {e}")
             raise HTTPException(status_code=500, detail="Error fetching sets from Scryfall.")
 
+    def get_filtered_sets(self) -> tuple[list[dict], str]:
+        """
+        Fetch and filter sets, reusing the filtered result until the fetch changes.
+
+        The memo is keyed on the identity of the list returned by fetch_sets(),
+        which stays the same for as long as the cached fetch is valid, so cache
+        expiry or invalidation automatically triggers a recompute.
+
+        Returns:
+            Tuple of (filtered sets, ETag identifying this snapshot)
+
+        Raises:
+            HTTPException: If fetching sets fails
+        """
+        sets = self.fetch_sets()
+        memo = self._filtered_sets_cache
+        if memo is not None and memo[0] is sets:
+            return memo[1], memo[2]
+
+        filtered = self.filter_sets(sets)
+        payload = json.dumps(filtered, sort_keys=True, default=str).encode()
+        etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+        self._filtered_sets_cache = (sets, filtered, etag)
+        return filtered, etag
+
     @staticmethod
     def filter_sets(sets: list[dict]) -> list[dict]:
         """
@@ -203,30 +207,55 @@ class ScryfallClient:
         Returns:
             Filtered list of sets that meet criteria
         """
-        filtered: list[dict] = []
-        for s in sets:
-            set_type = s.get("set_type", "").lower()
-            card_count = s.get("card_count", 0)
-            code = s.get("code", "").lower()
-            digital = s.get("digital", False)
-
-            if set_type not in SET_TYPES:
-                logger.debug(f"Excluding set '{s.get('name')}' due to set_type '{set_type}'")
-                continue
-            if card_count < MINIMUM_SET_SIZE:
-                logger.debug(f"Excluding set '{s.get('name')}' due to card_count {card_count}")
-                continue
-            if code in IGNORED_SETS:
-                logger.debug(f"Excluding set '{s.get('name')}' due to ignored code '{code}'")
-                continue
-            if digital:
-                logger.debug(f"Excluding set '{s.get('name')}' due to digital-only release")
-                continue
-            filtered.append(s)
+        if logger.isEnabledFor(logging.DEBUG):
+            # Slow path: explain every excluded set
+            filtered: list[dict] = []
+            for s in sets:
+                reason = ScryfallClient._set_exclusion_reason(s)
+                if reason is None:
+                    filtered.append(s)
+                else:
+                    logger.debug(f"Excluding set '{s.get('name')}' due to {reason}")
+        else:
+            set_types = SET_TYPES
+            ignored_sets = IGNORED_SETS
+            minimum_set_size = MINIMUM_SET_SIZE
+            filtered = [
+                s
+                for s in sets
+                if s.get("set_type", "").lower() in set_types
+                and s.get("card_count", 0) >= minimum_set_size
+                and s.get("code", "").lower() not in ignored_sets
+                and not s.get("digital", False)
+            ]
 
         logger.info(f"Filtered sets count: {len(filtered)}")
         return filtered
 
+    @staticmethod
+    def _set_exclusion_reason(s: dict) -> str | None:
+        """
+        Explain why a set is excluded by filter_sets().
+
+        Args:
+            s: Set dictionary to check
+
+        Returns:
+            Reason the set is excluded, or None if it passes every criterion
+        """
+        set_type = s.get("set_type", "").lower()
+        if set_type not in SET_TYPES:
+            return f"set_type '{set_type}'"
+        card_count = s.get("card_count", 0)
+        if card_count < MINIMUM_SET_SIZE:
+            return f"card_count {card_count}"
+        code = s.get("code", "").lower()
+        if code in IGNORED_SETS:
+            return f"ignored code '{code}'"
+        if s.get("digital", False):
+            return "digital-only release"
+        return None
+
     @staticmethod
     def group_sets(sets: list[dict]) -> dict[str, list[dict]]:
         """
@@ -247,15 +276,52 @@ class ScryfallClient:
         logger.info(f"Grouped sets into {len(groups)} groups")
         return groups
 
-    def get_card_types_by_color(self) -> dict[str, list[str]]:
+    @staticmethod
+    def filter_and_group_sets(sets: list[dict]) -> dict[str, list[dict]]:
+        """
+        Filter sets and group the survivors by set_type in a single pass.
+
+        Equivalent to group_sets(filter_sets(sets)) without building the
+        intermediate filtered list.
+
+        Args:
+            sets: List of set dictionaries to filter and group
+
+        Returns:
+            Dictionary mapping set_type to list of sets that meet criteria
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            # Keep the per-set exclusion logging of filter_sets()
+            return ScryfallClient.group_sets(ScryfallClient.filter_sets(sets))
+
+        set_types = SET_TYPES
+        ignored_sets = IGNORED_SETS
+        minimum_set_size = MINIMUM_SET_SIZE
+        groups: dict[str, list[dict]] = {}
+        for s in sets:
+            set_type = s.get("set_type", "").lower()
+            if (
+                set_type in set_types
+                and s.get("card_count", 0) >= minimum_set_size
+                and s.get("code", "").lower() not in ignored_sets
+                and not s.get("digital", False)
+            ):
+                groups.setdefault(set_type.capitalize(), []).append(s)
+
+        logger.info(f"Grouped sets into {len(groups)} groups")
+        return groups
+
+    def get_card_types_by_color(self) -> dict[str, tuple[str, ...]]:
         """
         Get card types organized by color for label generation.
 
         Returns a structure where each color has a list of card types
         that can be used for labels. Each type is a selectable item.
+        The result is memoized per fetched catalog; every color shares
+        one immutable tuple of types.
 
         Returns:
-            Dictionary: {color: [type1, type2, ...]}
+            Dictionary: {color: (type1, type2, ...)}
         """
         # Card types to exclude (special/niche types not commonly used for organization)
         excluded_types = {
@@ -272,6 +338,10 @@ class ScryfallClient:
         # Fetch card types catalog
         try:
             card_types_catalog = self.fetch_card_types_catalog()
+            memo = self._types_by_color_cache
+            if memo is not None and memo[0] is card_types_catalog:
+                return dict(memo[1])
+            fetched = True
         except Exception as e:
             logger.warning(f"Failed to fetch card types catalog, using fallback: {e}")
             # Fallback to common types
@@ -285,6 +355,7 @@ class ScryfallClient:
                 "Land",
                 "Battle",
             ]
+            fetched = False
 
         # Filter out excluded types
         filtered_types = [t for t in card_types_catalog if t not in excluded_types]
@@ -306,9 +377,11 @@ class ScryfallClient:
         type_order = common_types + [t for t in filtered_types if t not in common_types]
 
         # Create structure: each color gets all types
-        result: dict[str, list[str]] = {}
-        for color in color_order:
-            result[color] = type_order.copy()
+        types = tuple(type_order)
+        result = dict.fromkeys(color_order, types)
+        if fetched:
+            self._types_by_color_cache = (card_types_catalog, result)
+            result = dict(result)
 
         logger.info(
             f"Organized {len(type_order)} card types across {len(color_order)} colors "
@@ -342,72 +415,9 @@ class ScryfallClient:
 
         self.logger.info("Fetching card types catalog from Scryfall API")
 
-        # Fetch function for cache
-        def fetch_from_api() -> list[str]:
-            for attempt in range(SCRYFALL_API_RETRY_ATTEMPTS):
-                try:
-                    # Rate limiting
-                    self._apply_rate_limit()
-
-                    url = "https://api.scryfall.com/catalog/card-types"
-                    response = self.session.get(url, timeout=SCRYFALL_API_TIMEOUT)
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data.get("object") == "catalog" and "data" in data:
-                            card_types = data["data"]
-                            self.logger.info(f"Fetched {len(card_types)} card types from catalog")
-                            return card_types
-                        else:
-                            self.logger.error("Unexpected response format from card types catalog")
-                            raise HTTPException(
-                                status_code=500,
-                                detail="Unexpected response format from Scryfall catalog.",
-                            )
-                    else:
-                        self.logger.error(
-                            f"Failed to fetch card types catalog, status code: "
-                            f"{response.status_code} "
-                            f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS})"
-                        )
-                        if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                            continue
-                        raise HTTPException(
-                            status_code=500,
-                            detail=(
-                                f"Error fetching card types catalog from Scryfall. "
-                                f"Status: {response.status_code}"
-                            ),
-                        )
-
-                except requests.Timeout as e:
-                    self.logger.warning(
-                        f"Timeout while fetching card types catalog "
-                        f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS}): {e}"
-                    )
-                    if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                        continue
-                    raise
-
-                except requests.RequestException as e:
-                    self.logger.error(
-                        f"Network error while fetching card types catalog "
-                        f"(attempt {attempt + 1}/{SCRYFALL_API_RETRY_ATTEMPTS}): {e}"
-                    )
-                    if attempt < SCRYFALL_API_RETRY_ATTEMPTS - 1:
-                        continue
-                    raise
-
-            # All retries failed
-            self.logger.error("All retry attempts failed for fetching card types catalog")
-            raise HTTPException(
-                status_code=500,
-                detail="Network error fetching card types catalog from Scryfall.",
-            )
-
         try:
             # Use cache manager's get_or_fetch pattern
-            card_types = self.cache_manager.get_or_fetch(cache_key, fetch_from_api)
+            card_types = self.cache_manager.get_or_fetch(cache_key, self._fetch_card_types_from_api)
 
             # Cache the result
             self.cache_manager.set(cache_key, card_types)
@@ -428,6 +438,83 @@ class ScryfallClient:
                 status_code=500, detail="Error fetching card types catalog from Scryfall."
             )
 
+    def _fetch_sets_from_api(self) -> list[dict]:
+        """
+        Fetch all sets from Scryfall API, bypassing the cache.
+
+        Returns:
+            List of set dictionaries from Scryfall API, trimmed to the fields in use
+
+        Raises:
+            HTTPException: If API returns error status
+            requests.RequestException: If the request fails after the session's retries
+        """
+        sets = [
+            {field: s[field] for field in _SET_FIELDS if field in s}
+            for s in self._get_json(self.BASE_URL, "sets").get("data", [])
+        ]
+        self.logger.info(f"Fetched {len(sets)} sets")
+        return sets
+
+    def _fetch_card_types_from_api(self) -> list[str]:
+        """
+        Fetch the card types catalog from Scryfall API, bypassing the cache.
+
+        Returns:
+            List of card type strings from Scryfall catalog
+
+        Raises:
+            HTTPException: If API returns error status or an unexpected payload
+            requests.RequestException: If the request fails after the session's retries
+        """
+        data = self._get_json(SCRYFALL_CARD_TYPES_URL, "card types catalog")
+        if data.get("object") != "catalog" or "data" not in data:
+            self.logger.error("Unexpected response format from card types catalog")
+            raise HTTPException(
+                status_code=500,
+                detail="Unexpected response format from Scryfall catalog.",
+            )
+        card_types = data["data"]
+        self.logger.info(f"Fetched {len(card_types)} card types from catalog")
+        return card_types
+
+    def _get_json(self, url: str, description: str) -> dict:
+        """
+        GET a Scryfall endpoint and decode its JSON body.
+
+        Timeouts, connection errors and 429/5xx responses are already retried
+        by the session's urllib3 Retry policy, so a single call is made here.
+
+        Args:
+            url: Scryfall API URL to request
+            description: What is being fetched, for log and error messages
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            HTTPException: If API returns a non-200 status
+            requests.RequestException: If the request fails after the session's retries
+        """
+        # Rate limiting: Scryfall recommends 50-100ms delay between requests
+        self._apply_rate_limit()
+
+        try:
+            response = self.session.get(url, timeout=SCRYFALL_API_TIMEOUT)
+        except requests.RequestException as e:
+            self.logger.error(f"Network error while fetching {description}: {e}")
+            raise
+
+        if response.status_code != 200:
+            self.logger.error(f"Failed to fetch {description}, status code: {response.status_code}")
+            raise HTTPException(
+                status_code=500,
+                detail=(
+                    f"Error fetching {description} from Scryfall. Status: {response.status_code}"
+                ),
+            )
+        return response.json()
+
     def _apply_rate_limit(self) -> None:
         """
         Apply rate limiting delay between requests.
@@ -435,10 +522,11 @@ class ScryfallClient:
         Scryfall API guidelines recommend 50-100ms delay between requests
         (approximately 10 requests per second).
         """
-        if self._last_request_time is not None:
-            elapsed = time.time() - self._last_request_time
-            if elapsed < SCRYFALL_API_RATE_LIMIT_DELAY:
-                sleep_time = SCRYFALL_API_RATE_LIMIT_DELAY - elapsed
-                time.sleep(sleep_time)
-
-        self._last_request_time = time.time()
+        with self._rate_limit_lock:
+            now = time.monotonic()
+            wait = self._next_request_deadline - now
+            if wait > 0:
+                time.sleep(wait)
+            self._next_request_deadline = (
+                max(now, self._next_request_deadline) + SCRYFALL_API_RATE_LIMIT_DELAY
+            )
@@ -2,14 +2,54 @@
 Pytest configuration and shared fixtures for MTG Label Generator tests.
 """
 
+import json
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
+import requests
+from reportlab.pdfbase import pdfmetrics
+from requests.adapters import BaseAdapter
 
+from src.cache.cache_manager import CachedSetData, CacheManager, get_cache_manager
+from src.services.scryfall_client import ScryfallClient
 
-@pytest.fixture
+# Load the Helvetica metrics ReportLab resolves lazily, so the first test that
+# measures text doesn't pay for it
+pdfmetrics.stringWidth("a", "Helvetica", 12)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register opt-in flags for slow test groups."""
+    parser.addoption(
+        "--run-uv",
+        action="store_true",
+        default=False,
+        help="run the slow tests marked 'uv' that spawn uv sync subprocesses",
+    )
+    parser.addoption(
+        "--use-requests-cache",
+        action="store_true",
+        default=False,
+        help="serve live Scryfall requests from a persistent requests-cache store",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip tests marked 'uv' unless --run-uv was given."""
+    if config.getoption("--run-uv"):
+        return
+    skip_uv = pytest.mark.skip(reason="need --run-uv option to run")
+    for item in items:
+        if "uv" in item.keywords:
+            item.add_marker(skip_uv)
+
+
+@pytest.fixture(scope="session")
 def mock_scryfall_response() -> dict:
-    """Mock Scryfall API response for sets."""
+    """Mock Scryfall API response for sets (shared across the run; read-only)."""
     return {
         "data": [
             {
@@ -36,9 +76,39 @@ def mock_scryfall_response() -> dict:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_scryfall_response_bytes(mock_scryfall_response) -> bytes:
+    """The mock Scryfall sets response serialized to a JSON body once per run."""
+    return json.dumps(mock_scryfall_response).encode()
+
+
+@pytest.fixture(scope="session")
+def full_card_types_catalog() -> list[str]:
+    """Full Scryfall card-types catalog (shared across the run; read-only)."""
+    return [
+        "Artifact",
+        "Battle",
+        "Conspiracy",
+        "Creature",
+        "Dungeon",
+        "Emblem",
+        "Enchantment",
+        "Hero",
+        "Instant",
+        "Kindred",
+        "Land",
+        "Phenomenon",
+        "Plane",
+        "Planeswalker",
+        "Scheme",
+        "Sorcery",
+        "Vanguard",
+    ]
+
+
+@pytest.fixture(scope="session")
 def sample_set_data() -> list[dict]:
-    """Sample set data for testing."""
+    """Sample set data for testing (shared across the run; read-only)."""
     return [
         {
             "id": "test-set-1",
@@ -61,6 +131,155 @@ def sample_set_data() -> list[dict]:
     ]
 
 
+@pytest.fixture(scope="session")
+def multi_sets() -> list[dict]:
+    """Three minimal sets without symbols (shared across the run; read-only)."""
+    return [
+        {"id": f"test-{i}", "name": f"Set {i}", "code": f"S{i}", "released_at": f"2023-0{i}-01"}
+        for i in range(1, 4)
+    ]
+
+
+@pytest.fixture
+def expired_cache_entry(mock_scryfall_response) -> CachedSetData:
+    """Cached copy of the mock sets that expired a day ago."""
+    now = time.monotonic()
+    return CachedSetData(
+        sets=list(mock_scryfall_response["data"]),
+        cached_at=now - 2 * 86400,
+        expires_at=now - 86400,
+    )
+
+
+@pytest.fixture
+def make_response() -> Callable[..., SimpleNamespace]:
+    """Factory for lightweight stand-ins of requests.Response."""
+
+    def _make_response(
+        status_code: int, body: dict | None = None, headers: dict | None = None
+    ) -> SimpleNamespace:
+        return SimpleNamespace(status_code=status_code, json=lambda: body, headers=headers or {})
+
+    return _make_response
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Drop the rate-limit pause taken before symbol and symbology downloads."""
+    monkeypatch.setattr("src.services.helpers.SCRYFALL_API_RATE_LIMIT_DELAY", 0)
+    monkeypatch.setattr("src.services.pdf_generator.SCRYFALL_API_RATE_LIMIT_DELAY", 0)
+
+
+@pytest.fixture
+def cache_stub(monkeypatch):
+    """Stand-in for the global cache manager that records symbol lookups and saves."""
+    stub = SimpleNamespace(cached_path=None, saved_path=None, lookups=[], saves=[])
+
+    def get_symbol(set_id):
+        stub.lookups.append(set_id)
+        return stub.cached_path
+
+    def save_symbol(set_id, content):
+        stub.saves.append((set_id, content))
+        return stub.saved_path
+
+    stub.get_symbol = get_symbol
+    stub.save_symbol = save_symbol
+    monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: stub)
+    return stub
+
+
+@pytest.fixture
+def fresh_cache():
+    """Start and end the test with an empty global cache manager."""
+    cache_manager = get_cache_manager()
+    cache_manager.clear()
+    yield cache_manager
+    cache_manager.clear()
+
+
+@pytest.fixture
+def isolated_cache(monkeypatch, tmp_path) -> CacheManager:
+    """A private CacheManager served by get_cache_manager() for one test.
+
+    Nothing is shared with other tests, so no clearing is needed and tests do
+    not depend on the order they run in.
+    """
+    cache_manager = CacheManager(symbol_cache_dir=tmp_path / "symbols")
+    monkeypatch.setattr("src.cache.cache_manager._cache_manager", cache_manager)
+    return cache_manager
+
+
+@pytest.fixture(scope="module")
+def shared_scryfall_client() -> ScryfallClient:
+    """One ScryfallClient (and requests session) per test module."""
+    return ScryfallClient()
+
+
+@pytest.fixture
+def scryfall_client(shared_scryfall_client, monkeypatch) -> ScryfallClient:
+    """The module's shared client with its rate limiter and memos reset for each test.
+
+    The client is pointed at the current get_cache_manager() instance, so
+    combined with ``fresh_cache`` or ``isolated_cache`` (requested first), this
+    keeps tests isolated without paying for a new session and connection pool
+    every time.
+    """
+    monkeypatch.setattr(shared_scryfall_client, "_next_request_deadline", 0.0)
+    monkeypatch.setattr(shared_scryfall_client, "cache_manager", get_cache_manager())
+    # Per-instance memos would otherwise leak results between tests
+    for memo in ("_card_types_cache", "_filtered_sets_cache", "_types_by_color_cache"):
+        monkeypatch.setattr(shared_scryfall_client, memo, None)
+    return shared_scryfall_client
+
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter that answers registered URLs without touching the network."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes: dict[str, tuple[int, bytes] | Exception] = {}
+        self.calls: list[str] = []
+
+    def add(
+        self,
+        url: str,
+        json_body: dict | None = None,
+        *,
+        status: int = 200,
+        error: Exception | None = None,
+    ) -> None:
+        """Answer GETs to url with json_body and status, or raise error instead."""
+        if error is not None:
+            self.routes[url] = error
+        else:
+            self.routes[url] = (status, json.dumps(json_body).encode())
+
+    def send(self, request, **kwargs) -> requests.Response:
+        self.calls.append(request.url)
+        route = self.routes.get(request.url)
+        if route is None:
+            raise requests.ConnectionError(f"No stubbed response for {request.url}")
+        if isinstance(route, Exception):
+            raise route
+        response = requests.Response()
+        response.status_code, response._content = route
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def scryfall_http(scryfall_client, monkeypatch) -> StubAdapter:
+    """Serve the shared client's HTTPS requests from a StubAdapter for one test."""
+    adapter = StubAdapter()
+    monkeypatch.setitem(scryfall_client.session.adapters, "https://", adapter)
+    return adapter
+
+
 @pytest.fixture
 def mock_requests_session():
     """Mock requests session for API testing."""
@@ -70,21 +289,39 @@ def mock_requests_session():
     return session
 
 
-@pytest.fixture
-def temp_image_dir(tmp_path):
-    """Temporary directory for test images."""
-    image_dir = tmp_path / "static" / "images"
+MOCK_SVG_CONTENT = """<?xml version="1.0"?>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+  <circle cx="50" cy="50" r="40" fill="blue"/>
+</svg>"""
+
+
+@pytest.fixture(scope="session")
+def temp_image_dir(tmp_path_factory):
+    """Temporary directory for test images, created once per run."""
+    image_dir = tmp_path_factory.mktemp("static") / "images"
     image_dir.mkdir(parents=True, exist_ok=True)
     return image_dir
 
 
-@pytest.fixture
-def mock_svg_file(tmp_path):
-    """Create a mock SVG file for testing."""
-    svg_file = tmp_path / "test_symbol.svg"
-    svg_content = """<?xml version="1.0"?>
-<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
-  <circle cx="50" cy="50" r="40" fill="blue"/>
-</svg>"""
-    svg_file.write_text(svg_content)
+@pytest.fixture(scope="session")
+def mock_svg_file(tmp_path_factory):
+    """Mock SVG file, written once per run (read-only; copy it to modify)."""
+    svg_file = tmp_path_factory.mktemp("svg") / "test_symbol.svg"
+    svg_file.write_text(MOCK_SVG_CONTENT)
     return svg_file
+
+
+@pytest.fixture(autouse=True)
+def svg_drawing_cache_dir(tmp_path, monkeypatch):
+    """Keep persisted SVG drawings out of the shared cache directory."""
+    cache_dir = tmp_path / "svg_drawings"
+    monkeypatch.setattr("src.services.pdf_generator.SVG_DRAWING_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def symbology_cache_file(tmp_path, monkeypatch):
+    """Keep the persisted Scryfall symbology out of the shared cache directory."""
+    cache_file = tmp_path / "symbology.json"
+    monkeypatch.setattr("src.services.pdf_generator.SYMBOLOGY_CACHE_FILE", cache_file)
+    return cache_file
@@ -0,0 +1,41 @@
+"""Shared fixtures for Scryfall API contract tests."""
+
+import pytest
+
+# How long a cached live Scryfall response is reused (12 hours)
+REQUESTS_CACHE_TTL = 12 * 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(fresh_cache):
+    """Start and end every contract test with an empty cache manager."""
+    return fresh_cache
+
+
+@pytest.fixture
+def use_requests_cache(request, tmp_path_factory):
+    """Cache live HTTP responses on disk when --use-requests-cache is given.
+
+    requests-cache is an optional tool and not part of the dev dependencies; the
+    test is skipped when the flag is set but the package is not installed. Responses
+    are kept in pytest's cache directory, or a temporary one when the cache provider
+    is disabled.
+    """
+    if not request.config.getoption("--use-requests-cache"):
+        yield
+        return
+
+    requests_cache = pytest.importorskip("requests_cache")
+    # config.cache is absent under -p no:cacheprovider; fall back to a per-run directory
+    pytest_cache = getattr(request.config, "cache", None)
+    if pytest_cache is not None:
+        cache_dir = pytest_cache.mkdir("requests-cache")
+    else:
+        cache_dir = tmp_path_factory.mktemp("requests-cache")
+    requests_cache.install_cache(
+        str(cache_dir / "scryfall.sqlite"), expire_after=REQUESTS_CACHE_TTL
+    )
+    try:
+        yield
+    finally:
+        requests_cache.uninstall_cache()
@@ -0,0 +1,12 @@
+"""Shared fixtures for integration tests (kept out of unit-only runs)."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.routes import create_app
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """Test client for the FastAPI app, built once for the whole run."""
+    return TestClient(create_app())
@@ -1,19 +1,12 @@
 """Integration tests for API endpoints."""
 
+import asyncio
 from unittest.mock import patch
 
 import pytest
-from fastapi.testclient import TestClient
+from fastapi import HTTPException
 
-from src.api.routes import create_app
-
-app = create_app()
-
-
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+from src.models.set_data import MTGSet
 
 
 class TestIndexEndpoint:
@@ -85,12 +78,25 @@ class TestApiSetsEndpoint:
         data = response.json()
         assert data == []
 
+    @patch("src.api.routes.scryfall_client.fetch_sets")
+    def test_api_sets_endpoint_etag_not_modified(self, mock_fetch, client, sample_set_data):
+        """Test that /api/sets sends cache headers and honours If-None-Match."""
+        mock_fetch.return_value = sample_set_data
+
+        response = client.get("/api/sets")
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "public, max-age=600"
+
+        cached_response = client.get("/api/sets", headers={"If-None-Match": etag})
+
+        assert cached_response.status_code == 304
+        assert cached_response.headers["etag"] == etag
+        assert cached_response.content == b""
+
     @patch("src.api.routes.scryfall_client.filter_sets")
     @patch("src.api.routes.scryfall_client.fetch_sets")
     def test_api_sets_endpoint_returns_dicts(self, mock_fetch, mock_filter, client):
         """Test that /api/sets returns dictionaries."""
-        from src.models.set_data import MTGSet
-
         sets = [
             MTGSet(
                 id="test-1",
@@ -137,11 +143,25 @@ class TestApiCardTypesEndpoint:
         assert isinstance(data["White"], list)
         assert "Creature" in data["White"]
 
+    @patch("src.api.routes.scryfall_client.get_card_types_by_color")
+    def test_api_card_types_endpoint_runs_off_event_loop(self, mock_get_types, client):
+        """Test that the blocking Scryfall call does not run on the event loop thread."""
+
+        def get_types() -> dict[str, list[str]]:
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()
+            return {"White": ["Creature"]}
+
+        mock_get_types.side_effect = get_types
+
+        response = client.get("/api/card-types")
+
+        assert response.status_code == 200
+        assert response.json() == {"White": ["Creature"]}
+
     @patch("src.api.routes.scryfall_client.get_card_types_by_color")
     def test_api_card_types_endpoint_api_error(self, mock_get_types, client):
         """Test GET /api/card-types when API returns error."""
-        from fastapi import HTTPException
-
         mock_get_types.side_effect = HTTPException(status_code=500, detail="API Error")
 
         response = client.get("/api/card-types")
@@ -2,19 +2,9 @@
 
 import time
 
-import pytest
-from fastapi.testclient import TestClient
-
-from src.api.routes import create_app
 from src.cache.cache_manager import CacheManager
 
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(create_app())
-
-
 class TestCacheHitRate:
     """Tests for cache hit rate measurement."""
 
@@ -1,43 +1,82 @@
 """Integration tests for PDF generation endpoint."""
 
+from collections.abc import Awaitable, Callable
 from io import BytesIO
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from fastapi import HTTPException
+from fastapi.responses import FileResponse
 from fastapi.testclient import TestClient
 
 from src.api.routes import create_app
+from src.services.pdf_generator import PLACEHOLDER_LABEL
 
-app = create_app()
+FAKE_PDF = b"%PDF-1.4 fake pdf content"
+
+
+class _StubPDFGenerator:
+    """Plain stand-in for PDFGenerator that writes a fixed PDF body."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        pass
+
+    def generate(self, output_path=None) -> BytesIO | None:
+        if output_path is None:
+            return BytesIO(FAKE_PDF)
+        with open(output_path, "wb") as f:
+            f.write(FAKE_PDF)
+        return None
 
 
 @pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+def mock_pdf_gen(monkeypatch) -> Mock:
+    """Replace the route's PDFGenerator with a Mock so tests can inspect its arguments.
+
+    Calls are forwarded to ``_StubPDFGenerator``, so every response carries ``FAKE_PDF``.
+    """
+    pdf_gen = Mock(side_effect=_StubPDFGenerator)
+    monkeypatch.setattr("src.api.routes.PDFGenerator", pdf_gen)
+    return pdf_gen
+
+
+@pytest.fixture
+def generate_pdf_handler(client) -> Callable[..., Awaitable[FileResponse]]:
+    """The /generate-pdf route coroutine, callable without HTTP or form parsing.
+
+    Unset form fields default to what FastAPI would pass for a missing field.
+    """
+    endpoint = next(route.endpoint for route in client.app.routes if route.path == "/generate-pdf")
+    defaults = {
+        "set_ids": None,
+        "card_type_ids": None,
+        "use_template": None,
+        "template": None,
+        "placeholders": 0,
+        "view_mode": "sets",
+    }
+    return lambda **form: endpoint(**(defaults | form))
 
 
 class TestGeneratePdfEndpoint:
     """Tests for POST /generate-pdf endpoint."""
 
-    @patch("src.api.routes.PDFGenerator")
+    @patch("src.api.routes.prefetch_symbol_files", new_callable=AsyncMock)
+    @patch("src.api.routes.PDFGenerator", _StubPDFGenerator)
     @patch("src.api.routes.scryfall_client.fetch_sets")
-    def test_generate_pdf_success(self, mock_fetch, mock_pdf_gen, client, sample_set_data):
+    def test_generate_pdf_success(self, mock_fetch, mock_prefetch, client, sample_set_data):
         """Test successful PDF generation."""
         mock_fetch.return_value = sample_set_data
 
-        # Mock PDF generator - return BytesIO that can be iterated
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
-
         response = client.post("/generate-pdf", data={"set_ids": ["test-set-1", "test-set-2"]})
 
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
         assert "attachment" in response.headers["content-disposition"]
         assert "mtg_labels.pdf" in response.headers["content-disposition"]
+        assert response.content == FAKE_PDF
+        # Symbols for the selected sets are prefetched before rendering
+        mock_prefetch.assert_awaited_once()
 
     @patch("src.api.routes.scryfall_client.fetch_sets")
     def test_generate_pdf_no_valid_sets(self, mock_fetch, client, sample_set_data):
@@ -64,23 +103,14 @@ class TestGeneratePdfEndpoint:
     @patch("src.api.routes.scryfall_client.fetch_sets")
     def test_generate_pdf_api_error(self, mock_fetch, client):
         """Test PDF generation when API fails."""
-        from fastapi import HTTPException
-
         mock_fetch.side_effect = HTTPException(status_code=500, detail="API Error")
 
         response = client.post("/generate-pdf", data={"set_ids": ["test-set-1"]})
 
         assert response.status_code == 500
 
-    @patch("src.api.routes.PDFGenerator")
     def test_generate_pdf_types_view_success(self, mock_pdf_gen, client):
         """Test successful PDF generation for types view."""
-        # Mock PDF generator - return BytesIO that can be iterated
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
-
         response = client.post(
             "/generate-pdf",
             data={
@@ -92,6 +122,7 @@ class TestGeneratePdfEndpoint:
         assert response.status_code == 200
         assert response.headers["content-type"] == "application/pdf"
         assert "attachment" in response.headers["content-disposition"]
+        assert response.content == FAKE_PDF
         # Verify PDFGenerator was called with correct data
         mock_pdf_gen.assert_called_once()
         call_args = mock_pdf_gen.call_args
@@ -118,14 +149,8 @@ class TestGeneratePdfEndpoint:
         response_json = response.json()
         assert "Please select at least one card type" in response_json["error"]["detail"]
 
-    @patch("src.api.routes.PDFGenerator")
     def test_generate_pdf_types_view_with_placeholders(self, mock_pdf_gen, client):
         """Test PDF generation for types view with placeholders."""
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
-
         response = client.post(
             "/generate-pdf",
             data={
@@ -142,8 +167,9 @@ class TestGeneratePdfEndpoint:
         # Should have 3 placeholders + 1 type item
         placeholder_count = sum(1 for item in items_data if item.get("__placeholder__"))
         assert placeholder_count == 3
+        # Placeholders share the module-level sentinel instead of fresh dicts
+        assert all(item is PLACEHOLDER_LABEL for item in items_data[:3])
 
-    @patch("src.api.routes.PDFGenerator")
     @patch("src.api.routes.scryfall_client.filter_sets")
     @patch("src.api.routes.scryfall_client.fetch_sets")
     def test_generate_pdf_sets_view_no_valid_sets(
@@ -162,21 +188,16 @@ class TestGeneratePdfEndpoint:
         response_json = response.json()
         assert "No valid sets selected" in response_json["error"]["detail"]
 
-    @patch("src.api.routes.PDFGenerator")
+    @patch("src.api.routes.prefetch_symbol_files", new_callable=AsyncMock)
     @patch("src.api.routes.scryfall_client.filter_sets")
     @patch("src.api.routes.scryfall_client.fetch_sets")
     def test_generate_pdf_sets_view_success(
-        self, mock_fetch, mock_filter, mock_pdf_gen, client, sample_set_data
+        self, mock_fetch, mock_filter, mock_prefetch, mock_pdf_gen, client, sample_set_data
     ):
         """Test successful PDF generation for sets view."""
         mock_fetch.return_value = sample_set_data
         mock_filter.return_value = sample_set_data
 
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
-
         response = client.post(
             "/generate-pdf",
             data={"set_ids": ["test-set-1"], "view_mode": "sets"},
@@ -187,129 +208,67 @@ class TestGeneratePdfEndpoint:
         call_args = mock_pdf_gen.call_args
         assert call_args[1]["view_mode"] == "sets"
 
-    @patch("src.api.routes.PDFGenerator")
-    def test_generate_pdf_invalid_template(self, mock_pdf_gen, client):
-        """Test PDF generation with invalid template name."""
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
-
-        response = client.post(
-            "/generate-pdf",
-            data={
-                "card_type_ids": ["White:Creature"],
-                "view_mode": "types",
-                "template": "invalid_template_name",
-            },
+    @pytest.mark.parametrize(
+        ("enable_debug", "template_file", "form", "uses_template"),
+        [
+            # Unknown template names fall back to the default template
+            (True, "exists", {"template": "invalid_template_name"}, False),
+            # The overlay is ignored while template debugging is disabled
+            (False, "exists", {"use_template": "on"}, False),
+            (True, "exists", {"use_template": "on", "template": "avery5160"}, True),
+            (True, "missing", {"use_template": "on", "template": "avery5160"}, False),
+            (True, None, {"use_template": "on", "template": "nonexistent_template"}, False),
+        ],
+        ids=[
+            "invalid-template",
+            "debug-disabled",
+            "template-exists",
+            "template-not-found",
+            "no-template-mapping",
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_generate_pdf_template_overlay(
+        self,
+        mock_pdf_gen,
+        generate_pdf_handler,
+        tmp_path,
+        monkeypatch,
+        enable_debug,
+        template_file,
+        form,
+        uses_template,
+    ):
+        """Test when the template PDF overlay is passed to the PDF generator."""
+        template_path = tmp_path / "avery-5160.pdf"
+        if template_file == "exists":
+            template_path.write_bytes(b"%PDF-1.4\nfake template\n%%EOF")
+        template_files = {"avery5160": str(template_path)} if template_file else {}
+        monkeypatch.setattr("src.api.routes.ENABLE_TEMPLATE_DEBUG", enable_debug)
+        monkeypatch.setattr("src.api.routes.TEMPLATE_PDF_FILES", template_files)
+
+        response = await generate_pdf_handler(
+            card_type_ids=["White:Creature"], view_mode="types", **form
         )
+        await response.background()  # Delete the rendered temp file
 
-        # Should still succeed, using default template
+        # Generation always succeeds; only the overlay depends on the scenario
         assert response.status_code == 200
+        expected = str(template_path) if uses_template else None
+        assert mock_pdf_gen.call_args[1]["template_path"] == expected
 
-    @patch("src.api.routes.PDFGenerator")
-    def test_generate_pdf_template_debug_disabled(self, mock_pdf_gen, client):
-        """Test PDF generation when template debug is disabled."""
-        mock_generator_instance = Mock()
-        mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-        mock_generator_instance.generate.return_value = mock_buffer
-        mock_pdf_gen.return_value = mock_generator_instance
+    @patch("src.api.routes.PDF_WORKER_PROCESSES", 1)
+    def test_generate_pdf_renders_in_worker_process(self):
+        """Test that PDFs are rendered in the lifespan-managed process pool."""
+        with TestClient(create_app()) as pool_client:
+            assert pool_client.app.state.pdf_pool is not None
 
-        with patch("src.api.routes.ENABLE_TEMPLATE_DEBUG", False):
-            response = client.post(
+            response = pool_client.post(
                 "/generate-pdf",
-                data={
-                    "card_type_ids": ["White:Creature"],
-                    "view_mode": "types",
-                    "use_template": "on",
-                },
+                data={"card_type_ids": ["White:Creature"], "view_mode": "types"},
             )
 
-        # Should still succeed, but template should be ignored
         assert response.status_code == 200
-
-    @patch("src.api.routes.PDFGenerator")
-    @patch("src.api.routes.ENABLE_TEMPLATE_DEBUG", True)
-    def test_generate_pdf_template_exists(self, mock_pdf_gen, client, tmp_path):
-        """Test PDF generation when template file exists."""
-
-        # Create a real template file
-        template_file = tmp_path / "avery-5160.pdf"
-        template_file.write_bytes(b"%PDF-1.4\nfake template\n%%EOF")
-
-        # Patch TEMPLATE_PDF_FILES to point to our test file
-        with patch("src.api.routes.TEMPLATE_PDF_FILES", {"avery5160": str(template_file)}):
-            mock_generator_instance = Mock()
-            mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-            mock_generator_instance.generate.return_value = mock_buffer
-            mock_pdf_gen.return_value = mock_generator_instance
-
-            response = client.post(
-                "/generate-pdf",
-                data={
-                    "card_type_ids": ["White:Creature"],
-                    "view_mode": "types",
-                    "use_template": "on",
-                    "template": "avery5160",
-                },
-            )
-
-            # Should succeed with template
-            assert response.status_code == 200
-            # Verify PDFGenerator was called with template_path
-            call_args = mock_pdf_gen.call_args
-            assert call_args[1]["template_path"] == str(template_file)
-
-    @patch("src.api.routes.PDFGenerator")
-    @patch("src.api.routes.ENABLE_TEMPLATE_DEBUG", True)
-    def test_generate_pdf_template_not_found(self, mock_pdf_gen, client):
-        """Test PDF generation when template file doesn't exist."""
-        # Patch TEMPLATE_PDF_FILES to point to nonexistent file
-        with patch("src.api.routes.TEMPLATE_PDF_FILES", {"avery5160": "/nonexistent/template.pdf"}):
-            mock_generator_instance = Mock()
-            mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-            mock_generator_instance.generate.return_value = mock_buffer
-            mock_pdf_gen.return_value = mock_generator_instance
-
-            response = client.post(
-                "/generate-pdf",
-                data={
-                    "card_type_ids": ["White:Creature"],
-                    "view_mode": "types",
-                    "use_template": "on",
-                    "template": "avery5160",
-                },
-            )
-
-            # Should still succeed without template
-            assert response.status_code == 200
-            # Verify PDFGenerator was called without template_path (None)
-            call_args = mock_pdf_gen.call_args
-            assert call_args[1]["template_path"] is None
-
-    @patch("src.api.routes.PDFGenerator")
-    @patch("src.api.routes.ENABLE_TEMPLATE_DEBUG", True)
-    def test_generate_pdf_no_template_mapping(self, mock_pdf_gen, client):
-        """Test PDF generation when no template mapping exists."""
-        # Patch TEMPLATE_PDF_FILES to not have the nonexistent template
-        with patch("src.api.routes.TEMPLATE_PDF_FILES", {}):
-            mock_generator_instance = Mock()
-            mock_buffer = BytesIO(b"%PDF-1.4 fake pdf content")
-            mock_generator_instance.generate.return_value = mock_buffer
-            mock_pdf_gen.return_value = mock_generator_instance
-
-            response = client.post(
-                "/generate-pdf",
-                data={
-                    "card_type_ids": ["White:Creature"],
-                    "view_mode": "types",
-                    "use_template": "on",
-                    "template": "nonexistent_template",
-                },
-            )
-
-            # Should still succeed, but without template_path (None)
-            assert response.status_code == 200
-            # Verify PDFGenerator was called without template_path (None)
-            call_args = mock_pdf_gen.call_args
-            assert call_args[1]["template_path"] is None
+        assert response.content.startswith(b"%PDF")
+        # Pool is shut down when the app stops
+        assert pool_client.app.state.pdf_pool is None
@@ -7,28 +7,39 @@ These tests verify performance requirements:
 - Concurrent request handling (10+ requests)
 """
 
+import asyncio
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
+import httpx
 import psutil
 import pytest
-from fastapi.testclient import TestClient
 
-from src.api.routes import create_app
 from src.services.pdf_generator import PDFGenerator
 
+# Under pytest-xdist (`-n auto --dist loadgroup`) keep the timing, CPU and memory
+# measurements on a single worker so parallel tests do not skew them
+pytestmark = [pytest.mark.performance, pytest.mark.xdist_group("perf_serial")]
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(create_app())
 
+def _unique_memory_mb(process: psutil.Process) -> float:
+    """Memory owned only by the process (USS) in MB, falling back to RSS where unavailable.
 
-@pytest.fixture
+    Unlike RSS, USS leaves out shared library pages, so deltas reflect the test's
+    own allocations.
+    """
+    try:
+        return process.memory_full_info().uss / 1024 / 1024
+    except (AttributeError, psutil.AccessDenied):
+        return process.memory_info().rss / 1024 / 1024
+
+
+@pytest.fixture(scope="session")
 def sample_sets_30():
-    """Generate 30 sample sets for performance testing."""
+    """Generate 30 sample sets for performance testing (built once; read-only)."""
     return [
         {
             "id": f"test-set-{i}",
@@ -43,7 +54,13 @@ def sample_sets_30():
     ]
 
 
-@pytest.mark.performance
+@pytest.fixture
+def no_symbol_files(monkeypatch):
+    """Resolve every set symbol to "no file" so only label rendering is measured."""
+    monkeypatch.setattr("src.services.pdf_generator.get_symbol_file", lambda *args, **kwargs: None)
+
+
+@pytest.mark.usefixtures("no_symbol_files")
 class TestPDFGenerationPerformance:
     """Performance tests for PDF generation."""
 
@@ -52,36 +69,46 @@ class TestPDFGenerationPerformance:
         generator = PDFGenerator(sample_sets_30)
 
         start_time = time.time()
-        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-            result = generator.generate()
+        result = generator.generate()
         end_time = time.time()
 
         duration = end_time - start_time
         assert duration < 10.0, f"PDF generation took {duration:.2f}s, expected <10s"
         assert result is not None
-        assert len(result.read()) > 0
+        assert result.getbuffer().nbytes > 0
 
     def test_pdf_generation_memory_stability(self, sample_sets_30):
-        """Test that memory usage remains stable during PDF generation."""
-        import tracemalloc
+        """Test that memory usage remains stable during PDF generation.
 
+        Set TRACE_MEM=1 to also check allocation growth with tracemalloc; tracing
+        roughly doubles allocation cost, so it is off by default.
+        """
+        trace_memory = bool(os.getenv("TRACE_MEM"))
         process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+        initial_memory = _unique_memory_mb(process)
 
-        tracemalloc.start()
-        initial_traced = tracemalloc.take_snapshot()
+        if trace_memory:
+            tracemalloc.start()
+            initial_traced = tracemalloc.take_snapshot()
 
         # Generate multiple PDFs to check for memory leaks
         for _ in range(5):
             generator = PDFGenerator(sample_sets_30)
-            with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-                result = generator.generate()
-                result.read()  # Consume the buffer
-                del generator
-                del result
-
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        final_traced = tracemalloc.take_snapshot()
+            result = generator.generate()
+            del generator
+            del result
+
+        final_memory = _unique_memory_mb(process)
+
+        if trace_memory:
+            try:
+                top_growth = tracemalloc.take_snapshot().compare_to(initial_traced, "filename")
+            finally:
+                tracemalloc.stop()
+            traced_increase = sum(stat.size_diff for stat in top_growth[:10]) / 1024 / 1024
+            assert traced_increase < 50, (
+                f"Traced allocations grew by {traced_increase:.2f}MB, expected <50MB"
+            )
 
         memory_increase = final_memory - initial_memory
         # Memory increase should be reasonable (<100MB for 5 PDFs)
@@ -89,43 +116,30 @@ class TestPDFGenerationPerformance:
             f"Memory increased by {memory_increase:.2f}MB, expected <100MB"
         )
 
-        # Check for memory leaks using tracemalloc
-        final_traced.compare_to(initial_traced, "lineno")
-        tracemalloc.stop()
-
     def test_pdf_generation_cpu_usage(self, sample_sets_30):
-        """Test that CPU usage stays below 80% during PDF generation."""
+        """Test that PDF generation uses under 80% of its 10 second budget in CPU time."""
         process = psutil.Process(os.getpid())
+        generator = PDFGenerator(sample_sets_30)
 
-        # Measure CPU usage during PDF generation
-        process.cpu_percent(interval=None)  # Initialize
-        time.sleep(0.1)  # Small delay for measurement
+        # CPU-time deltas need no sampling interval, unlike cpu_percent(interval=...)
+        before = process.cpu_times()
+        generator.generate()
+        after = process.cpu_times()
 
-        generator = PDFGenerator(sample_sets_30)
-        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-            cpu_percent = process.cpu_percent(interval=1.0)
-            generator.generate()
-
-        # CPU usage should be below 80%
-        # Note: This test may be flaky in CI environments, so we use a higher
-        # threshold
-        assert cpu_percent < 90, (
-            f"CPU usage was {cpu_percent}%, expected <90% (allowing margin for CI)"
-        )
+        cpu_seconds = (after.user - before.user) + (after.system - before.system)
+        assert cpu_seconds < 8.0, f"PDF generation used {cpu_seconds:.2f}s of CPU, expected <8s"
 
     def test_concurrent_pdf_generation(self, sample_sets_30):
         """Test handling of concurrent PDF generation requests."""
 
-        def generate_pdf():
+        def generate_pdf(_: int) -> int:
             generator = PDFGenerator(sample_sets_30)
-            with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-                result = generator.generate()
-                return len(result.read())
+            result = generator.generate()
+            return result.getbuffer().nbytes
 
         # Generate 10 PDFs concurrently
         with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(generate_pdf) for _ in range(10)]
-            results = [future.result(timeout=30) for future in as_completed(futures)]
+            results = list(executor.map(generate_pdf, range(10), timeout=30))
 
         # All PDFs should be generated successfully
         assert len(results) == 10
@@ -138,44 +152,40 @@ class TestPDFGenerationPerformance:
             assert variance < 0.1, f"PDF size variance too high: {variance:.2%}"
 
 
-@pytest.mark.performance
 class TestConcurrentRequestHandling:
     """Tests for concurrent request handling."""
 
+    @pytest.mark.asyncio
     @patch("src.api.routes.scryfall_client.fetch_sets")
-    def test_concurrent_api_requests(self, mock_fetch, client, sample_sets_30):
+    async def test_concurrent_api_requests(self, mock_fetch, client, sample_sets_30):
         """Test that API handles 10+ concurrent requests."""
         mock_fetch.return_value = sample_sets_30
 
-        def make_request():
-            response = client.get("/api/sets")
-            return response.status_code == 200
-
-        # Make 15 concurrent requests
-        with ThreadPoolExecutor(max_workers=15) as executor:
-            futures = [executor.submit(make_request) for _ in range(15)]
-            results = [future.result(timeout=10) for future in as_completed(futures)]
+        # Make 15 concurrent requests on one event loop
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=client.app), base_url="http://test"
+        ) as async_client:
+            responses = await asyncio.gather(*(async_client.get("/api/sets") for _ in range(15)))
 
         # All requests should succeed
-        assert len(results) == 15
-        assert all(results), "Some concurrent requests failed"
+        assert len(responses) == 15
+        assert all(r.status_code == 200 for r in responses), "Some concurrent requests failed"
 
+    @pytest.mark.asyncio
     @patch("src.api.routes.scryfall_client.fetch_sets")
-    def test_concurrent_pdf_endpoint_requests(self, mock_fetch, client, sample_sets_30):
+    async def test_concurrent_pdf_endpoint_requests(self, mock_fetch, client, sample_sets_30):
         """Test concurrent requests to PDF generation endpoint."""
         mock_fetch.return_value = sample_sets_30
-
-        def generate_pdf_request():
-            response = client.post(
-                "/generate-pdf", data={"set_ids": [f"test-set-{i}" for i in range(10)]}
-            )
-            return response.status_code == 200
+        data = {"set_ids": [f"test-set-{i}" for i in range(10)]}
 
         # Make 10 concurrent PDF generation requests
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(generate_pdf_request) for _ in range(10)]
-            results = [future.result(timeout=60) for future in as_completed(futures)]
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=client.app), base_url="http://test", timeout=60
+        ) as async_client:
+            responses = await asyncio.gather(
+                *(async_client.post("/generate-pdf", data=data) for _ in range(10))
+            )
 
         # All requests should succeed (or at least most)
-        success_count = sum(results)
+        success_count = sum(r.status_code == 200 for r in responses)
         assert success_count >= 8, f"Only {success_count}/10 concurrent requests succeeded"
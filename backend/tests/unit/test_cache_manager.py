@@ -1,18 +1,62 @@
 """Unit tests for CacheManager."""
 
+import threading
 import time
-from datetime import datetime, timedelta
-from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
 
 from src.cache.cache_manager import CachedSetData, CacheManager
 
 
+class _FakeClock:
+    """Stand-in for the ``time`` module whose monotonic clock only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch) -> _FakeClock:
+    """Drive CacheManager expiry from a fake clock instead of real sleeps."""
+    clock = _FakeClock()
+    monkeypatch.setattr("src.cache.cache_manager.time", clock)
+    return clock
+
+
+@pytest.fixture(scope="module")
+def shared_cache_dir(tmp_path_factory) -> Path:
+    """Symbol cache directory created once for the module."""
+    return tmp_path_factory.mktemp("symbol_cache")
+
+
+@pytest.fixture
+def cache_dir(shared_cache_dir) -> Path:
+    """Symbol cache directory for the test's CacheManager, emptied before each test."""
+    for path in shared_cache_dir.iterdir():
+        path.unlink()
+    return shared_cache_dir
+
+
+@pytest.fixture
+def cache_manager(cache_dir) -> CacheManager:
+    """Fresh CacheManager with a 60 second TTL and a private symbol cache directory."""
+    return CacheManager(ttl=60, symbol_cache_dir=cache_dir)
+
+
 class TestCacheManagerInMemoryCache:
     """Tests for CacheManager in-memory cache functionality."""
 
-    def test_cache_set_and_get(self):
+    def test_cache_set_and_get(self, cache_manager):
         """Test that data can be set and retrieved from cache."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("test_key", {"data": "test_value"})
         result = cache_manager.get("test_key")
         assert result == {"data": "test_value"}
@@ -23,12 +67,12 @@ class TestCacheManagerInMemoryCache:
         result = cache_manager.get("nonexistent_key")
         assert result is None
 
-    def test_cache_ttl_expiration(self):
+    def test_cache_ttl_expiration(self, fake_clock):
         """Test that cache entries expire after TTL."""
         cache_manager = CacheManager(ttl=1)  # 1 second TTL
         cache_manager.set("test_key", {"data": "test_value"})
         assert cache_manager.get("test_key") == {"data": "test_value"}
-        time.sleep(2)
+        fake_clock.advance(2)
         assert cache_manager.get("test_key") is None
 
     def test_cache_max_size_limit(self):
@@ -41,15 +85,22 @@ class TestCacheManagerInMemoryCache:
         assert cache_manager.get("key2") == "value2"
         assert cache_manager.get("key3") == "value3"
 
+    def test_cache_max_size_evicts_least_recently_used(self):
+        """Test that reading a key protects it from size-based eviction."""
+        cache_manager = CacheManager(max_size=2, ttl=60)
+        cache_manager.set("key1", "value1")
+        cache_manager.set("key2", "value2")
+        cache_manager.get("key1")  # key2 is now least recently used
+        cache_manager.set("key3", "value3")
+        assert cache_manager.get("key1") == "value1"
+        assert cache_manager.get("key2") is None
+
 
 class TestFileBasedSymbolCache:
     """Tests for file-based symbol cache."""
 
-    def test_symbol_cache_get_existing_file(self, tmp_path):
+    def test_symbol_cache_get_existing_file(self, cache_manager, cache_dir):
         """Test retrieving cached symbol file."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
-
         # Create a cached file
         symbol_file = cache_dir / "test-id.svg"
         symbol_file.write_text("<svg></svg>")
@@ -57,30 +108,21 @@ class TestFileBasedSymbolCache:
         result = cache_manager.get_symbol("test-id")
         assert result == str(symbol_file)
 
-    def test_symbol_cache_miss_returns_none(self, tmp_path):
+    def test_symbol_cache_miss_returns_none(self, cache_manager):
         """Test that missing symbol file returns None."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
-
         result = cache_manager.get_symbol("nonexistent-id")
         assert result is None
 
-    def test_symbol_cache_save_file(self, tmp_path):
+    def test_symbol_cache_save_file(self, cache_manager, cache_dir):
         """Test saving symbol to cache."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
-
         cache_manager.save_symbol("test-id", b"<svg></svg>")
 
         symbol_file = cache_dir / "test-id.svg"
         assert symbol_file.exists()
         assert symbol_file.read_bytes() == b"<svg></svg>"
 
-    def test_symbol_cache_validation(self, tmp_path):
+    def test_symbol_cache_validation(self, cache_manager, cache_dir):
         """Test symbol cache file validation."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
-
         # Create invalid file (empty)
         symbol_file = cache_dir / "test-id.svg"
         symbol_file.write_bytes(b"")
@@ -88,11 +130,8 @@ class TestFileBasedSymbolCache:
         result = cache_manager.get_symbol("test-id")
         assert result is None  # Should return None for invalid file
 
-    def test_symbol_cache_validation_invalid_content(self, tmp_path):
+    def test_symbol_cache_validation_invalid_content(self, cache_manager, cache_dir):
         """Test symbol cache validation with invalid SVG content."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
-
         # Create file with invalid content (not SVG)
         symbol_file = cache_dir / "test-id.svg"
         symbol_file.write_bytes(b"not an svg file")
@@ -102,34 +141,80 @@ class TestFileBasedSymbolCache:
         # File should be deleted
         assert not symbol_file.exists()
 
-    def test_symbol_cache_save_exception_handling(self, tmp_path, monkeypatch):
+    def test_symbol_cache_save_exception_handling(self, cache_manager, cache_dir, monkeypatch):
         """Test exception handling in save_symbol."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
+        # Fail opening the partial download only; every other path opens normally
+        real_open = Path.open
 
-        # Mock write_bytes to raise an exception
-        def mock_write_bytes(self, data):
-            raise OSError("Permission denied")
+        def mock_open(self, *args, **kwargs):
+            if self.suffix == ".part":
+                raise OSError("Permission denied")
+            return real_open(self, *args, **kwargs)
 
-        monkeypatch.setattr("pathlib.Path.write_bytes", mock_write_bytes)
+        monkeypatch.setattr(Path, "open", mock_open)
 
         result = cache_manager.save_symbol("test-id", b"<svg></svg>")
         assert result is None  # Should return None on error
 
-    def test_symbol_cache_invalidate_exception_handling(self, tmp_path, monkeypatch):
-        """Test exception handling in invalidate_symbol."""
-        cache_dir = tmp_path / "cache"
-        cache_manager = CacheManager(symbol_cache_dir=cache_dir)
+    def test_symbol_cache_save_streamed_chunks(self, cache_manager, cache_dir):
+        """Test saving symbol content streamed as chunks."""
+        result = cache_manager.save_symbol("test-id", iter([b"<svg>", b"", b"</svg>"]))
+
+        symbol_file = cache_dir / "test-id.svg"
+        assert result == str(symbol_file)
+        assert symbol_file.read_bytes() == b"<svg></svg>"
+        assert list(cache_dir.glob("*.part")) == []
+
+    def test_symbol_cache_save_concurrent_writers(self, cache_manager, cache_dir):
+        """Test that writers saving the same set at once do not share a partial file."""
+        writers = 4
+        barrier = threading.Barrier(writers)
+
+        def chunks(n):
+            # Every writer has opened its partial file before any chunk is written
+            barrier.wait()
+            yield b"<svg>"
+            barrier.wait()
+            yield f"<g id='{n}'/>".encode() * 100
+            barrier.wait()
+            yield b"</svg>"
+
+        with ThreadPoolExecutor(max_workers=writers) as executor:
+            results = list(
+                executor.map(lambda n: cache_manager.save_symbol("test-id", chunks(n)), range(4))
+            )
 
+        symbol_file = cache_dir / "test-id.svg"
+        assert results == [str(symbol_file)] * writers
+        expected = {b"<svg>" + f"<g id='{n}'/>".encode() * 100 + b"</svg>" for n in range(writers)}
+        assert symbol_file.read_bytes() in expected
+        assert list(cache_dir.glob("*.part")) == []
+
+    def test_symbol_cache_save_rejects_non_svg_stream(self, cache_manager, cache_dir):
+        """Test that a stream not starting with SVG content is not cached."""
+        result = cache_manager.save_symbol("test-id", iter([b"<html>error</html>"]))
+
+        assert result is None
+        assert not (cache_dir / "test-id.svg").exists()
+        assert list(cache_dir.glob("*.part")) == []
+
+    def test_symbol_cache_invalidate_exception_handling(
+        self, cache_manager, cache_dir, monkeypatch
+    ):
+        """Test exception handling in invalidate_symbol."""
         # Create a file
         symbol_file = cache_dir / "test-id.svg"
         symbol_file.write_bytes(b"<svg></svg>")
 
-        # Mock unlink to raise an exception
-        def mock_unlink(self):
-            raise OSError("Permission denied")
+        # Fail unlinking the symbol file only; every other path unlinks normally
+        real_unlink = Path.unlink
+
+        def mock_unlink(self, *args, **kwargs):
+            if self == symbol_file:
+                raise OSError("Permission denied")
+            return real_unlink(self, *args, **kwargs)
 
-        monkeypatch.setattr("pathlib.Path.unlink", mock_unlink)
+        monkeypatch.setattr(Path, "unlink", mock_unlink)
 
         # Should not raise, just log error
         cache_manager.invalidate_symbol("test-id")
@@ -140,9 +225,8 @@ class TestFileBasedSymbolCache:
 class TestCacheExpirationAndInvalidation:
     """Tests for cache expiration and invalidation."""
 
-    def test_cache_invalidate_key(self):
+    def test_cache_invalidate_key(self, cache_manager):
         """Test invalidating a specific cache key."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key1", "value1")
         cache_manager.set("key2", "value2")
 
@@ -150,9 +234,8 @@ class TestCacheExpirationAndInvalidation:
         assert cache_manager.get("key1") is None
         assert cache_manager.get("key2") == "value2"
 
-    def test_cache_clear_all(self):
+    def test_cache_clear_all(self, cache_manager):
         """Test clearing all cache entries."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key1", "value1")
         cache_manager.set("key2", "value2")
 
@@ -160,9 +243,8 @@ class TestCacheExpirationAndInvalidation:
         assert cache_manager.get("key1") is None
         assert cache_manager.get("key2") is None
 
-    def test_cache_invalidate_on_error(self):
+    def test_cache_invalidate_on_error(self, cache_manager):
         """Test that cache is invalidated on error."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("sets", [{"id": "test"}])
 
         # Simulate error
@@ -173,10 +255,8 @@ class TestCacheExpirationAndInvalidation:
 class TestCacheHitRate:
     """Tests for cache hit rate monitoring."""
 
-    def test_cache_hit_rate_calculation(self):
+    def test_cache_hit_rate_calculation(self, cache_manager):
         """Test cache hit rate calculation."""
-        cache_manager = CacheManager(ttl=60)
-
         # Make requests
         cache_manager.get("key1")  # Miss
         cache_manager.set("key1", "value1")
@@ -188,9 +268,8 @@ class TestCacheHitRate:
         hit_rate = cache_manager.get_hit_rate()
         assert hit_rate == 0.5
 
-    def test_cache_stats(self):
+    def test_cache_stats(self, cache_manager):
         """Test cache statistics."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key1", "value1")
         cache_manager.get("key1")  # Hit
         cache_manager.get("key2")  # Miss
@@ -205,28 +284,26 @@ class TestCacheHitRate:
 class TestCacheValidationAndRefresh:
     """Tests for cache validation and refresh."""
 
-    def test_cache_is_valid(self):
+    def test_cache_is_valid(self, fake_clock):
         """Test checking if cache entry is valid."""
         cache_manager = CacheManager(ttl=1)
         cache_manager.set("key", "value")
         assert cache_manager.is_valid("key") is True
 
         # After expiration
-        time.sleep(2)
+        fake_clock.advance(2)
         assert cache_manager.is_valid("key") is False
 
-    def test_cache_refresh(self):
+    def test_cache_refresh(self, cache_manager):
         """Test refreshing cache entry."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key", "value1")
 
         # Refresh with new value
         cache_manager.refresh("key", "value2")
         assert cache_manager.get("key") == "value2"
 
-    def test_cache_get_or_fetch(self):
+    def test_cache_get_or_fetch(self, cache_manager):
         """Test get_or_fetch pattern."""
-        cache_manager = CacheManager(ttl=60)
 
         def fetch_func():
             return {"data": "fetched"}
@@ -250,10 +327,11 @@ class TestCacheValidationAndRefresh:
     def test_cached_set_data_is_expired_none_expires_at(self):
         """Test CachedSetData.is_expired() when expires_at is None (line 37)."""
         # Create CachedSetData and manually set expires_at to None
+        now = time.monotonic()
         cached_data = CachedSetData(
             sets=[{"id": "test"}],
-            cached_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(days=1),
+            cached_at=now,
+            expires_at=now + 86400,
         )
         # Manually set expires_at to None to test the None check
         cached_data.expires_at = None
@@ -262,48 +340,44 @@ class TestCacheValidationAndRefresh:
 
     def test_cached_set_data_is_stale(self):
         """Test CachedSetData.is_stale() method (lines 42-43)."""
+        now = time.monotonic()
         cached_data = CachedSetData(
             sets=[{"id": "test"}],
-            cached_at=datetime.now() - timedelta(seconds=100),
-            expires_at=datetime.now() + timedelta(seconds=100),
+            cached_at=now - 100,
+            expires_at=now + 100,
         )
         # Should be stale if older than max_age
         assert cached_data.is_stale(max_age_seconds=50) is True
         assert cached_data.is_stale(max_age_seconds=200) is False
 
-    def test_cache_get_exception_handling(self):
+    def test_cache_get_exception_handling(self, cache_manager):
         """Test exception handling in cache.get() (lines 108-111)."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key", "value")
 
         # Mock _memory_cache.get to raise exception
-        with patch.object(
-            cache_manager._memory_cache, "get", side_effect=Exception("Unexpected error")
-        ):
+        broken_cache = Mock()
+        broken_cache.get.side_effect = Exception("Unexpected error")
+        with patch.object(cache_manager, "_memory_cache", broken_cache):
             result = cache_manager.get("key")
             assert result is None
 
-    def test_cache_set_exception_handling(self):
+    def test_cache_set_exception_handling(self, cache_manager):
         """Test exception handling in cache.set() (lines 124-126)."""
-        cache_manager = CacheManager(ttl=60)
-
         # Mock _memory_cache operations to raise exception
-        with patch.object(
-            cache_manager._memory_cache, "__setitem__", side_effect=Exception("Unexpected error")
-        ):
+        broken_cache = MagicMock()
+        broken_cache.__setitem__.side_effect = Exception("Unexpected error")
+        with patch.object(cache_manager, "_memory_cache", broken_cache):
             # Should not raise, just log error
             cache_manager.set("key", "value")
 
-    def test_cache_get_hit_rate_zero_total(self):
+    def test_cache_get_hit_rate_zero_total(self, cache_manager):
         """Test get_hit_rate() when total is 0 (line 293)."""
-        cache_manager = CacheManager(ttl=60)
         # No requests made yet
         hit_rate = cache_manager.get_hit_rate()
         assert hit_rate == 0.0
 
-    def test_cache_reset_stats(self):
+    def test_cache_reset_stats(self, cache_manager):
         """Test reset_stats() method (lines 316-319)."""
-        cache_manager = CacheManager(ttl=60)
         cache_manager.set("key1", "value1")
         cache_manager.get("key1")  # Hit
         cache_manager.get("key2")  # Miss
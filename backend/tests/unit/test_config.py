@@ -0,0 +1,28 @@
+"""Unit tests for configuration parsing."""
+
+import pytest
+
+from src.config import _parse_pdf_gc_mode
+
+
+class TestPdfGcMode:
+    """Tests for the MTG_PDF_GC_MODE setting."""
+
+    @pytest.mark.parametrize(
+        ("worker_processes", "expected"),
+        [(1, "off"), (0, "auto")],
+        ids=["worker_processes", "in_process"],
+    )
+    def test_default_depends_on_worker_processes(self, worker_processes, expected):
+        """Test that GC is only paused by default when renders run in dedicated workers."""
+        assert _parse_pdf_gc_mode(None, worker_processes) == expected
+
+    @pytest.mark.parametrize("value", ["off", "AUTO", " manual "])
+    def test_valid_modes_normalized(self, value):
+        """Test that valid modes are accepted case- and whitespace-insensitively."""
+        assert _parse_pdf_gc_mode(value, 1) == value.strip().lower()
+
+    def test_invalid_mode_rejected(self):
+        """Test that a typo is rejected instead of silently pausing GC."""
+        with pytest.raises(ValueError, match="Invalid MTG_PDF_GC_MODE 'atuo'"):
+            _parse_pdf_gc_mode("atuo", 0)
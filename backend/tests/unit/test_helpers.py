@@ -1,86 +1,120 @@
 """Unit tests for helper functions."""
 
+import asyncio
+import datetime
 from io import BytesIO
 from unittest.mock import Mock, patch
 
+import pytest
 import requests
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 
 from src.config import ABBREVIATION_MAP, MAX_SET_NAME_LENGTH
 from src.services.helpers import (
     abbreviate_set_name,
     fit_text_to_width,
+    format_release_date,
+    get_download_session,
     get_svg_intrinsic_dimensions,
     get_symbol_file,
+    prefetch_symbol_files,
 )
 
 
 class TestAbbreviateSetName:
     """Tests for abbreviate_set_name() function."""
 
-    def test_abbreviate_set_name_in_map(self):
-        """Test that names in abbreviation map are abbreviated."""
-        test_name = "Adventures in the Forgotten Realms"
-        result = abbreviate_set_name(test_name)
-        assert result == ABBREVIATION_MAP[test_name]
-
-    def test_abbreviate_set_name_too_long(self):
-        """Test that names longer than max length are truncated."""
-        long_name = "A" * (MAX_SET_NAME_LENGTH + 10)
-        result = abbreviate_set_name(long_name)
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            (
+                "Adventures in the Forgotten Realms",
+                ABBREVIATION_MAP["Adventures in the Forgotten Realms"],
+            ),
+            ("A" * (MAX_SET_NAME_LENGTH + 10), "A" * (MAX_SET_NAME_LENGTH - 3) + "..."),
+            ("Test Set Name", "Test Set Name"),
+            ("A" * MAX_SET_NAME_LENGTH, "A" * MAX_SET_NAME_LENGTH),
+        ],
+        ids=["in_map", "too_long", "normal", "exact_max_length"],
+    )
+    def test_abbreviate_set_name(self, name, expected):
+        """Test that names are abbreviated, truncated, or returned unchanged."""
+        result = abbreviate_set_name(name)
+        assert result == expected
         assert len(result) <= MAX_SET_NAME_LENGTH
-        assert result.endswith("...")
 
-    def test_abbreviate_set_name_normal(self):
-        """Test that normal length names are returned unchanged."""
-        normal_name = "Test Set Name"
-        result = abbreviate_set_name(normal_name)
-        assert result == normal_name
 
-    def test_abbreviate_set_name_exact_max_length(self):
-        """Test that names exactly at max length are returned unchanged."""
-        exact_name = "A" * MAX_SET_NAME_LENGTH
-        result = abbreviate_set_name(exact_name)
-        assert result == exact_name
+@pytest.fixture(scope="module")
+def pdf_canvas():
+    """Canvas shared by the fit_text_to_width tests (only used for measuring)."""
+    return canvas.Canvas(BytesIO())
 
 
 class TestFitTextToWidth:
     """Tests for fit_text_to_width() function."""
 
-    def test_fit_text_to_width_fits(self):
-        """Test that text that fits is returned unchanged."""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer)
-        text = "Short Text"
-        result = fit_text_to_width(text, "Helvetica", 12, 200, c)
-        assert result == text
-
-    def test_fit_text_to_width_truncates(self):
-        """Test that text that doesn't fit is truncated."""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer)
-        text = "Very Long Text That Will Not Fit"
-        result = fit_text_to_width(text, "Helvetica", 12, 50, c)
-        assert result != text
-        assert result.endswith("...")
-        assert len(result) < len(text)
-
-    def test_fit_text_to_width_empty_string(self):
-        """Test handling of empty string."""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer)
-        result = fit_text_to_width("", "Helvetica", 12, 50, c)
-        assert result == ""
-
-    def test_fit_text_to_width_very_small_width(self):
-        """Test handling of very small max width."""
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer)
-        text = "Test"
-        result = fit_text_to_width(text, "Helvetica", 12, 1, c)
-        assert result.endswith("...")
+    @pytest.mark.parametrize(
+        ("text", "max_width", "truncated"),
+        [
+            ("Short Text", 200, False),
+            ("Very Long Text That Will Not Fit", 50, True),
+            ("", 50, False),
+            ("Test", 1, True),
+        ],
+        ids=["fits", "truncates", "empty_string", "very_small_width"],
+    )
+    def test_fit_text_to_width(self, pdf_canvas, text, max_width, truncated):
+        """Test that text is truncated with an ellipsis only when it doesn't fit."""
+        result = fit_text_to_width(text, "Helvetica", 12, max_width, pdf_canvas)
+        if truncated:
+            assert result.endswith("...")
+            assert len(result) < len(text)
+        else:
+            assert result == text
+
+    def test_fit_text_to_width_memoizes_measurement(self, pdf_canvas):
+        """Test that repeated text is measured only once."""
+        text = "Memoized Label Text That Will Not Fit"
+
+        with patch(
+            "src.services.helpers.pdfmetrics.stringWidth", wraps=pdfmetrics.stringWidth
+        ) as mock_width:
+            first = fit_text_to_width(text, "Helvetica", 12, 57.5, pdf_canvas)
+            calls_after_first = mock_width.call_count
+            second = fit_text_to_width(text, "Helvetica", 12, 57.5, canvas.Canvas(BytesIO()))
+
+        assert second == first
+        assert calls_after_first > 0
+        assert mock_width.call_count == calls_after_first
+
+
+class TestFormatReleaseDate:
+    """Tests for format_release_date() function."""
 
+    def test_format_release_date(self):
+        """Test that ISO release dates are formatted as month and year."""
+        assert format_release_date("2023-02-03") == "February 2023"
 
+    def test_format_release_date_invalid(self):
+        """Test that unparseable dates are returned unchanged."""
+        assert format_release_date("invalid-date") == "invalid-date"
+
+    def test_format_release_date_impossible_date(self):
+        """Test that well-formed but impossible dates are returned unchanged."""
+        assert format_release_date("2023-13-01") == "2023-13-01"
+        assert format_release_date("2023-02-30") == "2023-02-30"
+        assert format_release_date("2023-1-01") == "2023-1-01"
+
+    def test_format_release_date_every_month(self):
+        """Test that every month name matches the strftime rendering."""
+        for month in range(1, 13):
+            date_str = f"2020-{month:02d}-15"
+            expected = datetime.date(2020, month, 15).strftime("%B %Y")
+            assert format_release_date(date_str) == expected
+
+
+@pytest.mark.usefixtures("no_sleep")
 class TestGetSymbolFile:
     """Tests for get_symbol_file() function."""
 
@@ -90,7 +124,7 @@ class TestGetSymbolFile:
         result = get_symbol_file(set_data)
         assert result is None
 
-    def test_get_symbol_file_cached(self, tmp_path, monkeypatch):
+    def test_get_symbol_file_cached(self, tmp_path, cache_stub):
         """Test that cached file is returned if it exists."""
         # Create temp directory structure
         images_dir = tmp_path / "static" / "images"
@@ -100,10 +134,8 @@ class TestGetSymbolFile:
         cached_file = images_dir / "test-set-id.svg"
         cached_file.write_text("<svg></svg>")
 
-        # Mock cache manager to return cached file
-        mock_cache_manager = Mock()
-        mock_cache_manager.get_symbol.return_value = str(cached_file)
-        monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: mock_cache_manager)
+        # Cache manager returns the cached file
+        cache_stub.cached_path = str(cached_file)
 
         set_data = {
             "id": "test-set-id",
@@ -113,25 +145,21 @@ class TestGetSymbolFile:
         result = get_symbol_file(set_data)
         assert result is not None
         assert "test-set-id.svg" in result
-        mock_cache_manager.get_symbol.assert_called_once_with("test-set-id")
+        assert cache_stub.lookups == ["test-set-id"]
 
-    def test_get_symbol_file_downloads(self, tmp_path, monkeypatch):
+    def test_get_symbol_file_downloads(self, tmp_path, cache_stub):
         """Test that symbol is downloaded if not cached."""
         # Create temp directory structure
         images_dir = tmp_path / "static" / "images"
         images_dir.mkdir(parents=True)
         cached_file = images_dir / "test-set-id.svg"
 
-        # Mock cache manager - no cached file, but save_symbol succeeds
-        mock_cache_manager = Mock()
-        mock_cache_manager.get_symbol.return_value = None  # Not cached
-        mock_cache_manager.save_symbol.return_value = str(cached_file)  # Save succeeds
-
-        monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: mock_cache_manager)
+        # No cached file, but save_symbol succeeds
+        cache_stub.saved_path = str(cached_file)
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.content = b"<svg></svg>"
+        mock_response.iter_content.return_value = iter([b"<svg></svg>"])
 
         set_data = {
             "id": "test-set-id",
@@ -139,61 +167,139 @@ class TestGetSymbolFile:
             "icon_svg_uri": "https://example.com/symbol.svg",
         }
 
-        with patch("src.services.helpers.requests.get", return_value=mock_response):
+        with patch.object(get_download_session(), "get", return_value=mock_response) as mock_get:
             result = get_symbol_file(set_data)
             # Should attempt to download
             assert result is not None
             assert result == str(cached_file)
-            mock_cache_manager.get_symbol.assert_called_once_with("test-set-id")
-            mock_cache_manager.save_symbol.assert_called_once_with("test-set-id", b"<svg></svg>")
+            assert cache_stub.lookups == ["test-set-id"]
+            assert cache_stub.saves == [("test-set-id", mock_response.iter_content.return_value)]
+            # Download is streamed and the connection released afterwards
+            assert mock_get.call_args.kwargs["stream"] is True
+            mock_response.close.assert_called_once()
 
-    def test_get_symbol_file_download_error(self, tmp_path, monkeypatch):
+    def test_get_symbol_file_download_error(self, cache_stub):
         """Test handling of download errors."""
-        # Mock cache manager - no cached file
-        mock_cache_manager = Mock()
-        mock_cache_manager.get_symbol.return_value = None  # Not cached
-
-        monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: mock_cache_manager)
-
         set_data = {
             "id": "test-set-id",
             "name": "Test Set",
             "icon_svg_uri": "https://example.com/symbol.svg",
         }
 
-        with patch(
-            "src.services.helpers.requests.get",
+        with patch.object(
+            get_download_session(),
+            "get",
             side_effect=requests.RequestException("Network error"),
         ):
             result = get_symbol_file(set_data)
             assert result is None
-            mock_cache_manager.get_symbol.assert_called_once_with("test-set-id")
+            assert cache_stub.lookups == ["test-set-id"]
             # save_symbol should not be called on error
-            mock_cache_manager.save_symbol.assert_not_called()
+            assert cache_stub.saves == []
+
+
+class TestGetDownloadSession:
+    """Tests for get_download_session() function."""
+
+    def test_download_session_shared_across_calls(self):
+        """Test that symbol downloads reuse one pooled session."""
+        session = get_download_session()
+
+        assert get_download_session() is session
+        assert session.headers["User-Agent"] == "MTG-Label-Generator/1.0"
+        assert session.get_adapter("https://svgs.scryfall.io")._pool_maxsize >= 2
+
+
+class TestPrefetchSymbolFiles:
+    """Tests for prefetch_symbol_files() function."""
+
+    def test_prefetch_downloads_only_missing_symbols(self, monkeypatch):
+        """Test that only uncached, unique symbols are downloaded."""
+        mock_cache_manager = Mock()
+        mock_cache_manager.get_symbol.side_effect = lambda set_id: (
+            "/cache/cached.svg" if set_id == "cached" else None
+        )
+        monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: mock_cache_manager)
+
+        downloaded: list[str] = []
+
+        def fake_get_symbol_file(set_data):
+            downloaded.append(set_data["id"])
+            return f"/cache/{set_data['id']}.svg"
+
+        monkeypatch.setattr("src.services.helpers.get_symbol_file", fake_get_symbol_file)
+
+        sets_data = [
+            {"__placeholder__": True},
+            {"id": "cached", "icon_svg_uri": "https://example.com/cached.svg"},
+            {"id": "missing", "icon_svg_uri": "https://example.com/missing.svg"},
+            {"id": "missing", "icon_svg_uri": "https://example.com/missing.svg"},
+            {"id": "no-icon"},
+        ]
+        count = asyncio.run(prefetch_symbol_files(sets_data))
+
+        assert count == 1
+        assert downloaded == ["missing"]
+
+    def test_prefetch_ignores_failed_downloads(self, monkeypatch):
+        """Test that failed downloads do not abort the prefetch."""
+        mock_cache_manager = Mock()
+        mock_cache_manager.get_symbol.return_value = None
+        monkeypatch.setattr("src.services.helpers.get_cache_manager", lambda: mock_cache_manager)
+
+        def fake_get_symbol_file(set_data):
+            if set_data["id"] == "broken":
+                raise RuntimeError("boom")
+            return None if set_data["id"] == "unavailable" else "/cache/ok.svg"
+
+        monkeypatch.setattr("src.services.helpers.get_symbol_file", fake_get_symbol_file)
+
+        sets_data = [
+            {"id": set_id, "icon_svg_uri": "https://example.com/symbol.svg"}
+            for set_id in ("ok", "broken", "unavailable")
+        ]
+        assert asyncio.run(prefetch_symbol_files(sets_data)) == 1
+
+
+@pytest.fixture(scope="module")
+def svg_dir(tmp_path_factory):
+    """SVG files for the viewBox tests, written once per module."""
+    directory = tmp_path_factory.mktemp("svgs")
+    (directory / "root_viewbox.svg").write_text(
+        "<!-- symbol --><svg xmlns='http://www.w3.org/2000/svg'\n"
+        "  viewBox='0 0 32 48'><symbol viewBox=\"0 0 1 1\"/></svg>"
+    )
+    (directory / "nested_viewbox.svg").write_text('<svg><symbol viewBox="0 0 1 1"/></svg>')
+    (directory / "nested_svg_viewbox.svg").write_text(
+        '<!-- <svg viewBox="0 0 9 9"> --><svg><svg viewBox="0 0 1 1"/></svg>'
+    )
+    return directory
 
 
 class TestGetSvgIntrinsicDimensions:
     """Tests for get_svg_intrinsic_dimensions() function."""
 
-    def test_get_svg_intrinsic_dimensions_success(self, tmp_path):
+    def test_get_svg_intrinsic_dimensions_success(self):
         """Test successful extraction of dimensions from viewBox."""
         svg_content = (
-            '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" '
-            'viewBox="0 0 100 200"></svg>'
+            b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" '
+            b'viewBox="0 0 100 200"></svg>'
         )
-        svg_file = tmp_path / "test.svg"
-        svg_file.write_text(svg_content)
 
-        result = get_svg_intrinsic_dimensions(str(svg_file))
+        result = get_svg_intrinsic_dimensions(svg_content)
         assert result == (100.0, 200.0)
 
-    def test_get_svg_intrinsic_dimensions_no_viewbox(self, tmp_path):
+    def test_get_svg_intrinsic_dimensions_reads_root_viewbox_only(self, svg_dir):
+        """Test that the root viewBox is used and nested ones are ignored."""
+        assert get_svg_intrinsic_dimensions(str(svg_dir / "root_viewbox.svg")) == (32.0, 48.0)
+        assert get_svg_intrinsic_dimensions(str(svg_dir / "nested_viewbox.svg")) is None
+        assert get_svg_intrinsic_dimensions(str(svg_dir / "nested_svg_viewbox.svg")) is None
+
+    def test_get_svg_intrinsic_dimensions_no_viewbox(self):
         """Test handling of SVG without viewBox."""
-        svg_content = '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"></svg>'
-        svg_file = tmp_path / "test.svg"
-        svg_file.write_text(svg_content)
+        svg_content = b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"></svg>'
 
-        result = get_svg_intrinsic_dimensions(str(svg_file))
+        result = get_svg_intrinsic_dimensions(svg_content)
         assert result is None
 
     def test_get_svg_intrinsic_dimensions_invalid_file(self):
@@ -201,15 +307,13 @@ class TestGetSvgIntrinsicDimensions:
         result = get_svg_intrinsic_dimensions("/nonexistent/file.svg")
         assert result is None
 
-    def test_get_svg_intrinsic_dimensions_malformed_viewbox(self, tmp_path):
+    def test_get_svg_intrinsic_dimensions_malformed_viewbox(self):
         """Test handling of malformed viewBox."""
         svg_content = (
-            '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" viewBox="invalid"></svg>'
+            b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" viewBox="invalid"></svg>'
         )
-        svg_file = tmp_path / "test.svg"
-        svg_file.write_text(svg_content)
 
-        result = get_svg_intrinsic_dimensions(str(svg_file))
+        result = get_svg_intrinsic_dimensions(svg_content)
         assert result is None
 
     def test_get_symbol_file_missing_id(self):
@@ -223,20 +327,18 @@ class TestGetSvgIntrinsicDimensions:
             assert result is None
             mock_logger.warning.assert_called_once_with("Set data missing 'id' field")
 
-    def test_get_svg_intrinsic_dimensions_value_error(self, tmp_path):
+    def test_get_svg_intrinsic_dimensions_value_error(self):
         """Test handling of ValueError when converting viewBox dimensions."""
         from src.services.helpers import get_svg_intrinsic_dimensions
 
         # Create SVG with viewBox that causes ValueError during float conversion
         svg_content = (
-            '<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" '
-            'viewBox="0 0 invalid invalid"></svg>'
+            b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" '
+            b'viewBox="0 0 invalid invalid"></svg>'
         )
-        svg_file = tmp_path / "test.svg"
-        svg_file.write_text(svg_content)
 
         with patch("src.services.helpers.logger") as mock_logger:
-            result = get_svg_intrinsic_dimensions(str(svg_file))
+            result = get_svg_intrinsic_dimensions(svg_content)
             assert result is None
             # Verify error was logged (line 155)
             mock_logger.error.assert_called_once()
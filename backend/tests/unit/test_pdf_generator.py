@@ -1,84 +1,85 @@
 """Unit tests for PDFGenerator."""
 
-from io import BytesIO
+import gc
+import json
+import os
+import pickle
+from io import BufferedWriter, BytesIO
+from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+from pypdf import PageObject, PdfReader, PdfWriter
+from reportlab.pdfgen import canvas
+from svglib.svglib import svg2rlg
+
 from src.services.pdf_generator import (
+    _TEMPLATE_PDF_CACHE_MAX_SIZE,
+    PLACEHOLDER_LABEL,
     PDFGenerator,
+    _load_svg_drawing,
+    _load_template_pdf,
+    _parse_svg_drawing,
+    _read_template_pdf,
     clear_svg_drawing_cache,
     get_svg_drawing_cache_size,
 )
 
+# Every generated PDF starts with this header
+PDF_HEADER = b"%PDF"
+# Markers that only appear in a structurally complete PDF body
+PDF_STRUCTURE_MARKERS = (b"/Pages", b"endobj")
+
+
+@pytest.fixture(scope="module")
+def generated_pdf_bytes(sample_set_data) -> bytes:
+    """PDF rendered once for sample_set_data without symbols, shared by read-only tests."""
+    with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+        return PDFGenerator(sample_set_data).generate().getvalue()
+
 
 class TestPDFGenerator:
     """Tests for PDFGenerator.generate() method."""
 
-    def test_pdf_generator_creates_pdf(self, sample_set_data):
+    def test_pdf_generator_creates_pdf(self, generated_pdf_bytes):
         """Test that PDFGenerator creates a valid PDF."""
-        generator = PDFGenerator(sample_set_data)
-
-        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-            result = generator.generate()
-
-        assert result is not None
-        assert isinstance(result, BytesIO)
         # Check that it's a valid PDF (starts with PDF header)
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert generated_pdf_bytes.startswith(PDF_HEADER)
 
     def test_pdf_generator_handles_empty_sets(self):
         """Test that PDFGenerator handles empty set list."""
         generator = PDFGenerator([])
         result = generator.generate()
 
-        assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert isinstance(result, BytesIO)
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
 
-    def test_pdf_generator_includes_set_data(self, sample_set_data):
+    def test_pdf_generator_includes_set_data(self, generated_pdf_bytes):
         """Test that PDF includes set information."""
-        generator = PDFGenerator(sample_set_data)
-
-        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-            result = generator.generate()
-
         # PDF should be valid and have content
         # Note: PDF text is encoded/compressed, so text search is unreliable
         # Instead, verify PDF structure and that it was generated for the correct number of sets
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF"), "Should be a valid PDF"
+        pdf_content = generated_pdf_bytes
+        assert pdf_content.startswith(PDF_HEADER), "Should be a valid PDF"
         assert len(pdf_content) > 1000, "PDF should have substantial content for 2 sets"
         # Verify PDF was generated (check for PDF structure markers)
-        assert b"/Pages" in pdf_content or b"endobj" in pdf_content, (
+        assert any(marker in pdf_content for marker in PDF_STRUCTURE_MARKERS), (
             "PDF should have proper structure"
         )
 
-    def test_pdf_generator_handles_missing_symbol(self, sample_set_data):
+    def test_pdf_generator_handles_missing_symbol(self, generated_pdf_bytes):
         """Test that PDF generation works without symbols."""
-        generator = PDFGenerator(sample_set_data)
+        assert len(PdfReader(BytesIO(generated_pdf_bytes)).pages) > 0
 
-        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
-            result = generator.generate()
-
-        assert result is not None
-        pdf_content = result.read()
-        assert len(pdf_content) > 0
-
-    def test_pdf_generator_multiple_sets(self):
+    def test_pdf_generator_multiple_sets(self, multi_sets):
         """Test PDF generation with multiple sets."""
-        sets = [
-            {"id": "test-1", "name": "Set 1", "code": "S1", "released_at": "2023-01-01"},
-            {"id": "test-2", "name": "Set 2", "code": "S2", "released_at": "2023-02-01"},
-            {"id": "test-3", "name": "Set 3", "code": "S3", "released_at": "2023-03-01"},
-        ]
-        generator = PDFGenerator(sets)
+        generator = PDFGenerator(multi_sets)
 
         with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert len(pdf_content) > 0
+        assert result.getbuffer().nbytes > 0
 
     def test_pdf_generator_with_template(self, sample_set_data, tmp_path):
         """Test PDF generation with template PDF."""
@@ -92,8 +93,7 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
 
     def test_pdf_generator_template_not_found(self, sample_set_data):
         """Test PDF generation when template file doesn't exist."""
@@ -104,8 +104,260 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
+
+    def test_pdf_generator_writes_to_output_path(self, sample_set_data, tmp_path):
+        """Test that generate() can stream the PDF straight to a file."""
+        output_file = tmp_path / "labels.pdf"
+        generator = PDFGenerator(sample_set_data)
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            result = generator.generate(output_path=output_file)
+
+        assert result == output_file
+        assert output_file.read_bytes().startswith(PDF_HEADER)
+
+    def test_pdf_generator_merges_template_into_output_path(self, sample_set_data, tmp_path):
+        """Test that the template overlay is applied in place when writing to a file."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+        output_file = tmp_path / "labels.pdf"
+        generator = PDFGenerator(sample_set_data, template_path=str(template_file))
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            generator.generate(output_path=output_file)
+
+        assert len(PdfReader(output_file).pages) == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["labels.pdf", "template.pdf"]
+
+    def test_template_merge_writes_file_through_buffered_handle(self, sample_set_data, tmp_path):
+        """Test that the merged PDF is not handed to pypdf as a path (unbuffered writes)."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+        output_file = tmp_path / "labels.pdf"
+        generator = PDFGenerator(sample_set_data, template_path=str(template_file))
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch.object(PdfWriter, "write", autospec=True, side_effect=PdfWriter.write) as write,
+        ):
+            generator.generate(output_path=output_file)
+
+        stream = write.call_args.args[1]
+        assert isinstance(stream, BufferedWriter)
+        assert len(PdfReader(output_file).pages) == 1
+
+    def test_last_template_page_reused_for_extra_pages(self, sample_set_data, tmp_path):
+        """Test that a one-page template backs every labels page without piling up."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.drawString(10, 10, "TEMPLATE")
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 30, template_path=str(template_file))
+        labels_buffer = generator.buffer
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            result = generator.generate()
+
+        # The labels-only PDF is released as soon as it has been merged
+        assert labels_buffer.closed
+        pages = PdfReader(result).pages
+        assert len(pages) == 2
+        for page in pages:
+            text = page.extract_text()
+            assert text.count("TEMPLATE") == 1
+            assert "Test Set 1" in text
+
+    def test_template_pages_merged_with_matching_labels_page(self, tmp_path):
+        """Test that each labels page lands on its own template page copy."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        for name in ("FIRSTPAGE", "LASTPAGE"):
+            template_canvas.drawString(10, 10, name)
+            template_canvas.showPage()
+        template_canvas.save()
+        sets = [
+            {"id": name, "name": name, "code": name[:3], "released_at": "2023-01-01"}
+            for name in ("Alpha", "Beta", "Gamma")
+            for _ in range(30)
+        ]
+        generator = PDFGenerator(sets, template_path=str(template_file))
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            result = generator.generate()
+
+        texts = [page.extract_text() for page in PdfReader(result).pages]
+        assert "FIRSTPAGE" in texts[0] and "Alpha" in texts[0]
+        assert "LASTPAGE" in texts[1] and "Beta" in texts[1] and "Alpha" not in texts[1]
+        assert "LASTPAGE" in texts[2] and "Gamma" in texts[2] and "Beta" not in texts[2]
+
+    def test_reused_template_page_embedded_once(self, sample_set_data, tmp_path):
+        """Test that every page backed by a one-page template shares one form XObject."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.drawString(10, 10, "TEMPLATE")
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 60, template_path=str(template_file))
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            result = generator.generate()
+
+        pages = PdfReader(result).pages
+        forms = [page["/Resources"]["/XObject"].raw_get("/TemplatePage").idnum for page in pages]
+        assert len(pages) == 4
+        assert len(set(forms)) == 1
+
+    def test_template_merge_parses_each_pdf_once(self, sample_set_data, tmp_path):
+        """Test that merging never round-trips template pages through extra readers."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 45, template_path=str(template_file))
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch("src.services.pdf_generator.PdfReader", wraps=PdfReader) as mock_reader,
+        ):
+            result = generator.generate()
+
+        assert mock_reader.call_count == 2
+        assert len(PdfReader(result).pages) == 3
+
+    def test_template_drawn_under_untouched_labels_content(self, sample_set_data, tmp_path):
+        """Test that merging prepends the template form instead of re-parsing content."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.drawString(10, 10, "TEMPLATE")
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 30, template_path=str(template_file))
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            labels = PDFGenerator(sample_set_data * 30).generate()
+        labels_streams = [page.get_contents().get_data() for page in PdfReader(labels).pages]
+        merged = BytesIO()
+
+        with patch.object(PageObject, "merge_page") as merge_page:
+            assert generator._merge_with_template(labels, merged)
+
+        merge_page.assert_not_called()
+        pages = PdfReader(merged).pages
+        for page, labels_stream in zip(pages, labels_streams, strict=True):
+            draw, content = page["/Contents"]
+            assert draw.get_object().get_data().strip() == b"q /TemplatePage Do Q"
+            assert content.get_object().get_data() == labels_stream
+            assert page.extract_text().startswith("TEMPLATE")
+
+    def test_template_only_page_skips_labels_content(self, sample_set_data, tmp_path):
+        """Test that a page without a labels page gets just the template draw."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.drawString(10, 10, "TEMPLATE")
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 30, template_path=str(template_file))
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            labels = PDFGenerator(sample_set_data * 15).generate()
+        merged = BytesIO()
+
+        assert generator._merge_with_template(labels, merged)
+
+        first, template_only = PdfReader(merged).pages
+        assert len(first["/Contents"]) == 2
+        assert template_only["/Contents"].get_data().strip() == b"q /TemplatePage Do Q"
+        assert template_only.extract_text().strip() == "TEMPLATE"
+
+    def test_template_pdf_shared_across_generators(self, sample_set_data, tmp_path):
+        """Test that repeated template merges read the template from disk only once."""
+        template_file = tmp_path / "shared-template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch.object(Path, "read_bytes", autospec=True, side_effect=Path.read_bytes) as read,
+        ):
+            for _ in range(3):
+                result = PDFGenerator(sample_set_data, template_path=str(template_file)).generate()
+                assert len(PdfReader(result).pages) == 1
+
+        assert [call.args[0] for call in read.call_args_list].count(template_file) == 1
+
+    def test_template_pdf_reloaded_after_edit(self, tmp_path):
+        """Test that an edited template PDF is read again."""
+        template_file = tmp_path / "edited-template.pdf"
+        template_file.write_bytes(b"%PDF-1.4\noriginal\n%%EOF")
+        assert _read_template_pdf(str(template_file)) == b"%PDF-1.4\noriginal\n%%EOF"
+
+        template_file.write_bytes(b"%PDF-1.4\nchanged\n%%EOF")
+        stat = template_file.stat()
+        os.utime(template_file, (stat.st_atime, stat.st_mtime + 10))
+
+        assert _read_template_pdf(str(template_file)) == b"%PDF-1.4\nchanged\n%%EOF"
+        assert _read_template_pdf(str(tmp_path / "missing.pdf")) is None
+
+    def test_template_pdf_cache_bounded(self, tmp_path):
+        """Test that the template PDF cache holds a bounded number of files."""
+        for n in range(_TEMPLATE_PDF_CACHE_MAX_SIZE + 4):
+            template_file = tmp_path / f"template-{n}.pdf"
+            template_file.write_bytes(b"%PDF-1.4\n%%EOF")
+            _read_template_pdf(str(template_file))
+
+        assert _load_template_pdf.cache_info().currsize == _TEMPLATE_PDF_CACHE_MAX_SIZE
+
+    def test_template_merge_uses_one_writer(self, sample_set_data, tmp_path):
+        """Test that a multi-page merge builds a single PdfWriter, not one per page."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 45, template_path=str(template_file))
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch("src.services.pdf_generator.PdfWriter", wraps=PdfWriter) as mock_writer,
+        ):
+            result = generator.generate()
+
+        assert mock_writer.call_count == 1
+        assert len(PdfReader(result).pages) == 3
+
+    def test_template_merge_buffers_do_not_scale_with_pages(self, sample_set_data, tmp_path):
+        """Test that merging allocates no per-page scratch buffers."""
+        template_file = tmp_path / "template.pdf"
+        template_canvas = canvas.Canvas(str(template_file))
+        template_canvas.showPage()
+        template_canvas.save()
+        generator = PDFGenerator(sample_set_data * 75, template_path=str(template_file))
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            labels = PDFGenerator(sample_set_data * 75).generate()
+        merged = BytesIO()
+
+        with patch("io.BytesIO", wraps=BytesIO) as mock_buffer:
+            assert generator._merge_with_template(labels, merged)
+
+        # Only the cached template bytes are wrapped for parsing
+        assert mock_buffer.call_count == 1
+        assert len(PdfReader(merged).pages) == 5
+
+    def test_pdf_output_is_deterministic_and_binary_compressed(
+        self, sample_set_data, generated_pdf_bytes
+    ):
+        """Test that identical selections render identical, non-ASCII85 PDFs."""
+        first = generated_pdf_bytes
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=None):
+            second = PDFGenerator(sample_set_data).generate().getvalue()
+
+        assert first == second
+        assert b"/ASCII85Decode" not in first
+        assert PdfReader(BytesIO(first)).metadata.title == "MTG Labels"
 
     def test_pdf_generator_with_symbol_file(self, sample_set_data, tmp_path):
         """Test PDF generation with actual symbol file."""
@@ -122,9 +374,60 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
-        assert len(pdf_content) > 0
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
+        assert result.getbuffer().nbytes > len(PDF_HEADER)
+
+    def test_repeated_symbol_rendered_once_as_form(self, sample_set_data, mock_svg_file):
+        """Test that a symbol shared by many labels is rendered into one form XObject."""
+        generator = PDFGenerator(sample_set_data * 20)
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=str(mock_svg_file)),
+            patch("src.services.pdf_generator.renderPDF.draw") as mock_draw,
+        ):
+            result = generator.generate()
+
+        assert mock_draw.call_count == 1
+        assert generator._xobject_cache == {str(mock_svg_file): "SetSymbol0"}
+        for page in PdfReader(result).pages:
+            assert list(page["/Resources"]["/XObject"]) == ["/FormXob.SetSymbol0"]
+
+    def test_label_slots_precomputed_per_page(self):
+        """Test that every slot on a page has precomputed geometry."""
+        generator = PDFGenerator([], template_name="avery5160")
+        template = generator.template
+
+        slots = generator._label_slots
+
+        assert len(slots) == template["labels_per_row"] * template["label_rows"]
+        label_x, label_y, text_x, text_y, max_text_width = slots[0]
+        assert label_x == template["left_margin"]
+        assert label_y == (
+            template["page_height"] - template["top_margin"] - template["label_height"]
+        )
+        assert text_x == label_x + template["label_margin_x"]
+        assert max_text_width > 0
+        # Second slot sits one label width plus gap to the right on the same row
+        assert slots[1][0] == label_x + template["label_width"] + template["horizontal_gap"]
+        assert slots[1][1] == label_y
+
+    def test_label_slots_shared_per_template(self):
+        """Test that slot geometry is computed once per template and reused."""
+        first = PDFGenerator([], template_name="avery5160")
+
+        with patch.object(PDFGenerator, "_compute_label_slots") as mock_compute:
+            second = PDFGenerator([], template_name="avery5160")
+
+        mock_compute.assert_not_called()
+        assert second._label_slots is first._label_slots
+
+    def test_label_planner_selected_by_view_mode(self):
+        """Test that the per-label planner is chosen once from the view mode."""
+        assert PDFGenerator([])._plan_label.__func__ is PDFGenerator._plan_set_label
+        assert (
+            PDFGenerator([], view_mode="types")._plan_label.__func__
+            is PDFGenerator._plan_type_label
+        )
 
     def test_pdf_generator_types_view(self):
         """Test PDF generation for types view."""
@@ -141,9 +444,8 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
-        assert len(pdf_content) > 0
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
+        assert result.getbuffer().nbytes > len(PDF_HEADER)
 
     def test_pdf_generator_types_view_with_mana_symbol(self, tmp_path):
         """Test PDF generation for types view with mana symbol."""
@@ -166,9 +468,97 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
-        assert len(pdf_content) > 0
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
+        assert result.getbuffer().nbytes > len(PDF_HEADER)
+
+    def test_mana_symbols_prefetched_once_per_color(self):
+        """Test that each distinct color's mana symbol is resolved once before drawing."""
+        card_types = [
+            {"color": color, "type": card_type, "name": card_type, "id": f"{color}:{card_type}"}
+            for color in ("White", "Blue")
+            for card_type in ("Creature", "Instant", "Sorcery")
+        ]
+        generator = PDFGenerator([PLACEHOLDER_LABEL, *card_types], view_mode="types")
+
+        with patch(
+            "src.services.pdf_generator.PDFGenerator._get_mana_symbol_file",
+            return_value=None,
+        ) as mock_get_file:
+            generator.generate()
+
+        assert sorted(call.args[0] for call in mock_get_file.call_args_list) == [
+            "Blue",
+            "White",
+        ]
+        assert generator._mana_symbol_files == {"White": None, "Blue": None}
+
+    def test_set_symbols_prefetched_and_parsed_before_drawing(self, sample_set_data, mock_svg_file):
+        """Test that each unique set symbol is resolved and parsed once up front."""
+        clear_svg_drawing_cache()
+        generator = PDFGenerator(sample_set_data * 10)
+
+        with (
+            patch(
+                "src.services.pdf_generator.get_symbol_file", return_value=str(mock_svg_file)
+            ) as mock_get_file,
+            patch.object(generator, "_draw_page"),
+        ):
+            generator.generate()
+
+        assert mock_get_file.call_count == len(sample_set_data)
+        assert set(generator._symbol_files) == {s["id"] for s in sample_set_data}
+        assert get_svg_drawing_cache_size() == 1
+
+    def test_svg_dimensions_read_once_per_file(self, sample_set_data, mock_svg_file):
+        """Test that each SVG is read once and its bytes feed the dimensions lookup."""
+        clear_svg_drawing_cache()
+        generator = PDFGenerator(sample_set_data * 10)
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=str(mock_svg_file)),
+            patch(
+                "src.services.pdf_generator.get_svg_intrinsic_dimensions",
+                return_value=(100.0, 100.0),
+            ) as mock_dimensions,
+            patch.object(
+                Path, "read_bytes", autospec=True, side_effect=Path.read_bytes
+            ) as mock_read,
+        ):
+            generator.generate()
+
+        svg_reads = [c for c in mock_read.call_args_list if c.args[0] == mock_svg_file]
+        assert len(svg_reads) == 1
+        mock_dimensions.assert_called_once_with(mock_svg_file.read_bytes())
+        symbol = _load_svg_drawing(str(mock_svg_file))
+        assert (symbol.width, symbol.height) == (100.0, 100.0)
+        assert symbol.bounds is not None
+
+    def test_symbol_transform_computed_once_per_size(self, sample_set_data, mock_svg_file):
+        """Test that repeated symbols reuse the cached scale and bounds offset."""
+        generator = PDFGenerator(sample_set_data * 10)
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=str(mock_svg_file)):
+            generator.generate()
+
+        assert len(generator._svg_transform_cache) == 1
+        transform = next(iter(generator._svg_transform_cache.values()))
+        assert transform.scaled_height <= generator.text_block_height
+        assert transform.scaled_width <= generator.effective_symbol_width + 1e-9
+
+    def test_fonts_selected_once_per_page(self, sample_set_data):
+        """Test that labels are emitted grouped by font instead of switching per label."""
+        generator = PDFGenerator(sample_set_data * 30)
+        set_font = generator.canvas.setFont
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch.object(generator.canvas, "setFont", wraps=set_font) as mock_set_font,
+        ):
+            generator.generate()
+
+        # 60 labels on a 30-label template: pages start in the first-line font,
+        # so only the switch to the second-line font is emitted on each page
+        assert mock_set_font.call_count == 2
 
     def test_pdf_generator_invalid_template(self, sample_set_data):
         """Test PDFGenerator with invalid template name (lines 110-113)."""
@@ -178,8 +568,7 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
 
     def test_pdf_generator_placeholder_labels(self, sample_set_data):
         """Test PDFGenerator with placeholder labels (lines 196-197)."""
@@ -191,8 +580,7 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
 
     def test_pdf_generator_invalid_date_format(self):
         """Test PDFGenerator with invalid date format (lines 309-310)."""
@@ -210,37 +598,44 @@ class TestPDFGenerator:
             result = generator.generate()
 
         assert result is not None
-        pdf_content = result.read()
-        assert pdf_content.startswith(b"%PDF")
+        assert result.read(len(PDF_HEADER)) == PDF_HEADER
 
-    def test_pdf_generator_get_mana_symbol_uri_from_api_success(self):
+    @pytest.mark.usefixtures("no_sleep")
+    def test_pdf_generator_get_mana_symbol_uri_from_api_success(self, make_response):
         """Test _get_mana_symbol_uri_from_api successful fetch."""
         card_types = [
             {"color": "White", "type": "Creature", "name": "Creature", "id": "White:Creature"},
         ]
         generator = PDFGenerator(card_types, view_mode="types")
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "object": "card_symbol",
-                    "symbol": "{W}",
-                    "svg_uri": "https://example.com/w.svg",
-                }
-            ]
-        }
+        mock_response = make_response(
+            200,
+            {
+                "data": [
+                    {
+                        "object": "card_symbol",
+                        "symbol": "{W}",
+                        "svg_uri": "https://svgs.scryfall.io/card-symbols/W.svg",
+                    }
+                ]
+            },
+        )
+
+        mock_session = Mock()
+        mock_session.get.return_value = mock_response
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("src.services.pdf_generator.get_download_session", return_value=mock_session):
             # First call should fetch and cache
             result = generator._get_mana_symbol_uri_from_api("{W}", "White")
-            assert result == "https://example.com/w.svg"
+            assert result == "https://svgs.scryfall.io/card-symbols/W.svg"
             # Second call should use cache
             result2 = generator._get_mana_symbol_uri_from_api("{W}", "White")
-            assert result2 == "https://example.com/w.svg"
+            assert result2 == "https://svgs.scryfall.io/card-symbols/W.svg"
+
+        mock_session.get.assert_called_once()
 
-    def test_pdf_generator_get_mana_symbol_uri_from_api_multicolor_pw(self):
+    @pytest.mark.usefixtures("no_sleep")
+    def test_pdf_generator_get_mana_symbol_uri_from_api_multicolor_pw(self, make_response):
         """Test _get_mana_symbol_uri_from_api for multicolor with PW symbol."""
         card_types = [
             {
@@ -252,21 +647,94 @@ class TestPDFGenerator:
         ]
         generator = PDFGenerator(card_types, view_mode="types")
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "data": [
-                {
-                    "object": "card_symbol",
-                    "symbol": "{PW}",
-                    "svg_uri": "https://example.com/pw.svg",
-                }
-            ]
-        }
+        mock_response = make_response(
+            200,
+            {
+                "data": [
+                    {
+                        "object": "card_symbol",
+                        "symbol": "{PW}",
+                        "svg_uri": "https://svgs.scryfall.io/card-symbols/PW.svg",
+                    }
+                ]
+            },
+        )
+
+        mock_session = Mock()
+        mock_session.get.return_value = mock_response
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("src.services.pdf_generator.get_download_session", return_value=mock_session):
             result = generator._get_mana_symbol_uri_from_api("{PW}", "Multicolor")
-            assert result == "https://example.com/pw.svg"
+            assert result == "https://svgs.scryfall.io/card-symbols/PW.svg"
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_symbology_persisted_across_generators(self, symbology_cache_file, make_response):
+        """Test that fetched symbology is reused from disk by later generators."""
+        mock_response = make_response(
+            200,
+            {
+                "data": [
+                    {
+                        "object": "card_symbol",
+                        "symbol": "{W}",
+                        "svg_uri": "https://svgs.scryfall.io/card-symbols/W.svg",
+                    }
+                ]
+            },
+        )
+        mock_session = Mock()
+        mock_session.get.return_value = mock_response
+
+        with patch("src.services.pdf_generator.get_download_session", return_value=mock_session):
+            PDFGenerator([])._get_mana_symbol_uri_from_api("{W}", "White")
+            result = PDFGenerator([])._get_mana_symbol_uri_from_api("{W}", "White")
+
+        assert result == "https://svgs.scryfall.io/card-symbols/W.svg"
+        mock_session.get.assert_called_once()
+        assert json.loads(symbology_cache_file.read_text()) == {
+            "{W}": "https://svgs.scryfall.io/card-symbols/W.svg"
+        }
+
+    @pytest.mark.usefixtures("no_sleep")
+    def test_expired_symbology_cache_refetched(self, symbology_cache_file, make_response):
+        """Test that a stale symbology file is ignored."""
+        symbology_cache_file.write_text(
+            json.dumps({"{W}": "https://svgs.scryfall.io/card-symbols/OLD.svg"})
+        )
+        stale = symbology_cache_file.stat().st_mtime - 8 * 24 * 3600
+        os.utime(symbology_cache_file, (stale, stale))
+        mock_session = Mock()
+        mock_session.get.return_value = make_response(503)
+
+        with patch("src.services.pdf_generator.get_download_session", return_value=mock_session):
+            result = PDFGenerator([])._get_mana_symbol_uri_from_api("{W}", "White")
+
+        assert result is None
+        mock_session.get.assert_called_once()
+
+    @pytest.mark.usefixtures("no_sleep")
+    @pytest.mark.parametrize(
+        ("uri", "dir_mode"),
+        [
+            ("https://evil.example/W.svg", 0o700),
+            ("https://svgs.scryfall.io/card-symbols/W.svg", 0o777),
+        ],
+        ids=["foreign_uri", "world_writable_dir"],
+    )
+    def test_untrusted_symbology_cache_ignored(
+        self, symbology_cache_file, make_response, uri, dir_mode
+    ):
+        """Test that a planted symbology file is not trusted."""
+        symbology_cache_file.write_text(json.dumps({"{W}": uri}))
+        symbology_cache_file.parent.chmod(dir_mode)
+        mock_session = Mock()
+        mock_session.get.return_value = make_response(503)
+
+        with patch("src.services.pdf_generator.get_download_session", return_value=mock_session):
+            result = PDFGenerator([])._get_mana_symbol_uri_from_api("{W}", "White")
+
+        assert result is None
+        mock_session.get.assert_called_once()
 
     def test_pdf_generator_draw_raster_symbol(self, sample_set_data, tmp_path):
         """Test _draw_raster_symbol method (lines 598-634)."""
@@ -303,19 +771,147 @@ class TestPDFGenerator:
             generator._cleanup()
             # Should not raise
 
-    def test_clear_svg_drawing_cache(self):
+    def test_clear_svg_drawing_cache(self, mock_svg_file):
         """Test clear_svg_drawing_cache function (lines 50-53)."""
-        from src.services.pdf_generator import _svg_drawing_cache
-
-        _svg_drawing_cache["test"] = "value"
+        _load_svg_drawing(str(mock_svg_file))
         count = clear_svg_drawing_cache()
         assert count >= 0
-        assert len(_svg_drawing_cache) == 0
+        assert get_svg_drawing_cache_size() == 0
 
-    def test_get_svg_drawing_cache_size(self):
+    def test_get_svg_drawing_cache_size(self, mock_svg_file):
         """Test get_svg_drawing_cache_size function."""
-        from src.services.pdf_generator import _svg_drawing_cache
-
-        _svg_drawing_cache["test"] = "value"
+        _load_svg_drawing(str(mock_svg_file))
         size = get_svg_drawing_cache_size()
         assert size >= 1
+
+    def test_generate_keeps_svg_drawing_cache_warm(self, sample_set_data, mock_svg_file, tmp_path):
+        """Test that generation relies on LRU eviction instead of bulk-pruning the cache."""
+        clear_svg_drawing_cache()
+        other_svg = tmp_path / "other_symbol.svg"
+        other_svg.write_text(mock_svg_file.read_text())
+        _load_svg_drawing(str(other_svg))
+
+        with patch("src.services.pdf_generator.get_symbol_file", return_value=str(mock_svg_file)):
+            PDFGenerator(sample_set_data * 30).generate()
+
+        assert get_svg_drawing_cache_size() == 2
+        hits = _load_svg_drawing.cache_info().hits
+        _load_svg_drawing(str(other_svg))
+        assert _load_svg_drawing.cache_info().hits == hits + 1
+
+
+@pytest.fixture(scope="module")
+def mock_svg_bytes(mock_svg_file) -> bytes:
+    """Contents of the mock SVG file, read once per module."""
+    return mock_svg_file.read_bytes()
+
+
+class TestPDFGeneratorSvgDrawingDiskCache:
+    """Tests for the disk-persisted SVG drawing cache."""
+
+    def test_parsed_drawing_persisted_and_reused(
+        self, mock_svg_file, mock_svg_bytes, svg_drawing_cache_dir
+    ):
+        """Test that a second load is served from the pickle without re-parsing."""
+        with patch("src.services.pdf_generator.svg2rlg", wraps=svg2rlg) as mock_parse:
+            first = _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+            second = _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+
+        assert mock_parse.call_count == 1
+        assert second.getBounds() == first.getBounds()
+        assert [p.suffix for p in svg_drawing_cache_dir.iterdir()] == [".pkl"]
+
+    def test_unreadable_pickle_falls_back_to_parsing(
+        self, mock_svg_file, mock_svg_bytes, svg_drawing_cache_dir
+    ):
+        """Test that a corrupt cache entry is re-parsed and replaced."""
+        _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+        (pickle_file,) = svg_drawing_cache_dir.iterdir()
+        pickle_file.write_bytes(b"not a pickle")
+
+        drawing = _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+
+        assert drawing is not None
+        assert pickle_file.read_bytes() != b"not a pickle"
+
+    def test_cache_dir_created_private(self, mock_svg_file, mock_svg_bytes, svg_drawing_cache_dir):
+        """Test that the drawing cache directory is created readable by this user only."""
+        _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+
+        assert svg_drawing_cache_dir.stat().st_mode & 0o777 == 0o700
+
+    @pytest.mark.parametrize("untrusted", ["group_writable", "wrong_owner"])
+    def test_planted_pickle_in_untrusted_dir_ignored(
+        self, mock_svg_file, mock_svg_bytes, svg_drawing_cache_dir, monkeypatch, untrusted
+    ):
+        """Test that pickles are not loaded from a directory other users could write to."""
+        _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+        (pickle_file,) = svg_drawing_cache_dir.iterdir()
+        pickle_file.write_bytes(pickle.dumps("planted"))
+        if untrusted == "group_writable":
+            svg_drawing_cache_dir.chmod(0o770)
+        else:
+            monkeypatch.setattr(os, "getuid", lambda: svg_drawing_cache_dir.stat().st_uid + 1)
+
+        with patch("src.services.pdf_generator.pickle.load") as mock_load:
+            drawing = _parse_svg_drawing(str(mock_svg_file), mock_svg_bytes)
+
+        mock_load.assert_not_called()
+        assert drawing is not None and drawing != "planted"
+
+    def test_missing_svg_file_returns_none(self, tmp_path, svg_drawing_cache_dir):
+        """Test that an unreadable symbol file is logged and skipped, not raised."""
+        assert _load_svg_drawing(str(tmp_path / "missing.svg")) is None
+        assert not svg_drawing_cache_dir.exists()
+
+
+class TestPDFGeneratorGarbageCollection:
+    """Tests for garbage collection handling during PDF generation."""
+
+    @staticmethod
+    def _generate_pages(sets, pages: int) -> list[bool]:
+        """Generate a PDF spanning several pages, recording gc.isenabled() per label."""
+        generator = PDFGenerator(sets * (30 * pages // len(sets)))
+        gc_states: list[bool] = []
+        plan_label = generator._plan_label
+
+        def record_plan_label(set_data):
+            gc_states.append(gc.isenabled())
+            return plan_label(set_data)
+
+        with (
+            patch("src.services.pdf_generator.get_symbol_file", return_value=None),
+            patch.object(generator, "_plan_label", side_effect=record_plan_label),
+        ):
+            generator.generate()
+        return gc_states
+
+    def test_gc_paused_during_generation_and_collected_once(self, sample_set_data):
+        """Test that "off" mode pauses automatic GC and collects the young generation once."""
+        with (
+            patch("src.services.pdf_generator.PDF_GC_MODE", "off"),
+            patch("src.services.pdf_generator.gc.collect", return_value=0) as mock_collect,
+        ):
+            gc_states = self._generate_pages(sample_set_data, pages=3)
+
+        assert not any(gc_states)
+        assert gc.isenabled()
+        mock_collect.assert_called_once_with(0)
+
+    def test_gc_auto_mode_leaves_gc_enabled(self, sample_set_data):
+        """Test that "auto" mode keeps automatic GC running."""
+        with patch("src.services.pdf_generator.PDF_GC_MODE", "auto"):
+            gc_states = self._generate_pages(sample_set_data, pages=2)
+
+        assert all(gc_states)
+
+    def test_gc_manual_mode_collects_young_generation(self, sample_set_data):
+        """Test that "manual" mode runs a generation-0 collection every 8 pages."""
+        with (
+            patch("src.services.pdf_generator.PDF_GC_MODE", "manual"),
+            patch("src.services.pdf_generator.gc.collect", return_value=0) as mock_collect,
+        ):
+            self._generate_pages(sample_set_data, pages=9)
+
+        # One collection after the eighth page, one in cleanup
+        assert mock_collect.call_args_list.count(((0,),)) == 2
@@ -1,193 +1,174 @@
 """Unit tests for ScryfallClient."""
 
-from datetime import datetime, timedelta
+import time
 from unittest.mock import Mock, patch
 
 import pytest
 import requests
 from fastapi import HTTPException
 
-from src.cache.cache_manager import CachedSetData, get_cache_manager
+from src.config import SCRYFALL_API_RETRY_ATTEMPTS, SCRYFALL_CARD_TYPES_URL
 from src.services.scryfall_client import ScryfallClient
 
-
+EXCLUDED_CARD_TYPES = frozenset(
+    {"Conspiracy", "Dungeon", "Emblem", "Hero", "Phenomenon", "Plane", "Scheme", "Vanguard"}
+)
+EXPECTED_COMMON_CARD_TYPES = frozenset(
+    {
+        "Creature",
+        "Instant",
+        "Sorcery",
+        "Enchantment",
+        "Artifact",
+        "Planeswalker",
+        "Land",
+        "Battle",
+        "Kindred",
+    }
+)
+
+
+@pytest.mark.usefixtures("isolated_cache")
 class TestScryfallClientFetchSets:
     """Tests for ScryfallClient.fetch_sets() method."""
 
-    def test_fetch_sets_success(self, mock_scryfall_response):
+    def test_fetch_sets_success(self, scryfall_client, scryfall_http, mock_scryfall_response):
         """Test successful fetch of sets from API."""
-        # Clear cache to ensure we get fresh data
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_scryfall_response
+        scryfall_http.add(scryfall_client.BASE_URL, mock_scryfall_response)
 
-        with patch.object(client.session, "get", return_value=mock_response):
-            result = client.fetch_sets()
+        result = scryfall_client.fetch_sets()
 
+        assert scryfall_http.calls == [scryfall_client.BASE_URL]
         assert len(result) == 2
         assert result[0]["id"] == "test-set-1"
         assert result[1]["id"] == "test-set-2"
 
-    def test_fetch_sets_uses_cache(self, mock_scryfall_response):
-        """Test that fetch_sets uses cached data on second call."""
-        # Clear cache to ensure we start fresh
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_scryfall_response
-
-        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
-            # First call
-            result1 = client.fetch_sets()
-            # Second call should use cache
-            result2 = client.fetch_sets()
-
-        assert result1 == result2
-        # Should only call API once
-        assert mock_get.call_count == 1
+    def test_fetch_sets_decodes_raw_response_body(
+        self, scryfall_client, mock_scryfall_response_bytes
+    ):
+        """Test that a real requests.Response body is decoded into sets."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = mock_scryfall_response_bytes
 
-    def test_fetch_sets_network_error(self):
-        """Test handling of network errors."""
-        # Clear cache to ensure we get fresh data
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
+        with patch.object(scryfall_client.session, "get", return_value=response):
+            result = scryfall_client.fetch_sets()
 
-        client = ScryfallClient()
+        assert [s["id"] for s in result] == ["test-set-1", "test-set-2"]
 
-        with patch.object(
-            client.session, "get", side_effect=requests.RequestException("Network error")
-        ):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_sets()
+    def test_legacy_cache_view_reads_cache_manager(
+        self, scryfall_client, isolated_cache, mock_scryfall_response, make_response
+    ):
+        """Test that client.cache proxies the cache manager instead of storing sets."""
+        assert scryfall_client.cache == {}
 
-            assert exc_info.value.status_code == 500
-            assert "Error fetching sets" in exc_info.value.detail
+        mock_response = make_response(200, mock_scryfall_response)
+        with patch.object(scryfall_client.session, "get", return_value=mock_response):
+            sets = scryfall_client.fetch_sets()
 
-    def test_fetch_sets_api_error(self):
-        """Test handling of API errors (non-200 status)."""
-        # Clear cache to ensure we get fresh data
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
+        assert scryfall_client.cache["sets"] is sets
+        isolated_cache.clear()
+        assert scryfall_client.cache == {}
 
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 500
+    def test_fetch_sets_uses_cache(self, scryfall_client, mock_scryfall_response, make_response):
+        """Test that fetch_sets uses cached data on second call."""
+        mock_response = make_response(200, mock_scryfall_response)
 
-        with patch.object(client.session, "get", return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_sets()
+        with patch.object(scryfall_client.session, "get", return_value=mock_response) as mock_get:
+            # First call
+            result1 = scryfall_client.fetch_sets()
+            # Second call should use cache
+            result2 = scryfall_client.fetch_sets()
 
-            assert exc_info.value.status_code == 500
-            assert "Error fetching sets" in exc_info.value.detail
+        assert result1 == result2
+        # Should only call API once
+        assert mock_get.call_count == 1
 
-    def test_fetch_sets_uses_legacy_cache_format(self, mock_scryfall_response):
+    @pytest.mark.parametrize(
+        ("error", "status"),
+        [
+            (requests.ConnectionError("Network error"), None),
+            (None, 500),
+            # What the session raises once its urllib3 retries are exhausted
+            (requests.RequestException("Max retries exceeded"), None),
+        ],
+        ids=["network_error", "api_error", "all_retries_fail"],
+    )
+    def test_fetch_sets_error(self, scryfall_client, scryfall_http, error, status):
+        """Test that network and API errors surface as a 500 HTTPException."""
+        if error is not None:
+            scryfall_http.add(scryfall_client.BASE_URL, error=error)
+        else:
+            scryfall_http.add(scryfall_client.BASE_URL, {"object": "error"}, status=status)
+
+        with pytest.raises(HTTPException, match="^500: Error fetching sets"):
+            scryfall_client.fetch_sets()
+
+    def test_fetch_sets_uses_legacy_cache_format(
+        self, scryfall_client, isolated_cache, mock_scryfall_response, make_response
+    ):
         """Test that fetch_sets handles legacy cache format (list)."""
-        # Clear cache to ensure we start fresh
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_scryfall_response
+        mock_response = make_response(200, mock_scryfall_response)
 
         # Set legacy cache format (list instead of CachedSetData)
-        sets_data = mock_scryfall_response["data"]
-        cache_manager.set("sets", sets_data)
+        sets_data = list(mock_scryfall_response["data"])
+        isolated_cache.set("sets", sets_data)
 
         # Should use cached data without making API call
-        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
-            result = client.fetch_sets()
+        with patch.object(scryfall_client.session, "get", return_value=mock_response) as mock_get:
+            result = scryfall_client.fetch_sets()
 
         assert len(result) == 2
         assert result[0]["id"] == "test-set-1"
         # Should not call API when using cache
         assert mock_get.call_count == 0
 
-    def test_fetch_sets_all_retries_fail(self):
-        """Test handling when all retry attempts fail."""
-        # Clear cache to ensure we get fresh data
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-
-        # Mock session.get to always raise RequestException
-        with patch.object(
-            client.session, "get", side_effect=requests.RequestException("Network error")
-        ):
-            with patch("src.services.scryfall_client.SCRYFALL_API_RETRY_ATTEMPTS", 1):
-                with pytest.raises(HTTPException) as exc_info:
-                    client.fetch_sets()
-
-                assert exc_info.value.status_code == 500
-                assert "Error fetching sets" in exc_info.value.detail
-
-    def test_fetch_sets_expired_cache(self, mock_scryfall_response):
+    def test_fetch_sets_expired_cache(
+        self,
+        scryfall_client,
+        isolated_cache,
+        expired_cache_entry,
+        mock_scryfall_response,
+        make_response,
+        monkeypatch,
+    ):
         """Test that expired cache triggers fresh fetch."""
-        # Clear cache to ensure we start fresh
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_scryfall_response
-
-        # Create expired cache entry
-        expired_sets = mock_scryfall_response["data"]
-        expired_cache = CachedSetData(
-            sets=expired_sets,
-            cached_at=datetime.now() - timedelta(days=2),
-            expires_at=datetime.now() - timedelta(days=1),  # Expired yesterday
-        )
+        mock_response = make_response(200, mock_scryfall_response)
+
         # Set expired cache
-        cache_manager.set("sets", expired_cache)
+        isolated_cache.set("sets", expired_cache_entry)
 
-        # Mock get() to return expired cache on first call (for is_expired check),
-        # then None on second call (so get_or_fetch calls fetch_from_api)
-        call_count = {"count": 0}
+        # get() returns the expired entry for the is_expired check, then None so
+        # get_or_fetch calls fetch_from_api
+        cached_values = iter([expired_cache_entry, None])
 
-        def mock_get(key: str):
-            call_count["count"] += 1
-            if key == "sets" and call_count["count"] == 1:
-                return expired_cache
-            # Return None on subsequent calls so get_or_fetch triggers fetch
-            return None
+        mock_cache_get = Mock(side_effect=cached_values)
+        mock_get_api = Mock(return_value=mock_response)
+        monkeypatch.setattr(isolated_cache, "get", mock_cache_get)
+        monkeypatch.setattr(scryfall_client.session, "get", mock_get_api)
 
         # Should fetch fresh data instead of using expired cache
-        with patch.object(cache_manager, "get", side_effect=mock_get):
-            with patch.object(client.session, "get", return_value=mock_response) as mock_get_api:
-                result = client.fetch_sets()
+        result = scryfall_client.fetch_sets()
 
         assert isinstance(result, list)
         assert len(result) == 2
         assert result[0]["id"] == "test-set-1"
         # Should have called API to fetch fresh data
         assert mock_get_api.call_count == 1
+        assert [c.args[0] for c in mock_cache_get.call_args_list] == ["sets", "sets"]
 
-    def test_fetch_sets_zero_retries(self):
-        """Test handling when retry attempts is 0 (edge case)."""
-        # Clear cache to ensure we get fresh data
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
+    def test_fetch_sets_single_request_on_error(self, scryfall_client, monkeypatch):
+        """Test that failures are not retried on top of the session's retry policy."""
+        mock_get = Mock(side_effect=requests.Timeout("Timeout error"))
+        monkeypatch.setattr(scryfall_client.session, "get", mock_get)
 
-        # Patch retry attempts to 0 to test unreachable code path
-        with patch("src.services.scryfall_client.SCRYFALL_API_RETRY_ATTEMPTS", 0):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_sets()
+        with pytest.raises(HTTPException, match="^500: "):
+            scryfall_client.fetch_sets()
 
-            assert exc_info.value.status_code == 500
-            assert "Network error fetching sets from Scryfall" in exc_info.value.detail
+        assert mock_get.call_count == 1
+        assert scryfall_client.session.get_adapter(scryfall_client.BASE_URL).max_retries.total == (
+            SCRYFALL_API_RETRY_ATTEMPTS
+        )
 
 
 class TestScryfallClientFilterSets:
@@ -199,118 +180,81 @@ class TestScryfallClientFilterSets:
         assert len(filtered) == 2
         assert all(s["id"] in ["test-set-1", "test-set-2"] for s in filtered)
 
-    def test_filter_sets_excludes_wrong_type(self):
-        """Test that sets with wrong set_type are excluded."""
+    @pytest.mark.parametrize(
+        ("kept_overrides", "dropped_overrides"),
+        [
+            ({}, {"set_type": "invalid_type"}),
+            ({}, {"card_count": 30}),
+            ({}, {"code": "cmb1"}),
+            # set_type and code are compared case-insensitively
+            ({"set_type": "EXPANSION"}, {"code": "CMB1"}),
+            ({"digital": False}, {"digital": True}),
+        ],
+        ids=["wrong_type", "small_set", "ignored_set", "case_insensitive", "digital_set"],
+    )
+    def test_filter_sets_excludes(self, monkeypatch, kept_overrides, dropped_overrides):
+        """Test that sets failing a filter criterion are excluded."""
+        monkeypatch.setattr("src.services.scryfall_client.MINIMUM_SET_SIZE", 50)
+        base = {"name": "Test", "code": "T1", "set_type": "expansion", "card_count": 100}
         sets = [
-            {
-                "id": "test-1",
-                "name": "Test 1",
-                "code": "T1",
-                "set_type": "expansion",
-                "card_count": 100,
-            },
-            {
-                "id": "test-2",
-                "name": "Test 2",
-                "code": "T2",
-                "set_type": "invalid_type",
-                "card_count": 100,
-            },
+            {**base, "id": "test-1", **kept_overrides},
+            {**base, "id": "test-2", **dropped_overrides},
         ]
-        filtered = ScryfallClient.filter_sets(sets)
-        assert len(filtered) == 1
-        assert filtered[0]["id"] == "test-1"
 
-    @patch("src.services.scryfall_client.MINIMUM_SET_SIZE", 50)
-    def test_filter_sets_excludes_small_sets(self):
-        """Test that sets below minimum size are excluded."""
-        sets = [
-            {
-                "id": "test-1",
-                "name": "Test 1",
-                "code": "T1",
-                "set_type": "expansion",
-                "card_count": 100,
-            },
-            {
-                "id": "test-2",
-                "name": "Test 2",
-                "code": "T2",
-                "set_type": "expansion",
-                "card_count": 30,
-            },
-        ]
         filtered = ScryfallClient.filter_sets(sets)
-        assert len(filtered) == 1
-        assert filtered[0]["id"] == "test-1"
 
-    def test_filter_sets_excludes_ignored_sets(self):
-        """Test that ignored sets are excluded."""
-        sets = [
-            {
-                "id": "test-1",
-                "name": "Test 1",
-                "code": "T1",
-                "set_type": "expansion",
-                "card_count": 100,
-            },
-            {
-                "id": "test-2",
-                "name": "Test 2",
-                "code": "cmb1",
-                "set_type": "expansion",
-                "card_count": 100,
-            },
-        ]
-        filtered = ScryfallClient.filter_sets(sets)
-        assert len(filtered) == 1
-        assert filtered[0]["id"] == "test-1"
+        assert [s["id"] for s in filtered] == ["test-1"]
 
-    def test_filter_sets_case_insensitive(self):
-        """Test that filtering is case-insensitive for set_type and code."""
+    def test_filter_sets_debug_logging_explains_exclusions(self):
+        """Test that the DEBUG path keeps the same sets and logs why others are dropped."""
         sets = [
-            {
-                "id": "test-1",
-                "name": "Test 1",
-                "code": "T1",
-                "set_type": "EXPANSION",
-                "card_count": 100,
-            },
-            {
-                "id": "test-2",
-                "name": "Test 2",
-                "code": "CMB1",
-                "set_type": "expansion",
-                "card_count": 100,
-            },
+            {"id": "keep", "name": "Keep", "code": "K", "set_type": "core", "card_count": 50},
+            {"id": "small", "name": "Small", "code": "S", "set_type": "core", "card_count": 1},
+            {"id": "promo", "name": "Promo", "code": "P", "set_type": "promo", "card_count": 50},
         ]
-        filtered = ScryfallClient.filter_sets(sets)
-        assert len(filtered) == 1
-        assert filtered[0]["id"] == "test-1"
+        fast = ScryfallClient.filter_sets(sets)
 
-    def test_filter_sets_excludes_digital_sets(self):
-        """Test that digital-only sets are excluded."""
-        sets = [
-            {
-                "id": "test-1",
-                "name": "Test 1",
-                "code": "T1",
-                "set_type": "expansion",
-                "card_count": 100,
-                "digital": False,
-            },
-            {
-                "id": "test-2",
-                "name": "Test 2",
-                "code": "T2",
-                "set_type": "expansion",
-                "card_count": 100,
-                "digital": True,
-            },
+        with patch("src.services.scryfall_client.logger") as mock_logger:
+            mock_logger.isEnabledFor.return_value = True
+            verbose = ScryfallClient.filter_sets(sets)
+
+        assert verbose == fast == [sets[0]]
+        messages = [call.args[0] for call in mock_logger.debug.call_args_list]
+        assert messages == [
+            "Excluding set 'Small' due to card_count 1",
+            "Excluding set 'Promo' due to set_type 'promo'",
         ]
-        filtered = ScryfallClient.filter_sets(sets)
+
+
+class TestScryfallClientGetFilteredSets:
+    """Tests for ScryfallClient.get_filtered_sets() method."""
+
+    def test_get_filtered_sets_memoized_per_fetch(self, scryfall_client, sample_set_data):
+        """Test that filtering runs once while fetch_sets returns the same list."""
+
+        with (
+            patch.object(scryfall_client, "fetch_sets", return_value=sample_set_data),
+            patch.object(
+                scryfall_client, "filter_sets", wraps=scryfall_client.filter_sets
+            ) as mock_filter,
+        ):
+            first, first_etag = scryfall_client.get_filtered_sets()
+            second, second_etag = scryfall_client.get_filtered_sets()
+
+        assert mock_filter.call_count == 1
+        assert second is first
+        assert second_etag == first_etag
+
+    def test_get_filtered_sets_recomputes_after_refetch(self, scryfall_client, sample_set_data):
+        """Test that a new fetch result invalidates the memo and changes the ETag."""
+
+        with patch.object(scryfall_client, "fetch_sets", return_value=sample_set_data):
+            _, first_etag = scryfall_client.get_filtered_sets()
+        with patch.object(scryfall_client, "fetch_sets", return_value=sample_set_data[:1]):
+            filtered, second_etag = scryfall_client.get_filtered_sets()
+
         assert len(filtered) == 1
-        assert filtered[0]["id"] == "test-1"
+        assert second_etag != first_etag
 
 
 class TestScryfallClientGroupSets:
@@ -324,6 +268,21 @@ class TestScryfallClientGroupSets:
         assert len(grouped["Expansion"]) == 1
         assert len(grouped["Core"]) == 1
 
+    def test_filter_and_group_sets_matches_two_passes(self):
+        """Test that the fused pass equals grouping the filtered sets."""
+        sets = [
+            {"id": "a", "name": "A", "code": "A", "set_type": "expansion", "card_count": 50},
+            {"id": "b", "name": "B", "code": "B", "set_type": "Core", "card_count": 50},
+            {"id": "c", "name": "C", "code": "C", "set_type": "expansion", "card_count": 1},
+            {"id": "d", "name": "D", "code": "D", "set_type": "promo", "card_count": 50},
+            {"id": "e", "name": "E", "code": "E", "set_type": "core", "card_count": 50},
+        ]
+
+        grouped = ScryfallClient.filter_and_group_sets(sets)
+
+        assert grouped == ScryfallClient.group_sets(ScryfallClient.filter_sets(sets))
+        assert grouped == {"Expansion": [sets[0]], "Core": [sets[1], sets[4]]}
+
     def test_group_sets_capitalizes_type(self):
         """Test that set_type is capitalized in group names."""
         sets = [
@@ -354,44 +313,26 @@ class TestScryfallClientGroupSets:
         assert grouped == {}
 
 
+@pytest.mark.usefixtures("isolated_cache")
 class TestScryfallClientFetchCardTypesCatalog:
     """Tests for ScryfallClient.fetch_card_types_catalog() method."""
 
-    def test_fetch_card_types_catalog_success(self):
+    def test_fetch_card_types_catalog_success(
+        self, scryfall_client, make_response, full_card_types_catalog
+    ):
         """Test successful fetch of card types catalog from API."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "object": "catalog",
-            "uri": "https://api.scryfall.com/catalog/card-types",
-            "total_values": 17,
-            "data": [
-                "Artifact",
-                "Battle",
-                "Conspiracy",
-                "Creature",
-                "Dungeon",
-                "Emblem",
-                "Enchantment",
-                "Hero",
-                "Instant",
-                "Kindred",
-                "Land",
-                "Phenomenon",
-                "Plane",
-                "Planeswalker",
-                "Scheme",
-                "Sorcery",
-                "Vanguard",
-            ],
-        }
-
-        with patch.object(client.session, "get", return_value=mock_response):
-            result = client.fetch_card_types_catalog()
+        mock_response = make_response(
+            200,
+            {
+                "object": "catalog",
+                "uri": "https://api.scryfall.com/catalog/card-types",
+                "total_values": 17,
+                "data": full_card_types_catalog,
+            },
+        )
+
+        with patch.object(scryfall_client.session, "get", return_value=mock_response):
+            result = scryfall_client.fetch_card_types_catalog()
 
         assert isinstance(result, list)
         assert len(result) == 17
@@ -399,130 +340,79 @@ class TestScryfallClientFetchCardTypesCatalog:
         assert "Instant" in result
         assert "Sorcery" in result
 
-    def test_fetch_card_types_catalog_uses_cache(self):
+    def test_fetch_card_types_catalog_uses_cache(self, scryfall_client, make_response):
         """Test that fetch_card_types_catalog uses cached data on second call."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "object": "catalog",
-            "data": ["Creature", "Instant", "Sorcery"],
-        }
-
-        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+        mock_response = make_response(
+            200,
+            {
+                "object": "catalog",
+                "data": ["Creature", "Instant", "Sorcery"],
+            },
+        )
+
+        with patch.object(scryfall_client.session, "get", return_value=mock_response) as mock_get:
             # First call
-            result1 = client.fetch_card_types_catalog()
+            result1 = scryfall_client.fetch_card_types_catalog()
             # Second call should use cache
-            result2 = client.fetch_card_types_catalog()
+            result2 = scryfall_client.fetch_card_types_catalog()
 
         assert result1 == result2
         # Should only call API once
         assert mock_get.call_count == 1
 
-    def test_fetch_card_types_catalog_uses_instance_cache(self):
+    def test_fetch_card_types_catalog_uses_instance_cache(self, scryfall_client, make_response):
         """Test that instance cache is used before API call."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
         # Set instance cache directly
-        client._card_types_cache = ["Creature", "Instant", "Sorcery"]
+        scryfall_client._card_types_cache = ["Creature", "Instant", "Sorcery"]
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"object": "catalog", "data": ["Artifact"]}
+        mock_response = make_response(200, {"object": "catalog", "data": ["Artifact"]})
 
-        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
-            result = client.fetch_card_types_catalog()
+        with patch.object(scryfall_client.session, "get", return_value=mock_response) as mock_get:
+            result = scryfall_client.fetch_card_types_catalog()
 
         assert result == ["Creature", "Instant", "Sorcery"]
         # Should not call API when using instance cache
         assert mock_get.call_count == 0
 
-    def test_fetch_card_types_catalog_network_error(self):
-        """Test handling of network errors."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-
-        with patch.object(
-            client.session, "get", side_effect=requests.RequestException("Network error")
-        ):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_card_types_catalog()
-
-            assert exc_info.value.status_code == 500
-            assert "Error fetching card types catalog" in exc_info.value.detail
-
-    def test_fetch_card_types_catalog_api_error(self):
-        """Test handling of API errors (non-200 status)."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 500
-
-        with patch.object(client.session, "get", return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_card_types_catalog()
-
-            assert exc_info.value.status_code == 500
-            assert "Error fetching card types catalog" in exc_info.value.detail
-
-    def test_fetch_card_types_catalog_invalid_response_format(self):
+    @pytest.mark.parametrize(
+        ("error", "status"),
+        [(requests.ConnectionError("Network error"), None), (None, 500)],
+        ids=["network_error", "api_error"],
+    )
+    def test_fetch_card_types_catalog_error(self, scryfall_client, scryfall_http, error, status):
+        """Test that network and API errors surface as a 500 HTTPException."""
+        if error is not None:
+            scryfall_http.add(SCRYFALL_CARD_TYPES_URL, error=error)
+        else:
+            scryfall_http.add(SCRYFALL_CARD_TYPES_URL, {"object": "error"}, status=status)
+
+        with pytest.raises(HTTPException, match="^500: Error fetching card types catalog"):
+            scryfall_client.fetch_card_types_catalog()
+
+    def test_fetch_card_types_catalog_invalid_response_format(
+        self, scryfall_client, make_response, monkeypatch
+    ):
         """Test handling of invalid response format."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"object": "not_catalog", "data": []}
+        mock_response = make_response(200, {"object": "not_catalog", "data": []})
+        monkeypatch.setattr(scryfall_client.session, "get", lambda *a, **kw: mock_response)
 
-        with patch.object(client.session, "get", return_value=mock_response):
-            with pytest.raises(HTTPException) as exc_info:
-                client.fetch_card_types_catalog()
-
-            assert exc_info.value.status_code == 500
-            assert "Unexpected response format" in exc_info.value.detail
+        with pytest.raises(HTTPException, match="^500: Unexpected response format"):
+            scryfall_client.fetch_card_types_catalog()
 
 
+@pytest.mark.usefixtures("isolated_cache")
 class TestScryfallClientGetCardTypesByColor:
     """Tests for ScryfallClient.get_card_types_by_color() method."""
 
-    @patch("src.services.scryfall_client.ScryfallClient.fetch_card_types_catalog")
-    def test_get_card_types_by_color_success(self, mock_fetch_catalog):
+    def test_get_card_types_by_color_success(
+        self, scryfall_client, full_card_types_catalog, monkeypatch
+    ):
         """Test successful organization of card types by color."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        mock_fetch_catalog.return_value = [
-            "Artifact",
-            "Battle",
-            "Conspiracy",
-            "Creature",
-            "Dungeon",
-            "Emblem",
-            "Enchantment",
-            "Hero",
-            "Instant",
-            "Kindred",
-            "Land",
-            "Phenomenon",
-            "Plane",
-            "Planeswalker",
-            "Scheme",
-            "Sorcery",
-            "Vanguard",
-        ]
+        monkeypatch.setattr(
+            scryfall_client, "fetch_card_types_catalog", lambda: full_card_types_catalog
+        )
 
-        client = ScryfallClient()
-        result = client.get_card_types_by_color()
+        result = scryfall_client.get_card_types_by_color()
 
         # Should have all 7 colors
         assert len(result) == 7
@@ -534,43 +424,26 @@ class TestScryfallClientGetCardTypesByColor:
         assert "Multicolor" in result
         assert "Colorless" in result
 
-        # Should exclude the excluded types
-        for color in result:
-            assert "Conspiracy" not in result[color]
-            assert "Dungeon" not in result[color]
-            assert "Emblem" not in result[color]
-            assert "Hero" not in result[color]
-            assert "Phenomenon" not in result[color]
-            assert "Plane" not in result[color]
-            assert "Scheme" not in result[color]
-            assert "Vanguard" not in result[color]
-
-        # Should include common types
-        assert "Creature" in result["White"]
-        assert "Instant" in result["White"]
-        assert "Sorcery" in result["White"]
-        assert "Enchantment" in result["White"]
-        assert "Artifact" in result["White"]
-        assert "Planeswalker" in result["White"]
-        assert "Land" in result["White"]
-        assert "Battle" in result["White"]
-        assert "Kindred" in result["White"]
+        # Should exclude the excluded types and include the common ones
+        for types in result.values():
+            type_set = set(types)
+            assert type_set.isdisjoint(EXCLUDED_CARD_TYPES)
+            assert EXPECTED_COMMON_CARD_TYPES <= type_set
 
         # All colors should have the same types
         white_types = result["White"]
         for color in ["Blue", "Black", "Red", "Green", "Multicolor", "Colorless"]:
             assert result[color] == white_types
 
-    @patch("src.services.scryfall_client.ScryfallClient.fetch_card_types_catalog")
-    def test_get_card_types_by_color_fallback_on_error(self, mock_fetch_catalog):
+    def test_get_card_types_by_color_fallback_on_error(self, scryfall_client, monkeypatch):
         """Test that fallback types are used when catalog fetch fails."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
 
-        mock_fetch_catalog.side_effect = HTTPException(status_code=500, detail="API Error")
+        def fetch_card_types_catalog():
+            raise HTTPException(status_code=500, detail="API Error")
 
-        client = ScryfallClient()
-        result = client.get_card_types_by_color()
+        monkeypatch.setattr(scryfall_client, "fetch_card_types_catalog", fetch_card_types_catalog)
+
+        result = scryfall_client.get_card_types_by_color()
 
         # Should still return structure with fallback types
         assert len(result) == 7
@@ -580,10 +453,9 @@ class TestScryfallClientGetCardTypesByColor:
         assert "Instant" in result["White"]
         assert "Battle" in result["White"]
 
-    @patch("src.services.scryfall_client.ScryfallClient.fetch_card_types_catalog")
-    def test_get_card_types_by_color_prioritizes_common_types(self, mock_fetch_catalog):
+    def test_get_card_types_by_color_prioritizes_common_types(self, scryfall_client, monkeypatch):
         """Test that common types appear first in the list."""
-        mock_fetch_catalog.return_value = [
+        catalog = [
             "Artifact",
             "Battle",
             "Creature",
@@ -594,101 +466,129 @@ class TestScryfallClientGetCardTypesByColor:
             "Planeswalker",
             "Sorcery",
         ]
+        monkeypatch.setattr(scryfall_client, "fetch_card_types_catalog", lambda: catalog)
 
-        client = ScryfallClient()
-        result = client.get_card_types_by_color()
+        result = scryfall_client.get_card_types_by_color()
 
         # Common types should appear first
         white_types = result["White"]
-        assert white_types[0] == "Creature"
-        assert white_types[1] == "Instant"
-        assert white_types[2] == "Sorcery"
-        assert white_types[3] == "Enchantment"
-        assert white_types[4] == "Artifact"
-        assert white_types[5] == "Planeswalker"
-        assert white_types[6] == "Land"
+        assert white_types[:7] == (
+            "Creature",
+            "Instant",
+            "Sorcery",
+            "Enchantment",
+            "Artifact",
+            "Planeswalker",
+            "Land",
+        )
         # Then other types
-        assert "Battle" in white_types
-        assert "Kindred" in white_types
+        assert {"Battle", "Kindred"} <= set(white_types[7:])
 
-    def test_fetch_card_types_catalog_uses_list_cache(self):
-        """Test that list cache format is handled correctly."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
+    def test_get_card_types_by_color_memoized_per_catalog(self, scryfall_client):
+        """Test that card types by color are computed once per fetched catalog."""
+        catalog = ["Creature", "Kindred"]
+
+        with patch.object(scryfall_client, "fetch_card_types_catalog", return_value=catalog):
+            first = scryfall_client.get_card_types_by_color()
+            shared_types = first["Blue"]
+            # Callers get their own dict, so edits do not leak into the memo
+            first["White"] = ("Changed",)
+            second = scryfall_client.get_card_types_by_color()
 
-        client = ScryfallClient()
+        assert second["White"] is second["Blue"] is shared_types
+        assert shared_types[-1] == "Kindred"
+
+        # A refetched catalog invalidates the memo
+        with patch.object(scryfall_client, "fetch_card_types_catalog", return_value=["Land"]):
+            assert "Kindred" not in scryfall_client.get_card_types_by_color()["White"]
+
+    def test_fetch_card_types_catalog_uses_list_cache(
+        self, scryfall_client, isolated_cache, make_response
+    ):
+        """Test that list cache format is handled correctly."""
         # Set cache as a list (not CachedSetData)
         cached_list = ["Creature", "Instant", "Sorcery"]
-        cache_manager.set("card_types_catalog", cached_list)
+        isolated_cache.set("card_types_catalog", cached_list)
 
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"object": "catalog", "data": ["Artifact"]}
+        mock_response = make_response(200, {"object": "catalog", "data": ["Artifact"]})
 
-        with patch.object(client.session, "get", return_value=mock_response) as mock_get:
-            result = client.fetch_card_types_catalog()
+        with patch.object(scryfall_client.session, "get", return_value=mock_response) as mock_get:
+            result = scryfall_client.fetch_card_types_catalog()
 
         assert result == cached_list
         # Should not call API when using list cache
         assert mock_get.call_count == 0
 
-    def test_fetch_card_types_catalog_timeout_retry(self):
-        """Test that timeout errors are retried."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
-
-        client = ScryfallClient()
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"object": "catalog", "data": ["Creature"]}
-
-        # First call times out, second succeeds
-        with patch.object(
-            client.session,
-            "get",
-            side_effect=[
+    def test_fetch_card_types_catalog_timeout_not_retried(
+        self, scryfall_client, make_response, monkeypatch
+    ):
+        """Test that a timeout surfaces once the session's own retries are exhausted."""
+        outcomes = iter(
+            [
                 requests.Timeout("Timeout error"),
-                mock_response,
-            ],
-        ):
-            result = client.fetch_card_types_catalog()
+                make_response(200, {"object": "catalog", "data": ["Creature"]}),
+            ]
+        )
+        calls = []
 
-        assert result == ["Creature"]
+        def get(*args, **kwargs):
+            calls.append(args)
+            outcome = next(outcomes)
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
 
-    def test_fetch_card_types_catalog_all_retries_fail_timeout(self):
-        """Test handling when all retry attempts fail with timeout."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
+        monkeypatch.setattr(scryfall_client.session, "get", get)
 
-        client = ScryfallClient()
+        with pytest.raises(HTTPException):
+            scryfall_client.fetch_card_types_catalog()
 
-        with patch.object(client.session, "get", side_effect=requests.Timeout("Timeout error")):
-            with patch("src.services.scryfall_client.SCRYFALL_API_RETRY_ATTEMPTS", 2):
-                with pytest.raises(HTTPException) as exc_info:
-                    client.fetch_card_types_catalog()
+        assert len(calls) == 1
 
-                assert exc_info.value.status_code == 500
-                assert "Error fetching card types catalog" in exc_info.value.detail
+    @pytest.mark.parametrize(
+        "error",
+        [requests.Timeout("Timeout error"), requests.RequestException("Network error")],
+        ids=["timeout", "request_exception"],
+    )
+    def test_fetch_card_types_catalog_all_retries_fail(self, scryfall_client, monkeypatch, error):
+        """Test handling when all retry attempts fail."""
+        monkeypatch.setattr(scryfall_client.session, "get", Mock(side_effect=error))
 
-    def test_fetch_card_types_catalog_all_retries_fail_request_exception(self):
-        """Test handling when all retry attempts fail with RequestException."""
-        cache_manager = get_cache_manager()
-        cache_manager.clear()
+        with pytest.raises(HTTPException, match="^500: Error fetching card types catalog"):
+            scryfall_client.fetch_card_types_catalog()
 
-        client = ScryfallClient()
 
-        with patch.object(
-            client.session,
-            "get",
-            side_effect=requests.RequestException("Network error"),
-        ):
-            with patch("src.services.scryfall_client.SCRYFALL_API_RETRY_ATTEMPTS", 2):
-                with pytest.raises(HTTPException) as exc_info:
-                    client.fetch_card_types_catalog()
-
-                assert exc_info.value.status_code == 500
-                # The error detail can be either message depending on which exception path is taken
-                assert (
-                    "Error fetching card types catalog" in exc_info.value.detail
-                    or "Network error fetching card types catalog" in exc_info.value.detail
-                )
+class TestScryfallClientRateLimit:
+    """Tests for ScryfallClient._apply_rate_limit() method."""
+
+    def test_rate_limit_serialized_across_threads(self, scryfall_client, monkeypatch):
+        """Test that concurrent callers are spaced by the rate-limit delay."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        request_times: list[float] = []
+
+        def request() -> None:
+            scryfall_client._apply_rate_limit()
+            request_times.append(time.monotonic())
+
+        monkeypatch.setattr("src.services.scryfall_client.SCRYFALL_API_RATE_LIMIT_DELAY", 0.05)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(4):
+                executor.submit(request)
+
+        request_times.sort()
+        gaps = [later - earlier for earlier, later in zip(request_times, request_times[1:])]
+        assert len(gaps) == 3
+        assert min(gaps) >= 0.04
+
+    def test_rate_limit_first_request_not_delayed(self, scryfall_client, monkeypatch):
+        """Test that the first request goes out immediately and sets the next deadline."""
+
+        monkeypatch.setattr("src.services.scryfall_client.SCRYFALL_API_RATE_LIMIT_DELAY", 0.1)
+        with patch("src.services.scryfall_client.time.sleep") as mock_sleep:
+            scryfall_client._apply_rate_limit()
+            mock_sleep.assert_not_called()
+            scryfall_client._apply_rate_limit()
+
+        assert mock_sleep.call_count == 1
+        assert 0 < mock_sleep.call_args.args[0] <= 0.1